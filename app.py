@@ -4,11 +4,25 @@ from flasgger import Swagger
 from controllers.user_controller import user_bp, inject as inject_user
 from controllers.auth_controller import auth_bp, inject as inject_auth
 from controllers.mission_controller import mission_bp, inject as inject_mission
+from controllers.saved_search_controller import saved_search_bp, inject as inject_saved_search
 from repositories.user_repository import UserRepository
 from repositories.mission_repository import MissionRepository
+from repositories.log_mission_repository import LogMissionRepository
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_user_repository import SqliteUserRepository
+from repositories.sqlite_mission_repository import SqliteMissionRepository
+from repositories.saved_search_repository import SavedSearchRepository
+from repositories.sqlite_saved_search_repository import SqliteSavedSearchRepository
 from services.user_service import UserService
 from services.mission_service import MissionService
-from config.settings import SWAGGER_INFO, UPLOAD_FOLDER, MISSIONS_DATA_FILE
+from services.saved_search_service import SavedSearchService
+from utils.write_behind import WriteBehindBuffer
+from utils.event_bus import EventBus
+from config.settings import (
+    SWAGGER_INFO, UPLOAD_FOLDER, MISSIONS_DATA_FILE, STORAGE_BACKEND, SQLITE_DB_FILE,
+    LOG_COMPACTION_INTERVAL_SECONDS, LOG_COMPACTION_THRESHOLD, METADATA_FLUSH_INTERVAL_SECONDS,
+    SAVED_SEARCHES_DATA_FILE, SAVED_SEARCH_POLL_SECONDS, EVENT_POLL_SECONDS
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -44,18 +58,39 @@ swagger_config = {
 swagger = Swagger(app, template=swagger_template, config=swagger_config)
 
 # Injection de dépendances
-user_repo = UserRepository()
-user_service = UserService(user_repo)
+if STORAGE_BACKEND == "sqlite":
+    database = SqliteDatabase(SQLITE_DB_FILE)
+    user_repo = SqliteUserRepository(database)
+    mission_repo = SqliteMissionRepository(database)
+    saved_search_repo = SqliteSavedSearchRepository(database)
+elif STORAGE_BACKEND == "log":
+    user_repo = UserRepository()
+    mission_repo = LogMissionRepository(
+        MISSIONS_DATA_FILE,
+        compaction_interval=LOG_COMPACTION_INTERVAL_SECONDS,
+        compaction_threshold=LOG_COMPACTION_THRESHOLD
+    )
+    saved_search_repo = SavedSearchRepository(SAVED_SEARCHES_DATA_FILE)
+else:
+    user_repo = UserRepository()
+    mission_repo = MissionRepository(MISSIONS_DATA_FILE)
+    saved_search_repo = SavedSearchRepository(SAVED_SEARCHES_DATA_FILE)
+
+metadata_buffer = WriteBehindBuffer(user_repo.update_fields_many, interval=METADATA_FLUSH_INTERVAL_SECONDS)
+user_service = UserService(user_repo, metadata_buffer)
 inject_user(user_service)
 inject_auth(user_service)
 
-mission_repo = MissionRepository(MISSIONS_DATA_FILE)
-mission_service = MissionService(mission_repo)
+mission_service = MissionService(mission_repo, EventBus(), user_repo, poll_interval=EVENT_POLL_SECONDS)
 inject_mission(mission_service)
 
+saved_search_service = SavedSearchService(saved_search_repo, mission_service, poll_interval=SAVED_SEARCH_POLL_SECONDS)
+inject_saved_search(saved_search_service)
+
 # Enregistrement des blueprints
 app.register_blueprint(user_bp, url_prefix="/users")
 app.register_blueprint(auth_bp, url_prefix="/auth")
+app.register_blueprint(saved_search_bp, url_prefix="/api/saved-searches")
 
 # Enregistrer le blueprint missions avec deux préfixes pour compatibilité
 app.register_blueprint(mission_bp, url_prefix="/api/missions")
@@ -82,7 +117,8 @@ def index():
         "services": {
             "users": "/users",
             "auth": "/auth",
-            "missions": "/api/missions"
+            "missions": "/api/missions",
+            "saved_searches": "/api/saved-searches"
         },
         "documentation": "/docs/"
     }
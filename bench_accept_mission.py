@@ -0,0 +1,165 @@
+# Benchmark de concurrence de l'acceptation des missions
+# Des centaines d'acceptations simultanees (threads, puis processus) visent les
+# memes missions : une seule doit reussir par mission, et le worker_id stocke
+# doit etre celui du gagnant.
+#
+# Usage : python bench_accept_mission.py [--missions 20] [--workers 20] [--processes 4]
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from models.mission_model import MissionModel
+from repositories.log_mission_repository import LogMissionRepository
+from repositories.mission_repository import MissionRepository
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_mission_repository import SqliteMissionRepository
+from services.mission_service import MissionService
+
+WORK_DAY = {"day": "2030-01-01", "start_time": "08:00:00", "end_time": "12:00:00"}
+
+
+def open_repository(backend, directory):
+    """Ouvre le repository du stockage demande dans le dossier du benchmark"""
+    if backend == "sqlite":
+        return SqliteMissionRepository(SqliteDatabase(os.path.join(directory, "eqos.db")))
+    data_file = os.path.join(directory, "missions.json")
+    if backend == "log":
+        return LogMissionRepository(data_file, compaction_interval=None)
+    return MissionRepository(data_file)
+
+
+def seed(repository, count):
+    """Cree count missions publiees et retourne leurs IDs"""
+    mission_ids = []
+    for index in range(count):
+        mission = MissionModel.from_dict({
+            "title": f"Mission {index}",
+            "description": "Mission disputee",
+            "type_code": "CLEANING",
+            "location": {"country": "GN", "city": "Conakry", "neighborhood": "Kaloum"},
+            "budget": 100 + index,
+            "publisher_id": "publisher",
+            "status": "PUBLISHED",
+            "work_days": [WORK_DAY]
+        })
+        repository.create(mission)
+        mission_ids.append(mission.id)
+    return mission_ids
+
+
+def accept_all(service, attempts):
+    """Lance une acceptation par thread (tous partent ensemble) et retourne les gagnants"""
+    barrier = threading.Barrier(len(attempts))
+    winners = []
+    lock = threading.Lock()
+
+    def attempt(mission_id, worker_id):
+        barrier.wait()
+        success, _, _ = service.accept_mission(mission_id, worker_id)
+        if success:
+            with lock:
+                winners.append((mission_id, worker_id))
+
+    threads = [threading.Thread(target=attempt, args=attempt_args) for attempt_args in attempts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return winners
+
+
+def process_main(backend, directory, attempts, start_event, results):
+    """Processus concurrent : memes missions, meme fichier ou base"""
+    service = MissionService(open_repository(backend, directory))
+    start_event.wait()
+    results.put(accept_all(service, attempts))
+
+
+def check(repository, mission_ids, winners):
+    """Une seule acceptation gagnante par mission, et c'est bien celle qui est stockee"""
+    by_mission = {}
+    for mission_id, worker_id in winners:
+        by_mission.setdefault(mission_id, []).append(worker_id)
+    for mission_id in mission_ids:
+        assert len(by_mission.get(mission_id, [])) == 1, f"{mission_id} : {by_mission.get(mission_id)}"
+        stored = repository.find_by_id(mission_id)
+        assert stored.status == "ASSIGNED"
+        assert stored.worker_id == by_mission[mission_id][0]
+
+
+def bench_threads(backend, missions, workers):
+    """missions x workers acceptations concurrentes dans un seul processus"""
+    with tempfile.TemporaryDirectory() as directory:
+        repository = open_repository(backend, directory)
+        mission_ids = seed(repository, missions)
+        service = MissionService(repository)
+        attempts = [(mission_id, f"worker-{w}") for w in range(workers) for mission_id in mission_ids]
+
+        start = time.perf_counter()
+        winners = accept_all(service, attempts)
+        elapsed = time.perf_counter() - start
+
+        check(repository, mission_ids, winners)
+        print(f"✅ {backend:6} threads   : {len(attempts)} acceptations, {len(winners)} gagnantes, "
+              f"{elapsed:.2f}s ({len(attempts) / elapsed:.0f}/s)")
+
+
+def bench_processes(backend, missions, workers, processes):
+    """Acceptations concurrentes reparties sur plusieurs processus"""
+    with tempfile.TemporaryDirectory() as directory:
+        repository = open_repository(backend, directory)
+        mission_ids = seed(repository, missions)
+        context = multiprocessing.get_context("spawn")
+        start_event = context.Event()
+        results = context.Queue()
+        per_process = max(1, workers // processes)
+        children = [
+            context.Process(target=process_main, args=(
+                backend, directory,
+                [(mission_id, f"worker-{p}-{w}") for w in range(per_process) for mission_id in mission_ids],
+                start_event, results
+            ))
+            for p in range(processes)
+        ]
+        for child in children:
+            child.start()
+        # Laisse aux processus le temps de demarrer avant le depart commun
+        time.sleep(2)
+
+        start = time.perf_counter()
+        start_event.set()
+        winners = []
+        for _ in children:
+            winners.extend(results.get())
+        elapsed = time.perf_counter() - start
+        for child in children:
+            child.join()
+
+        total = per_process * processes * len(mission_ids)
+        check(open_repository(backend, directory), mission_ids, winners)
+        print(f"✅ {backend:6} processus : {total} acceptations, {len(winners)} gagnantes, "
+              f"{elapsed:.2f}s ({total / elapsed:.0f}/s)")
+
+
+def test_accept_mission_single_winner():
+    for backend in ("json", "log", "sqlite"):
+        bench_threads(backend, missions=5, workers=10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Acceptations concurrentes des memes missions")
+    parser.add_argument("--missions", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=20, help="acceptations par mission")
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BENCHMARK DES ACCEPTATIONS CONCURRENTES")
+    print("=" * 60)
+    for backend in ("json", "log", "sqlite"):
+        bench_threads(backend, args.missions, args.workers)
+        bench_processes(backend, args.missions, args.workers, args.processes)
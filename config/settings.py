@@ -4,12 +4,66 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_FILE = os.path.join(BASE_DIR, "data", "users.json")
 MISSIONS_DATA_FILE = os.path.join(BASE_DIR, "data", "missions.json")
+SAVED_SEARCHES_DATA_FILE = os.path.join(BASE_DIR, "data", "saved_searches.json")
+SQLITE_DB_FILE = os.path.join(BASE_DIR, "data", "eqos.db")
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
 
 # Crée les dossiers nécessaires
 os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Stockage des données : "json" (fichiers data/*.json), "sqlite" (SQLITE_DB_FILE)
+# ou "log" (missions en journal append-only, voir ci-dessous)
+# Importer les fichiers JSON existants avec : python import_json_to_sqlite.py
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+
+# Stockage "log" : les missions sont ajoutées au journal MISSIONS_DATA_FILE + ".log"
+# puis compactées dans MISSIONS_DATA_FILE (les utilisateurs restent en JSON)
+LOG_COMPACTION_INTERVAL_SECONDS = 60
+LOG_COMPACTION_THRESHOLD = 1000
+
+# Synchronisation des écritures sur le disque : "always" (fsync à chaque écriture),
+# "batched" (au plus un fsync par FSYNC_BATCH_INTERVAL_SECONDS) ou "never".
+# Seule "always" protège les fichiers d'une coupure de courant (voir utils/file_store.py)
+FSYNC_POLICY = os.environ.get("FSYNC_POLICY", "always")
+FSYNC_BATCH_INTERVAL_SECONDS = 1.0
+
+# Regroupement des écritures : les mutations arrivant dans la même fenêtre
+# (ou jusqu'à WRITE_BATCH_MAX_OPS opérations) sont persistées en une seule écriture.
+# La fenêtre n'est ouverte que si d'autres écritures attendent déjà : une écriture isolée part aussitôt
+WRITE_BATCH_WINDOW_MS = 5
+WRITE_BATCH_MAX_OPS = 64
+
+# Métadonnées non critiques (last_login) : écrites en bloc toutes les N secondes
+# et à l'arrêt du serveur au lieu d'une écriture par connexion
+METADATA_FLUSH_INTERVAL_SECONDS = 5
+
+# Pagination par curseur (?limit=&cursor=) des listes de missions et d'utilisateurs
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Flux temps réel des missions (GET /api/missions/stream, Server-Sent Events) :
+# commentaire keepalive toutes les N secondes sans événement, et nombre maximal
+# d'événements en attente par abonné (au-delà, l'abonné trop lent est déconnecté)
+SSE_HEARTBEAT_SECONDS = 15
+EVENT_QUEUE_SIZE = 100
+# Intervalle de lecture des écritures faites par les autres processus (workers)
+# pour les relayer aux abonnés de ce processus
+EVENT_POLL_SECONDS = 1
+
+# Lecture groupée des utilisateurs (POST /users/batch) : nombre maximal d'IDs par requête
+USERS_BATCH_MAX_IDS = 500
+
+# Création en masse (POST /api/missions/bulk) : nombre maximal de missions par requête,
+# validées ensemble puis enregistrées en une seule écriture
+BULK_MAX_MISSIONS = 1000
+
+# Recherches sauvegardées (/api/saved-searches) : nombre maximal de correspondances
+# gardées par utilisateur, et intervalle de rattrapage des missions publiées
+# (y compris par un autre processus) en l'absence d'événement
+INBOX_MAX_ITEMS = 100
+SAVED_SEARCH_POLL_SECONDS = 5
+
 # Configuration JWT
 SECRET_KEY = "dev-secret-key-change-in-production"
 JWT_ALGORITHM = "HS256"
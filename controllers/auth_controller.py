@@ -4,6 +4,7 @@ from dto.common import ApiResponse
 from dto.auth import LoginRequest, RegisterRequest, RefreshTokenRequest
 from dto.user import CreateUserRequest
 from utils.auth_decorators import token_required
+from utils.http_cache import conditional
 
 
 auth_bp = Blueprint("auth", __name__)
@@ -278,6 +279,7 @@ def refresh():
 
 @auth_bp.route("/me", methods=["GET"])
 @token_required
+@conditional(lambda: _service.data_version(request.current_user.get('user_id')))
 def get_current_user():
     """Recupere les informations de l'utilisateur courant a partir du token JWT
     ---
@@ -322,6 +324,8 @@ def get_current_user():
                   type: string
                 updated_at:
                   type: string
+      304:
+        description: Non modifie depuis l'ETag envoye dans If-None-Match (corps vide)
       401:
         description: Token manquant, invalide ou expire
       404:
@@ -1,7 +1,14 @@
+import json
 from flask import Blueprint, request, jsonify
-from services.mission_service import MissionService
+from services.mission_service import EXPAND_FIELDS, MissionService
 from dto.common import ApiResponse
 from utils.auth_decorators import token_required, optional_token
+from utils.http_cache import conditional, if_match_version, record_conditional
+from utils.pagination import parse_page_args, page_info
+from utils.streaming import (
+    SSE_KEEPALIVE, fragments_response, parse_stream_arg, sse_message, sse_response, stream_response
+)
+from config.settings import BULK_MAX_MISSIONS, SSE_HEARTBEAT_SECONDS
 
 
 mission_bp = Blueprint("mission", __name__)
@@ -14,16 +21,90 @@ def inject(service: MissionService):
     _service = service
 
 
+def _is_true(value) -> bool:
+    """Parametre booleen de requete (?counts_only=true / 1 / yes)"""
+    return (value or '').lower() in ('true', '1', 'yes')
+
+
+def _parse_expand(args, service: MissionService) -> tuple:
+    """
+    Lit ?expand=publisher,worker (utilisateurs inclus dans les missions).
+    Retourne un tuple vide sans le parametre ; ValueError si une valeur est
+    inconnue ou si le service n'a pas acces aux utilisateurs.
+    """
+    values = {value.strip() for value in args.get('expand', '').split(',') if value.strip()}
+    unknown = sorted(values - set(EXPAND_FIELDS))
+    if unknown:
+        raise ValueError(f"Valeurs de expand non supportees: {', '.join(unknown)} (publisher, worker)")
+    if values and service.user_repository is None:
+        raise ValueError("Le parametre expand n'est pas disponible")
+    return tuple(field for field in EXPAND_FIELDS if field in values)
+
+
+def _expand_version(service: MissionService):
+    """Partie de l'ETag dependant des utilisateurs inclus (None sans ?expand)"""
+    expand = request.args.get('expand')
+    if not expand:
+        return None
+    return expand, service.users_data_version()
+
+
+def _read_bulk_items() -> list:
+    """
+    Elements d'une creation en masse : tableau JSON, ou une mission par ligne
+    (application/x-ndjson). Une ligne NDJSON illisible donne None, signale
+    ensuite comme element invalide. ValueError si le corps n'est pas exploitable.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+        return items
+
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        raise ValueError("Le corps doit etre un tableau JSON de missions (ou du NDJSON)")
+    return items
+
+
 @mission_bp.route("/", methods=["GET"])
 @optional_token
+@conditional(lambda: (_service.data_version(), _expand_version(_service)))
 def get_all_missions():
     """Recupere toutes les missions
     ---
     tags:
       - EQOS : Missions
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Nombre de missions par page (sans limit ni cursor, toutes les missions sont retournees)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Curseur de la page suivante (pagination.next_cursor de la reponse precedente)
+      - name: stream
+        in: query
+        type: string
+        enum: [json, ndjson]
+        required: false
+        description: Reponse envoyee au fil de l'eau (json = meme enveloppe, ndjson = une mission par ligne)
+      - name: expand
+        in: query
+        type: string
+        required: false
+        description: Utilisateurs a inclure (publisher, worker ou publisher,worker) sous forme de resume {user_id, first_name, last_name, photo_url}
     responses:
       200:
-        description: Liste de toutes les missions
+        description: Liste de toutes les missions (triees par date de creation si paginees, avec un bloc pagination {limit, next_cursor, has_more})
         schema:
           type: array
           items:
@@ -73,13 +154,33 @@ def get_all_missions():
                     end_time:
                       type: string
                       format: time
+      304:
+        description: Non modifie depuis l'ETag envoye dans If-None-Match (corps vide)
+      400:
+        description: Parametres de pagination ou de streaming invalides
       500:
         description: Erreur serveur
     """
     try:
-        missions = _service.get_all_missions()
-        response = ApiResponse(success=True, message="Missions recuperees avec succes", data=[m.to_dict() for m in missions])
-        return jsonify(response.to_dict()), 200
+        page_args = parse_page_args(request.args)
+        stream = parse_stream_arg(request.args)
+        expand = _parse_expand(request.args, _service)
+        pagination = None
+        if page_args is None:
+            missions = _service.iter_all_missions_json(expand)
+        else:
+            limit, cursor = page_args
+            missions, next_cursor = _service.get_missions_page_json(limit, cursor, expand)
+            pagination = page_info(limit, next_cursor)
+
+        # Missions deja encodees (fragments en cache) inserees dans l'enveloppe
+        envelope = ApiResponse(success=True, message="Missions recuperees avec succes", pagination=pagination)
+        if stream:
+            return stream_response(stream, missions, envelope.to_dict(), encoded=True)
+        return fragments_response(missions, envelope.to_dict())
+    except ValueError as e:
+        response = ApiResponse(success=False, message=str(e))
+        return jsonify(response.to_dict()), 400
     except Exception as e:
         response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
         return jsonify(response.to_dict()), 500
@@ -194,6 +295,78 @@ def create_mission():
         return jsonify(response.to_dict()), 500
 
 
+@mission_bp.route("/bulk", methods=["POST"])
+@token_required
+def create_missions_bulk():
+    """Cree plusieurs missions en une seule requete (import)
+    ---
+    tags:
+      - EQOS : Missions
+    consumes:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: header
+        name: Authorization
+        required: true
+        type: string
+        description: Bearer token JWT
+      - in: body
+        name: body
+        required: true
+        description: >
+          Tableau de missions au format de POST /api/missions/, ou une mission par
+          ligne avec Content-Type application/x-ndjson
+        schema:
+          type: array
+          items:
+            type: object
+    responses:
+      201:
+        description: >
+          Missions valides creees (data, dans l'ordre de la requete) ; les elements
+          invalides sont listes dans errors ({index, message}) et ne sont pas crees
+      400:
+        description: Corps invalide, trop de missions, ou aucune mission valide
+      401:
+        description: Non autorise
+      500:
+        description: Erreur serveur
+    """
+    try:
+        try:
+            items = _read_bulk_items()
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
+        if not items:
+            response = ApiResponse(success=False, message="Aucune mission a creer")
+            return jsonify(response.to_dict()), 400
+        if len(items) > BULK_MAX_MISSIONS:
+            response = ApiResponse(
+                success=False,
+                message=f"Au plus {BULK_MAX_MISSIONS} missions par requete ({len(items)} recues)"
+            )
+            return jsonify(response.to_dict()), 400
+
+        created, errors = _service.create_missions(items)
+        message = f"{len(created)} mission(s) creee(s), {len(errors)} erreur(s)"
+        if not created:
+            response = ApiResponse(success=False, message=message, errors=errors)
+            return jsonify(response.to_dict()), 400
+
+        response = ApiResponse(
+            success=True,
+            message=message,
+            data=[mission.to_dict() for mission in created],
+            errors=errors
+        )
+        return jsonify(response.to_dict()), 201
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
+
+
 @mission_bp.route("/search", methods=["POST"])
 @optional_token
 def get_missions_by_filters():
@@ -210,7 +383,10 @@ def get_missions_by_filters():
           properties:
             title:
               type: string
-              description: Filtre par titre (partiel)
+              description: Filtre par titre (partiel, sans tenir compte de la casse)
+            keywords:
+              type: string
+              description: Recherche plein texte sur le titre et la description, resultats classes par pertinence
             type_code:
               type: string
               description: Filtre par code de type
@@ -232,9 +408,27 @@ def get_missions_by_filters():
             publisher_id:
               type: string
               description: Filtre par ID du publisher
+            worker_id:
+              type: string
+              description: Filtre par ID du travailleur assigne
             status:
               type: string
               description: Filtre par statut (DRAFT, PUBLISHED, ASSIGNED, COMPLETED, CANCELLED)
+            sort:
+              type: string
+              enum: [budget, -budget]
+              description: Tri par budget croissant (budget) ou decroissant (-budget)
+      - name: stream
+        in: query
+        type: string
+        enum: [json, ndjson]
+        required: false
+        description: Reponse envoyee au fil de l'eau (json = meme enveloppe, ndjson = une mission par ligne)
+      - name: expand
+        in: query
+        type: string
+        required: false
+        description: Utilisateurs a inclure (publisher, worker ou publisher,worker) sous forme de resume {user_id, first_name, last_name, photo_url}
     responses:
       200:
         description: Missions filtrees
@@ -245,16 +439,148 @@ def get_missions_by_filters():
     """
     try:
         filters = request.get_json() or {}
-        missions = _service.get_missions_by_filters(filters)
-        response = ApiResponse(success=True, message="Missions recuperees avec succes", data=[m.to_dict() for m in missions])
-        return jsonify(response.to_dict()), 200
+        stream = parse_stream_arg(request.args)
+        missions = _service.iter_missions_by_filters_json(filters, _parse_expand(request.args, _service))
+        envelope = ApiResponse(success=True, message="Missions recuperees avec succes")
+        if stream:
+            return stream_response(stream, missions, envelope.to_dict(), encoded=True)
+        return fragments_response(missions, envelope.to_dict())
+    except ValueError as e:
+        response = ApiResponse(success=False, message=str(e))
+        return jsonify(response.to_dict()), 400
     except Exception as e:
         response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
         return jsonify(response.to_dict()), 500
 
 
+@mission_bp.route("/changes", methods=["GET"])
+@optional_token
+@conditional(lambda: _service.data_version())
+def get_mission_changes():
+    """Recupere les missions creees ou modifiees depuis une version (synchronisation differentielle)
+    ---
+    tags:
+      - EQOS : Missions
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        required: false
+        default: 0
+        description: Version retournee par l'appel precedent (data.version). 0 = toutes les missions
+    responses:
+      200:
+        description: Missions modifiees depuis since (etat courant de chaque mission)
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            message:
+              type: string
+            data:
+              type: object
+              properties:
+                missions:
+                  type: array
+                  items:
+                    type: object
+                total:
+                  type: integer
+                version:
+                  type: integer
+                  description: Version a renvoyer dans since au prochain appel
+                full:
+                  type: boolean
+                  description: Vrai si toutes les missions sont renvoyees (since a 0 ou inconnue) et remplacent celles du client
+      304:
+        description: Non modifie depuis l'ETag envoye dans If-None-Match (corps vide)
+      400:
+        description: Parametre since invalide
+      500:
+        description: Erreur serveur
+    """
+    try:
+        try:
+            since = int(request.args.get('since', 0))
+        except ValueError:
+            raise ValueError("Le parametre since doit etre un entier positif")
+        missions, version, full = _service.get_mission_changes_json(since)
+        envelope = ApiResponse(success=True, message="Modifications recuperees avec succes")
+        return fragments_response(missions, envelope.to_dict(), items_key='missions',
+                                  fields={'version': version, 'full': full})
+    except ValueError as e:
+        response = ApiResponse(success=False, message=str(e))
+        return jsonify(response.to_dict()), 400
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
+
+
+@mission_bp.route("/stream", methods=["GET"])
+@optional_token
+def stream_missions():
+    """Flux temps reel des missions publiees et acceptees (Server-Sent Events)
+    ---
+    tags:
+      - EQOS : Missions
+    produces:
+      - text/event-stream
+    parameters:
+      - name: city
+        in: query
+        type: string
+        required: false
+      - name: type_code
+        in: query
+        type: string
+        required: false
+      - name: budget_min
+        in: query
+        type: number
+        required: false
+      - name: budget_max
+        in: query
+        type: number
+        required: false
+    responses:
+      200:
+        description: >
+          Flux d'evenements mission.published et mission.accepted correspondant aux filtres.
+          data contient la mission au format d'affichage et id la version des donnees
+          (utilisable avec /api/missions/changes?since= apres une reconnexion).
+          Les ecritures des autres processus (workers) sont relayees au plus
+          EVENT_POLL_SECONDS secondes plus tard ; un evenement peut etre recu deux fois.
+          Un commentaire keepalive est envoye en l'absence d'evenement.
+      400:
+        description: Filtres invalides
+    """
+    try:
+        subscription = _service.subscribe_events(request.args)
+    except ValueError as e:
+        response = ApiResponse(success=False, message=str(e))
+        return jsonify(response.to_dict()), 400
+
+    def generate():
+        yield SSE_KEEPALIVE
+        for event in subscription.events(SSE_HEARTBEAT_SECONDS):
+            if event is None:
+                yield SSE_KEEPALIVE
+            else:
+                yield sse_message(event["data"], event["type"], event["version"])
+
+    response = sse_response(generate())
+    # Deconnexion du client : fin de l'abonnement
+    response.call_on_close(subscription.close)
+    return response
+
+
 @mission_bp.route("/<mission_id>", methods=["GET"])
 @optional_token
+@record_conditional(
+    lambda mission_id: _service.get_mission_version(mission_id),
+    lambda: _expand_version(_service)
+)
 def retrieve_mission(mission_id):
     """Recupere une mission par son ID
     ---
@@ -266,22 +592,41 @@ def retrieve_mission(mission_id):
         required: true
         type: string
         description: ID de la mission
+      - name: expand
+        in: query
+        type: string
+        required: false
+        description: Utilisateurs a inclure (publisher, worker ou publisher,worker) sous forme de resume {user_id, first_name, last_name, photo_url}
     responses:
       200:
-        description: Mission recuperee avec succes
+        description: >
+          Mission recuperee avec succes (en-tete ETag = version de la mission, a renvoyer
+          dans If-Match ; avec expand, ETag faible utilisable seulement dans If-None-Match)
+      304:
+        description: Non modifie depuis l'ETag envoye dans If-None-Match (corps vide)
+      400:
+        description: Parametre expand invalide
       404:
         description: Mission non trouvee
       500:
         description: Erreur serveur
     """
     try:
+        try:
+            expand = _parse_expand(request.args, _service)
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
         mission = _service.get_mission_by_id(mission_id)
 
         if not mission:
             response = ApiResponse(success=False, message="Mission non trouvee")
             return jsonify(response.to_dict()), 404
 
-        response = ApiResponse(success=True, message="Mission recuperee avec succes", data=mission.to_dict())
+        data = mission.to_dict()
+        if expand:
+            data = _service.expand_mission(data, expand)
+        response = ApiResponse(success=True, message="Mission recuperee avec succes", data=data)
         return jsonify(response.to_dict()), 200
     except Exception as e:
         response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
@@ -306,6 +651,11 @@ def publish_mission(mission_id):
         required: true
         type: string
         description: ID de la mission a publier
+      - in: header
+        name: If-Match
+        required: false
+        type: string
+        description: Version attendue de la mission (ETag de GET /api/missions/<id>, ex. "3")
     responses:
       200:
         description: Mission publiee avec succes
@@ -317,6 +667,8 @@ def publish_mission(mission_id):
         description: Vous n'etes pas le proprietaire de cette mission
       404:
         description: Mission non trouvee
+      409:
+        description: La mission a ete modifiee entre-temps (version differente de If-Match)
       500:
         description: Erreur serveur
     """
@@ -324,16 +676,24 @@ def publish_mission(mission_id):
         # Recuperer l'utilisateur courant depuis le token
         current_user_id = request.current_user.get('user_id')
 
-        success, message, mission_response = _service.publish_mission(mission_id, current_user_id)
+        try:
+            expected_version = if_match_version()
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
+        success, message, mission_response = _service.publish_mission(mission_id, current_user_id, expected_version)
 
         if success:
             response = ApiResponse(success=True, message=message, data=mission_response.to_dict())
-            return jsonify(response.to_dict()), 200
+            return jsonify(response.to_dict()), 200, {"ETag": f'"{mission_response.version}"'}
 
         # Determiner le code d'erreur selon le message
         status_code = 400
         if "non trouvee" in message.lower():
             status_code = 404
+        elif "entre-temps" in message.lower():
+            # Version de If-Match perimee, ou modification concurrente
+            status_code = 409
         elif "proprietaire" in message.lower() or "autorise" in message.lower():
             status_code = 403
 
@@ -346,6 +706,7 @@ def publish_mission(mission_id):
 
 @mission_bp.route("/me", methods=["GET"])
 @token_required
+@conditional(lambda: _service.data_version())
 def get_my_missions():
     """Recupere toutes les missions de l'utilisateur connecte (creees + acceptees)
     ---
@@ -357,6 +718,11 @@ def get_my_missions():
         required: true
         type: string
         description: Bearer token JWT
+      - name: counts_only
+        in: query
+        type: boolean
+        required: false
+        description: Ne retourner que les totaux (total_created, total_accepted, total)
     responses:
       200:
         description: Missions de l'utilisateur recuperees avec succes
@@ -386,6 +752,8 @@ def get_my_missions():
                   type: integer
                 total:
                   type: integer
+      304:
+        description: Non modifie depuis l'ETag envoye dans If-None-Match (corps vide)
       401:
         description: Non autorise
       500:
@@ -395,27 +763,8 @@ def get_my_missions():
         # Recuperer l'utilisateur courant depuis le token
         current_user_id = request.current_user.get('user_id')
 
-        # Recuperer toutes les missions
-        all_missions = _service.get_all_missions()
-
-        # Filtrer les missions creees par l'utilisateur
-        created_missions = [m for m in all_missions if m.publisher_id == current_user_id]
-
-        # Filtrer les missions acceptees par l'utilisateur
-        accepted_missions = [m for m in all_missions if hasattr(m, 'worker_id') and m.worker_id == current_user_id]
-
-        # Convertir en dictionnaires
-        created_missions_data = [m.to_dict() for m in created_missions]
-        accepted_missions_data = [m.to_dict() for m in accepted_missions]
-
-        # Preparer la reponse
-        data = {
-            "created_missions": created_missions_data,
-            "accepted_missions": accepted_missions_data,
-            "total_created": len(created_missions_data),
-            "total_accepted": len(accepted_missions_data),
-            "total": len(created_missions_data) + len(accepted_missions_data)
-        }
+        # Missions creees et acceptees, lues dans les index (ou seulement leurs totaux)
+        data = _service.get_missions_for_user(current_user_id, counts_only=_is_true(request.args.get('counts_only')))
 
         response = ApiResponse(
             success=True,
@@ -447,6 +796,11 @@ def accept_mission(mission_id):
         required: true
         type: string
         description: ID de la mission a accepter
+      - in: header
+        name: If-Match
+        required: false
+        type: string
+        description: Version attendue de la mission (ETag de GET /api/missions/<id>, ex. "3")
     responses:
       200:
         description: Mission acceptee avec succes
@@ -458,6 +812,8 @@ def accept_mission(mission_id):
         description: Vous ne pouvez pas accepter votre propre mission
       404:
         description: Mission non trouvee
+      409:
+        description: La mission a ete modifiee entre-temps (version differente de If-Match)
       500:
         description: Erreur serveur
     """
@@ -465,16 +821,24 @@ def accept_mission(mission_id):
         # Recuperer l'utilisateur courant depuis le token
         current_user_id = request.current_user.get('user_id')
 
-        success, message, mission_response = _service.accept_mission(mission_id, current_user_id)
+        try:
+            expected_version = if_match_version()
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
+        success, message, mission_response = _service.accept_mission(mission_id, current_user_id, expected_version)
 
         if success:
             response = ApiResponse(success=True, message=message, data=mission_response.to_dict())
-            return jsonify(response.to_dict()), 200
+            return jsonify(response.to_dict()), 200, {"ETag": f'"{mission_response.version}"'}
 
         # Determiner le code d'erreur selon le message
         status_code = 400
         if "non trouvee" in message.lower():
             status_code = 404
+        elif "entre-temps" in message.lower():
+            # Version de If-Match perimee, ou modification concurrente
+            status_code = 409
         elif "propre mission" in message.lower():
             status_code = 403
 
@@ -503,6 +867,11 @@ def complete_mission(mission_id):
         required: true
         type: string
         description: ID de la mission a terminer
+      - in: header
+        name: If-Match
+        required: false
+        type: string
+        description: Version attendue de la mission (ETag de GET /api/missions/<id>, ex. "3")
     responses:
       200:
         description: Mission terminee avec succes
@@ -514,6 +883,8 @@ def complete_mission(mission_id):
         description: Vous n'etes pas autorise a terminer cette mission
       404:
         description: Mission non trouvee
+      409:
+        description: La mission a ete modifiee entre-temps (version differente de If-Match)
       500:
         description: Erreur serveur
     """
@@ -521,16 +892,24 @@ def complete_mission(mission_id):
         # Recuperer l'utilisateur courant depuis le token
         current_user_id = request.current_user.get('user_id')
 
-        success, message, mission_response = _service.complete_mission(mission_id, current_user_id)
+        try:
+            expected_version = if_match_version()
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
+        success, message, mission_response = _service.complete_mission(mission_id, current_user_id, expected_version)
 
         if success:
             response = ApiResponse(success=True, message=message, data=mission_response.to_dict())
-            return jsonify(response.to_dict()), 200
+            return jsonify(response.to_dict()), 200, {"ETag": f'"{mission_response.version}"'}
 
         # Determiner le code d'erreur selon le message
         status_code = 400
         if "non trouvee" in message.lower():
             status_code = 404
+        elif "entre-temps" in message.lower():
+            # Version de If-Match perimee, ou modification concurrente
+            status_code = 409
         elif "autorise" in message.lower():
             status_code = 403
 
@@ -550,21 +929,41 @@ def create_mission_blueprint_alias(service: MissionService):
 
     @alias_bp.route("/", methods=["GET"])
     @optional_token
+    @conditional(lambda: (service.data_version(), _expand_version(service)))
     def get_all_missions_alias():
-        """Alias pour GET /missions/ - Liste toutes les missions"""
-        # Appeler le service
-        missions = service.get_all_missions()
+        """
+        Alias pour GET /missions/ - Liste toutes les missions
+        (pagination : ?limit=&cursor=, streaming : ?stream=, utilisateurs : ?expand=)
+        """
+        try:
+            page_args = parse_page_args(request.args)
+            stream = parse_stream_arg(request.args)
+            expand = _parse_expand(request.args, service)
+            if page_args is None:
+                missions = service.iter_all_missions_json(expand)
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
 
-        missions_data = [mission.to_dict() for mission in missions]
-        response = ApiResponse(
-            success=True,
-            message="Missions recuperees avec succes",
-            data=missions_data
-        )
-        return jsonify(response.to_dict()), 200
+        # Appeler le service
+        pagination = None
+        if page_args is not None:
+            limit, cursor = page_args
+            try:
+                missions, next_cursor = service.get_missions_page_json(limit, cursor, expand)
+            except ValueError as e:
+                response = ApiResponse(success=False, message=str(e))
+                return jsonify(response.to_dict()), 400
+            pagination = page_info(limit, next_cursor)
+
+        envelope = ApiResponse(success=True, message="Missions recuperees avec succes", pagination=pagination)
+        if stream:
+            return stream_response(stream, missions, envelope.to_dict(), encoded=True)
+        return fragments_response(missions, envelope.to_dict())
 
     @alias_bp.route("/user/<user_id>", methods=["GET"])
     @optional_token
+    @conditional(service.data_version)
     def get_user_missions(user_id):
         """GET /missions/user/<user_id> - Liste les missions d'un utilisateur
         ---
@@ -576,9 +975,19 @@ def create_mission_blueprint_alias(service: MissionService):
             type: string
             required: true
             description: ID de l'utilisateur
+          - name: limit
+            in: query
+            type: integer
+            required: false
+            description: Nombre de missions par page (sans limit ni cursor, toutes les missions de l'utilisateur sont retournees)
+          - name: cursor
+            in: query
+            type: string
+            required: false
+            description: Curseur de la page suivante (pagination.next_cursor de la reponse precedente)
         responses:
           200:
-            description: Liste des missions de l'utilisateur
+            description: Liste des missions de l'utilisateur (triees par date de creation si paginees, avec un bloc pagination)
             schema:
               type: object
               properties:
@@ -590,60 +999,40 @@ def create_mission_blueprint_alias(service: MissionService):
                   type: array
                   items:
                     type: object
+          304:
+            description: Non modifie depuis l'ETag envoye dans If-None-Match (corps vide)
+          400:
+            description: Parametres de pagination invalides
           404:
             description: Aucune mission trouvee pour cet utilisateur
         """
-        # Appeler le service
-        missions = service.get_all_missions()
-
-        # Filtrer les missions par publisher_id
-        user_missions = [m for m in missions if m.publisher_id == user_id]
-
-        missions_data = [mission.to_dict() for mission in user_missions]
+        try:
+            page_args = parse_page_args(request.args)
+            limit, cursor = page_args if page_args is not None else (None, None)
+            # Missions lues dans l'index du publisher
+            missions, next_cursor = service.get_publisher_missions_json(user_id, limit, cursor)
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
 
-        if len(user_missions) == 0:
-            response = ApiResponse(
-                success=True,
-                message=f"Aucune mission trouvee pour l'utilisateur {user_id}",
-                data=[]
-            )
+        pagination = page_info(limit, next_cursor) if page_args is not None else None
+        if len(missions) == 0:
+            message = f"Aucune mission trouvee pour l'utilisateur {user_id}"
         else:
-            response = ApiResponse(
-                success=True,
-                message=f"{len(user_missions)} mission(s) trouvee(s) pour l'utilisateur",
-                data=missions_data
-            )
+            message = f"{len(missions)} mission(s) trouvee(s) pour l'utilisateur"
 
-        return jsonify(response.to_dict()), 200
+        envelope = ApiResponse(success=True, message=message, pagination=pagination)
+        return fragments_response(missions, envelope.to_dict())
 
     @alias_bp.route("/me", methods=["GET"])
     @token_required
+    @conditional(service.data_version)
     def get_my_missions_alias():
         """Alias pour GET /missions/me - Recupere les missions de l'utilisateur connecte"""
         try:
             current_user_id = request.current_user.get('user_id')
 
-            # Recuperer toutes les missions
-            all_missions = service.get_all_missions()
-
-            # Filtrer les missions creees par l'utilisateur
-            created_missions = [m for m in all_missions if m.publisher_id == current_user_id]
-
-            # Filtrer les missions acceptees par l'utilisateur
-            accepted_missions = [m for m in all_missions if hasattr(m, 'worker_id') and m.worker_id == current_user_id]
-
-            # Convertir en dictionnaires
-            created_missions_data = [m.to_dict() for m in created_missions]
-            accepted_missions_data = [m.to_dict() for m in accepted_missions]
-
-            # Preparer la reponse
-            data = {
-                "created_missions": created_missions_data,
-                "accepted_missions": accepted_missions_data,
-                "total_created": len(created_missions_data),
-                "total_accepted": len(accepted_missions_data),
-                "total": len(created_missions_data) + len(accepted_missions_data)
-            }
+            data = service.get_missions_for_user(current_user_id, counts_only=_is_true(request.args.get('counts_only')))
 
             response = ApiResponse(
                 success=True,
@@ -658,15 +1047,24 @@ def create_mission_blueprint_alias(service: MissionService):
 
     @alias_bp.route("/<mission_id>", methods=["GET"])
     @optional_token
+    @record_conditional(service.get_mission_version, lambda: _expand_version(service))
     def retrieve_mission_alias(mission_id):
-        """Alias pour GET /missions/<id> - Recupere une mission par ID"""
+        """Alias pour GET /missions/<id> - Recupere une mission par ID (utilisateurs : ?expand=)"""
+        try:
+            expand = _parse_expand(request.args, service)
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
         mission_display = service.get_mission_by_id(mission_id)
 
         if mission_display:
+            data = mission_display.to_dict()
+            if expand:
+                data = service.expand_mission(data, expand)
             response = ApiResponse(
                 success=True,
                 message="Mission recuperee avec succes",
-                data=mission_display.to_dict()
+                data=data
             )
             return jsonify(response.to_dict()), 200
 
@@ -679,15 +1077,23 @@ def create_mission_blueprint_alias(service: MissionService):
         """Alias pour POST /missions/<id>/accept - Accepte une mission"""
         try:
             current_user_id = request.current_user.get('user_id')
-            success, message, mission_response = service.accept_mission(mission_id, current_user_id)
+            try:
+                expected_version = if_match_version()
+            except ValueError as e:
+                response = ApiResponse(success=False, message=str(e))
+                return jsonify(response.to_dict()), 400
+            success, message, mission_response = service.accept_mission(mission_id, current_user_id, expected_version)
 
             if success:
                 response = ApiResponse(success=True, message=message, data=mission_response.to_dict())
-                return jsonify(response.to_dict()), 200
+                return jsonify(response.to_dict()), 200, {"ETag": f'"{mission_response.version}"'}
 
             status_code = 400
             if "non trouvee" in message.lower():
                 status_code = 404
+            elif "entre-temps" in message.lower():
+                # Version de If-Match perimee, ou modification concurrente
+                status_code = 409
             elif "propre mission" in message.lower():
                 status_code = 403
 
@@ -703,15 +1109,23 @@ def create_mission_blueprint_alias(service: MissionService):
         """Alias pour POST /missions/<id>/complete - Termine une mission"""
         try:
             current_user_id = request.current_user.get('user_id')
-            success, message, mission_response = service.complete_mission(mission_id, current_user_id)
+            try:
+                expected_version = if_match_version()
+            except ValueError as e:
+                response = ApiResponse(success=False, message=str(e))
+                return jsonify(response.to_dict()), 400
+            success, message, mission_response = service.complete_mission(mission_id, current_user_id, expected_version)
 
             if success:
                 response = ApiResponse(success=True, message=message, data=mission_response.to_dict())
-                return jsonify(response.to_dict()), 200
+                return jsonify(response.to_dict()), 200, {"ETag": f'"{mission_response.version}"'}
 
             status_code = 400
             if "non trouvee" in message.lower():
                 status_code = 404
+            elif "entre-temps" in message.lower():
+                # Version de If-Match perimee, ou modification concurrente
+                status_code = 409
             elif "autorise" in message.lower():
                 status_code = 403
 
@@ -0,0 +1,219 @@
+from flask import Blueprint, request, jsonify
+from services.saved_search_service import SavedSearchService
+from dto.common import ApiResponse
+from utils.auth_decorators import token_required
+from config.settings import INBOX_MAX_ITEMS
+
+
+saved_search_bp = Blueprint("saved_search", __name__)
+_service: SavedSearchService = None
+
+
+def inject(service: SavedSearchService):
+    """Injecte le service des recherches sauvegardees"""
+    global _service
+    _service = service
+
+
+@saved_search_bp.route("/", methods=["POST"])
+@token_required
+def create_saved_search():
+    """Sauvegarde une recherche : les missions publiees ensuite qui y correspondent arrivent dans la boite de reception
+    ---
+    tags:
+      - EQOS : Recherches sauvegardees
+    parameters:
+      - in: header
+        name: Authorization
+        required: true
+        type: string
+        description: Bearer token JWT
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - filters
+          properties:
+            name:
+              type: string
+              description: Nom de la recherche
+            filters:
+              type: object
+              description: Criteres de /api/missions/search (au moins un ; status et sort ne sont pas acceptes)
+              properties:
+                title:
+                  type: string
+                keywords:
+                  type: string
+                type_code:
+                  type: string
+                country:
+                  type: string
+                city:
+                  type: string
+                neighborhood:
+                  type: string
+                budget_min:
+                  type: number
+                budget_max:
+                  type: number
+                publisher_id:
+                  type: string
+    responses:
+      201:
+        description: Recherche sauvegardee avec succes
+      400:
+        description: Criteres invalides
+      401:
+        description: Non autorise
+      500:
+        description: Erreur serveur
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            response = ApiResponse(success=False, message="Corps de la requete vide")
+            return jsonify(response.to_dict()), 400
+
+        current_user_id = request.current_user.get('user_id')
+        success, message, search = _service.create_search(current_user_id, data)
+
+        if success:
+            response = ApiResponse(success=True, message=message, data=search)
+            return jsonify(response.to_dict()), 201
+
+        response = ApiResponse(success=False, message=message)
+        return jsonify(response.to_dict()), 400
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
+
+
+@saved_search_bp.route("/", methods=["GET"])
+@token_required
+def get_my_saved_searches():
+    """Recupere les recherches sauvegardees de l'utilisateur connecte
+    ---
+    tags:
+      - EQOS : Recherches sauvegardees
+    parameters:
+      - in: header
+        name: Authorization
+        required: true
+        type: string
+        description: Bearer token JWT
+    responses:
+      200:
+        description: Liste des recherches sauvegardees
+      401:
+        description: Non autorise
+      500:
+        description: Erreur serveur
+    """
+    try:
+        current_user_id = request.current_user.get('user_id')
+        searches = _service.list_searches(current_user_id)
+        response = ApiResponse(success=True, message=f"{len(searches)} recherche(s) sauvegardee(s)", data=searches)
+        return jsonify(response.to_dict()), 200
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
+
+
+@saved_search_bp.route("/inbox", methods=["GET"])
+@token_required
+def get_inbox():
+    """Recupere les missions publiees correspondant aux recherches sauvegardees (les plus recentes en premier)
+    ---
+    tags:
+      - EQOS : Recherches sauvegardees
+    parameters:
+      - in: header
+        name: Authorization
+        required: true
+        type: string
+        description: Bearer token JWT
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Nombre maximal de correspondances (par defaut toutes celles conservees)
+    responses:
+      200:
+        description: >
+          Correspondances {id, search_id, mission_id, matched_at, mission} ; mission est
+          la mission au format d'affichage (null si elle a ete supprimee)
+      400:
+        description: Parametre limit invalide
+      401:
+        description: Non autorise
+      500:
+        description: Erreur serveur
+    """
+    try:
+        try:
+            limit = int(request.args.get('limit', INBOX_MAX_ITEMS))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= INBOX_MAX_ITEMS:
+            response = ApiResponse(
+                success=False,
+                message=f"Le parametre limit doit etre compris entre 1 et {INBOX_MAX_ITEMS}"
+            )
+            return jsonify(response.to_dict()), 400
+
+        current_user_id = request.current_user.get('user_id')
+        items = _service.get_inbox(current_user_id, limit)
+        response = ApiResponse(success=True, message=f"{len(items)} mission(s) correspondante(s)", data=items)
+        return jsonify(response.to_dict()), 200
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
+
+
+@saved_search_bp.route("/<search_id>", methods=["DELETE"])
+@token_required
+def delete_saved_search(search_id):
+    """Supprime une recherche sauvegardee et ses correspondances
+    ---
+    tags:
+      - EQOS : Recherches sauvegardees
+    parameters:
+      - in: header
+        name: Authorization
+        required: true
+        type: string
+        description: Bearer token JWT
+      - in: path
+        name: search_id
+        required: true
+        type: string
+        description: ID de la recherche
+    responses:
+      200:
+        description: Recherche supprimee avec succes
+      401:
+        description: Non autorise
+      403:
+        description: Vous n'etes pas le proprietaire de cette recherche
+      404:
+        description: Recherche non trouvee
+      500:
+        description: Erreur serveur
+    """
+    try:
+        current_user_id = request.current_user.get('user_id')
+        success, message = _service.delete_search(search_id, current_user_id)
+
+        if success:
+            response = ApiResponse(success=True, message=message)
+            return jsonify(response.to_dict()), 200
+
+        status_code = 404 if "non trouvee" in message.lower() else 403
+        response = ApiResponse(success=False, message=message)
+        return jsonify(response.to_dict()), status_code
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
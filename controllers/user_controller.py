@@ -4,6 +4,10 @@ from utils.file_upload import save_uploaded_file, get_file_url
 from dto.common import ApiResponse
 from dto.user import CreateUserRequest, UpdateUserRequest, UploadPhotoRequest, PhotoUploadResponse
 from dto.auth import LoginRequest
+from utils.http_cache import if_match_version
+from utils.pagination import parse_page_args, page_info
+from utils.streaming import parse_stream_arg, stream_response
+from config.settings import USERS_BATCH_MAX_IDS
 
 
 user_bp = Blueprint("users", __name__)
@@ -113,6 +117,23 @@ def get_all_users():
     ---
     tags:
       - EQOS : Gestion des utilisateurs
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Nombre d'utilisateurs par page (sans limit ni cursor, tous les utilisateurs sont retournés)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Curseur de la page suivante (pagination.next_cursor de la réponse précédente)
+      - name: stream
+        in: query
+        type: string
+        enum: [json, ndjson]
+        required: false
+        description: Réponse envoyée au fil de l'eau (json = même enveloppe, ndjson = un utilisateur par ligne)
     responses:
       200:
         description: Successful Response
@@ -130,16 +151,109 @@ def get_all_users():
                     type: object
                 total:
                   type: integer
+                  description: Nombre d'utilisateurs retournés (dans la page si paginé)
+            pagination:
+              type: object
+              description: Présent uniquement si la liste est paginée
+              properties:
+                limit:
+                  type: integer
+                next_cursor:
+                  type: string
+                has_more:
+                  type: boolean
+      400:
+        description: Paramètres de pagination ou de streaming invalides
     """
     try:
+        page_args = parse_page_args(request.args)
+        stream = parse_stream_arg(request.args)
+
+        if stream and page_args is None:
+            users = (user.to_dict() for user in _service.iter_users())
+            return stream_response(stream, users, ApiResponse(success=True).to_dict(), items_key='users')
+
         # Appel au service
-        user_list_response = _service.get_all_users()
+        pagination = None
+        if page_args is None:
+            user_list_response = _service.get_all_users()
+        else:
+            limit, cursor = page_args
+            user_list_response, next_cursor = _service.get_users_page(limit, cursor)
+            pagination = page_info(limit, next_cursor)
+
+        if stream:
+            users = (user.to_dict() for user in user_list_response.users)
+            envelope = ApiResponse(success=True, pagination=pagination)
+            return stream_response(stream, users, envelope.to_dict(), items_key='users')
 
         response = ApiResponse(
             success=True,
-            data=user_list_response.to_dict()
+            data=user_list_response.to_dict(),
+            pagination=pagination
         )
         return jsonify(response.to_dict()), 200
+    except ValueError as e:
+        response = ApiResponse(success=False, message=str(e))
+        return jsonify(response.to_dict()), 400
+    except Exception as e:
+        response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
+        return jsonify(response.to_dict()), 500
+
+
+@user_bp.route("/batch", methods=["POST"])
+def get_users_batch():
+    """Récupère plusieurs utilisateurs par leur ID en une seule requête
+    ---
+    tags:
+      - EQOS : Gestion des utilisateurs
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - ids
+          properties:
+            ids:
+              type: array
+              items:
+                type: string
+              description: IDs des utilisateurs (doublons ignorés)
+            fields:
+              type: array
+              items:
+                type: string
+              description: Champs à renvoyer (ex. ["first_name", "last_name", "photo_url"]) ; user_id est toujours inclus
+    responses:
+      200:
+        description: Utilisateurs trouvés (users, dans l'ordre des IDs) et IDs inconnus ou supprimés (not_found)
+      400:
+        description: Liste d'IDs invalide ou trop longue, ou champ inconnu
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        user_ids = data.get('ids')
+        fields = data.get('fields')
+        if not isinstance(user_ids, list) or not all(isinstance(user_id, str) for user_id in user_ids):
+            response = ApiResponse(success=False, message="Le champ ids doit être une liste d'IDs")
+            return jsonify(response.to_dict()), 400
+        if not 1 <= len(user_ids) <= USERS_BATCH_MAX_IDS:
+            response = ApiResponse(
+                success=False,
+                message=f"Le champ ids doit contenir entre 1 et {USERS_BATCH_MAX_IDS} IDs"
+            )
+            return jsonify(response.to_dict()), 400
+        if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+            response = ApiResponse(success=False, message="Le champ fields doit être une liste de noms de champs")
+            return jsonify(response.to_dict()), 400
+
+        # Appel au service
+        success, message, result = _service.get_users_by_ids(user_ids, fields)
+
+        response = ApiResponse(success=success, message=message, data=result)
+        return jsonify(response.to_dict()), 200 if success else 400
     except Exception as e:
         response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
         return jsonify(response.to_dict()), 500
@@ -310,11 +424,18 @@ def update_user(id):
               type: boolean
             is_completed:
               type: boolean
+      - in: header
+        name: If-Match
+        required: false
+        type: string
+        description: Version attendue de l'utilisateur (champ version de la réponse, ex. "3")
     responses:
       200:
         description: Successful Response
       404:
         description: Utilisateur non trouvé
+      409:
+        description: L'utilisateur a été modifié entre-temps (version différente de If-Match)
       422:
         description: Validation Error
     """
@@ -328,8 +449,14 @@ def update_user(id):
         # Création du DTO de requête
         update_user_request = UpdateUserRequest.from_dict(data)
 
+        try:
+            expected_version = if_match_version()
+        except ValueError as e:
+            response = ApiResponse(success=False, message=str(e))
+            return jsonify(response.to_dict()), 400
+
         # Appel au service
-        success, message, user_response = _service.update_user(id, update_user_request)
+        success, message, user_response = _service.update_user(id, update_user_request, expected_version)
 
         if success:
             response = ApiResponse(
@@ -337,10 +464,11 @@ def update_user(id):
                 message=message,
                 data=user_response.to_dict()
             )
-            return jsonify(response.to_dict()), 200
+            return jsonify(response.to_dict()), 200, {"ETag": f'"{user_response.version}"'}
 
+        status_code = 409 if "entre-temps" in message else 400
         response = ApiResponse(success=False, message=message)
-        return jsonify(response.to_dict()), 400
+        return jsonify(response.to_dict()), status_code
     except Exception as e:
         response = ApiResponse(success=False, message=f"Erreur serveur: {str(e)}")
         return jsonify(response.to_dict()), 500
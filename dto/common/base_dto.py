@@ -10,6 +10,7 @@ class ApiResponse:
     message: Optional[str] = None
     data: Optional[Any] = None
     errors: Optional[list] = None
+    pagination: Optional[dict] = None
 
     def to_dict(self) -> dict:
         """Convertit le DTO en dictionnaire"""
@@ -20,6 +21,8 @@ class ApiResponse:
             result['data'] = self.data
         if self.errors is not None:
             result['errors'] = self.errors
+        if self.pagination is not None:
+            result['pagination'] = self.pagination
         return result
 
 
@@ -191,6 +191,7 @@ class MissionDisplayDto:
     status: str
     work_days: List[WorkDayDto]
     worker_id: Optional[str] = None
+    version: int = 1
 
     def to_dict(self):
         result = {
@@ -202,7 +203,8 @@ class MissionDisplayDto:
             "budget": self.budget,
             "publisher_id": self.publisher_id,
             "status": self.status,
-            "work_days": [wd.to_dict() for wd in self.work_days]
+            "work_days": [wd.to_dict() for wd in self.work_days],
+            "version": self.version
         }
         if self.worker_id:
             result["worker_id"] = self.worker_id
@@ -220,14 +222,20 @@ class MissionDisplayDto:
             budget=str(model.budget),
             publisher_id=model.publisher_id,
             status=model.status,
-            work_days=model.work_days
+            work_days=model.work_days,
+            version=getattr(model, 'version', 1)
         )
 
 
+# Tris acceptes pour la recherche de missions
+MISSION_SORTS = ('budget', '-budget')
+
+
 @dataclass
 class MissionFilterDto:
     """DTO pour filtrer les missions"""
     title: Optional[str] = None
+    keywords: Optional[str] = None
     type_code: Optional[str] = None
     country: Optional[str] = None
     city: Optional[str] = None
@@ -235,12 +243,15 @@ class MissionFilterDto:
     budget_min: Optional[float] = None
     budget_max: Optional[float] = None
     publisher_id: Optional[str] = None
+    worker_id: Optional[str] = None
     status: Optional[str] = None
+    sort: Optional[str] = None
 
     @staticmethod
     def from_dict(data: dict) -> 'MissionFilterDto':
         return MissionFilterDto(
             title=data.get('title'),
+            keywords=data.get('keywords'),
             type_code=data.get('type_code'),
             country=data.get('country'),
             city=data.get('city'),
@@ -248,5 +259,38 @@ class MissionFilterDto:
             budget_min=float(data['budget_min']) if data.get('budget_min') else None,
             budget_max=float(data['budget_max']) if data.get('budget_max') else None,
             publisher_id=data.get('publisher_id'),
-            status=data.get('status')
+            worker_id=data.get('worker_id'),
+            status=data.get('status'),
+            sort=data.get('sort')
         )
+
+    def matches(self, mission_data: dict) -> bool:
+        """
+        Indique si une mission stockee satisfait les criteres d'egalite
+        (type, localisation, publisher, worker, statut) et la plage de budget.
+        Le titre, les mots-cles et le tri ne sont pas pris en compte.
+        """
+        location = mission_data.get('location')
+        location = location if isinstance(location, dict) else {}
+        for field in ('type_code', 'publisher_id', 'worker_id', 'status'):
+            expected = getattr(self, field)
+            if expected and mission_data.get(field) != expected:
+                return False
+        for field in ('country', 'city', 'neighborhood'):
+            expected = getattr(self, field)
+            if expected and location.get(field) != expected:
+                return False
+        if self.budget_min is not None or self.budget_max is not None:
+            budget = float(mission_data.get('budget', 0))
+            if self.budget_min is not None and budget < self.budget_min:
+                return False
+            if self.budget_max is not None and budget > self.budget_max:
+                return False
+        return True
+
+    def validate(self) -> tuple[bool, str]:
+        if self.sort and self.sort not in MISSION_SORTS:
+            return False, f"Tri invalide: {self.sort} (attendu: {', '.join(MISSION_SORTS)})"
+        if self.budget_min is not None and self.budget_max is not None and self.budget_min > self.budget_max:
+            return False, "Le budget minimum doit etre inferieur ou egal au budget maximum"
+        return True, ""
@@ -24,6 +24,7 @@ class UserResponse:
     updated_at: Optional[str] = None
     last_login: Optional[str] = None
     last_password_change: Optional[str] = None
+    version: int = 1
 
     @staticmethod
     def from_model(user_model) -> 'UserResponse':
@@ -46,7 +47,8 @@ class UserResponse:
             created_at=user_model.created_at,
             updated_at=user_model.updated_at,
             last_login=user_model.last_login,
-            last_password_change=user_model.last_password_change
+            last_password_change=user_model.last_password_change,
+            version=user_model.version
         )
 
     def to_dict(self) -> dict:
@@ -69,7 +71,8 @@ class UserResponse:
             'created_at': self.created_at,
             'updated_at': self.updated_at,
             'last_login': self.last_login,
-            'last_password_change': self.last_password_change
+            'last_password_change': self.last_password_change,
+            'version': self.version
         }
 
 
@@ -0,0 +1,44 @@
+"""
+Script d'import des donnees JSON existantes dans la base SQLite
+Lit data/users.json et data/missions.json et les insere dans SQLITE_DB_FILE.
+Les IDs sont conserves ; les enregistrements deja presents sont ignores,
+le script peut donc etre relance sans risque.
+
+Utilisation :
+    python import_json_to_sqlite.py
+Puis demarrer l'application avec STORAGE_BACKEND=sqlite.
+"""
+
+import json
+import os
+from config.settings import DATA_FILE, MISSIONS_DATA_FILE, SQLITE_DB_FILE
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_user_repository import SqliteUserRepository
+from repositories.sqlite_mission_repository import SqliteMissionRepository
+
+
+def read_json_list(path: str) -> list:
+    """Lit une liste JSON, ou une liste vide si le fichier n'existe pas"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def import_all():
+    """Importe les utilisateurs et les missions dans la base SQLite"""
+    database = SqliteDatabase(SQLITE_DB_FILE)
+
+    users = read_json_list(DATA_FILE)
+    imported_users = SqliteUserRepository(database).import_records(users)
+    print(f"Utilisateurs : {imported_users} importe(s) sur {len(users)}")
+
+    missions = read_json_list(MISSIONS_DATA_FILE)
+    imported_missions = SqliteMissionRepository(database).import_records(missions)
+    print(f"Missions : {imported_missions} importee(s) sur {len(missions)}")
+
+    print(f"Base SQLite : {SQLITE_DB_FILE}")
+
+
+if __name__ == "__main__":
+    import_all()
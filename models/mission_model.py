@@ -24,7 +24,8 @@ class MissionModel:
         status: str = "DRAFT",
         worker_id: str = None,
         created_at: str = None,
-        updated_at: str = None
+        updated_at: str = None,
+        version: int = 1
     ):
         self.id = mission_id or str(uuid.uuid4())
         self.title = title
@@ -38,6 +39,8 @@ class MissionModel:
         self.work_days = work_days
         self.created_at = created_at or datetime.utcnow().isoformat()
         self.updated_at = updated_at
+        # Numero de version, incremente par le repository a chaque mise a jour
+        self.version = version
 
     def to_dict(self):
         """Convertit le modele en dictionnaire"""
@@ -52,7 +55,8 @@ class MissionModel:
             "status": self.status,
             "work_days": [wd.to_dict() if isinstance(wd, WorkDayDto) else wd for wd in self.work_days],
             "created_at": self.created_at,
-            "updated_at": self.updated_at
+            "updated_at": self.updated_at,
+            "version": self.version
         }
         if self.worker_id:
             result["worker_id"] = self.worker_id
@@ -76,7 +80,8 @@ class MissionModel:
             status=data.get('status', 'DRAFT'),
             work_days=[WorkDayDto.from_dict(wd) if isinstance(wd, dict) else wd for wd in work_days_data],
             created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
+            updated_at=data.get('updated_at'),
+            version=data.get('version', 1)
         )
 
     def publish(self):
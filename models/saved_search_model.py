@@ -0,0 +1,84 @@
+"""
+Modeles de donnees pour les recherches sauvegardees et la boite de reception des correspondances
+"""
+
+import uuid
+from datetime import datetime
+
+
+class SavedSearchModel:
+    """Recherche sauvegardee par un utilisateur (criteres de MissionFilterDto)"""
+
+    def __init__(
+        self,
+        user_id: str,
+        filters: dict,
+        name: str = "",
+        search_id: str = None,
+        created_at: str = None
+    ):
+        self.id = search_id or str(uuid.uuid4())
+        self.user_id = user_id
+        self.name = name
+        self.filters = filters
+        self.created_at = created_at or datetime.utcnow().isoformat()
+
+    def to_dict(self):
+        """Convertit le modele en dictionnaire"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "name": self.name,
+            "filters": self.filters,
+            "created_at": self.created_at
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'SavedSearchModel':
+        """Cree un modele a partir d'un dictionnaire"""
+        return SavedSearchModel(
+            user_id=data.get('user_id'),
+            filters=data.get('filters') or {},
+            name=data.get('name', ''),
+            search_id=data.get('id'),
+            created_at=data.get('created_at')
+        )
+
+
+class InboxItemModel:
+    """Mission publiee correspondant a une recherche sauvegardee d'un utilisateur"""
+
+    def __init__(
+        self,
+        user_id: str,
+        search_id: str,
+        mission_id: str,
+        item_id: str = None,
+        matched_at: str = None
+    ):
+        self.id = item_id or str(uuid.uuid4())
+        self.user_id = user_id
+        self.search_id = search_id
+        self.mission_id = mission_id
+        self.matched_at = matched_at or datetime.utcnow().isoformat()
+
+    def to_dict(self):
+        """Convertit le modele en dictionnaire"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "search_id": self.search_id,
+            "mission_id": self.mission_id,
+            "matched_at": self.matched_at
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'InboxItemModel':
+        """Cree un modele a partir d'un dictionnaire"""
+        return InboxItemModel(
+            user_id=data.get('user_id'),
+            search_id=data.get('search_id'),
+            mission_id=data.get('mission_id'),
+            item_id=data.get('id'),
+            matched_at=data.get('matched_at')
+        )
@@ -3,6 +3,10 @@ from typing import Optional
 from enum import Enum
 
 
+# Champs ajoutés par le stockage, absents du modèle
+STORAGE_FIELDS = ('revision',)
+
+
 class UserType(str, Enum):
     """Type d'utilisateur"""
     PARTICULIER = "PARTICULIER"
@@ -32,7 +36,8 @@ class UserModel:
         created_at: Optional[str] = None,
         updated_at: Optional[str] = None,
         last_login: Optional[str] = None,
-        last_password_change: Optional[str] = None
+        last_password_change: Optional[str] = None,
+        version: int = 1
     ):
         self.user_id = user_id
         self.first_name = first_name
@@ -53,6 +58,8 @@ class UserModel:
         self.updated_at = updated_at
         self.last_login = last_login
         self.last_password_change = last_password_change
+        # Numéro de version, incrémenté par le repository à chaque mise à jour
+        self.version = version
 
     def to_dict(self, exclude_password: bool = True):
         """Convertit l'utilisateur en dictionnaire"""
@@ -74,7 +81,8 @@ class UserModel:
             "created_at": self.created_at,
             "updated_at": self.updated_at,
             "last_login": self.last_login,
-            "last_password_change": self.last_password_change
+            "last_password_change": self.last_password_change,
+            "version": self.version
         }
 
         if not exclude_password:
@@ -84,8 +92,8 @@ class UserModel:
 
     @staticmethod
     def from_dict(data: dict):
-        """Crée un UserModel à partir d'un dictionnaire"""
-        return UserModel(**data)
+        """Crée un UserModel à partir d'un dictionnaire (champs de stockage ignorés)"""
+        return UserModel(**{key: value for key, value in data.items() if key not in STORAGE_FIELDS})
 
 
 class LoginModel:
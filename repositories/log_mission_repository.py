@@ -0,0 +1,211 @@
+"""
+Repository des missions en journal append-only avec compaction
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from repositories.mission_repository import MissionRepository
+from utils.file_store import JsonFileStore
+
+
+class LogMissionRepository(MissionRepository):
+    """
+    Variante de MissionRepository ou chaque creation / mise a jour est ajoutee
+    en fin de journal (une ligne JSON par enregistrement, append + fsync) au
+    lieu de reecrire tout le fichier.
+
+    - snapshot : data_file, au meme format que MissionRepository
+    - journal : data_file + '.log', rejoue par-dessus le snapshot au chargement
+
+    Un index en memoire associe chaque mission a la position de son dernier
+    enregistrement dans le journal. Les ajouts faits par un autre processus
+    sont lus a partir de la derniere position connue, sans tout recharger.
+    La compaction (periodique, en arriere-plan) reecrit le snapshot et ne
+    garde dans le journal que les enregistrements arrives pendant l'ecriture.
+    """
+
+    def __init__(self, data_file: str, compaction_interval: float = 60, compaction_threshold: int = 1000,
+                 fsync_policy: Optional[str] = None):
+        self.log_file = data_file + '.log'
+        self.compaction_threshold = compaction_threshold
+        self._offsets: Dict[str, int] = {}
+        self._log_inode = None
+        self._log_position = 0
+        self._log_records = 0
+        super().__init__(data_file, fsync_policy)
+        self._log_store = JsonFileStore(self.log_file, fsync_policy)
+        self._stats.update(appends=0, compactions=0, compaction_errors=0)
+
+        self._stop_compaction = threading.Event()
+        if compaction_interval:
+            thread = threading.Thread(target=self._compaction_loop, args=(compaction_interval,), daemon=True)
+            thread.start()
+
+    def _ensure_file_exists(self):
+        """Cree le snapshot et le journal s'ils n'existent pas"""
+        super()._ensure_file_exists()
+        if not os.path.exists(self.log_file):
+            open(self.log_file, 'ab').close()
+
+    def _log_stat(self) -> tuple:
+        """Retourne (inode, taille) du journal"""
+        try:
+            stat = os.stat(self.log_file)
+        except FileNotFoundError:
+            return None, 0
+        return stat.st_ino, stat.st_size
+
+    def _load(self) -> Dict[str, dict]:
+        """Retourne les missions en memoire, en lisant la fin du journal si elle a grandi"""
+        with self._lock:
+            signature = self._file_signature()
+            log_inode, log_size = self._log_stat()
+            if (signature is not None and signature == self._signature
+                    and log_inode == self._log_inode and log_size >= self._log_position):
+                if log_size > self._log_position:
+                    self._replay(self._log_position)
+                self._stats["hits"] += 1
+                return self._records
+
+            start = time.perf_counter()
+            self._reset(self._read_missions())
+            self._offsets = {}
+            self._log_records = 0
+            self._log_inode = log_inode
+            self._replay(0)
+            self._signature = signature
+            self._stats["reloads"] += 1
+            self._stats["reload_time"] += time.perf_counter() - start
+            return self._records
+
+    def _replay(self, start: int):
+        """Applique les enregistrements du journal a partir de la position start"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(start)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        offset = start
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                # Enregistrement incomplet (ecriture en cours ou interrompue)
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if record and record.get('op') == 'put':
+                mission_data = record['mission']
+                self._put(mission_data)
+                self._offsets[mission_data.get('id')] = offset
+                self._log_records += 1
+            offset += len(line)
+        self._log_position = offset
+
+    def _save(self, changed: List[dict]):
+        """Ajoute les missions modifiees en fin de journal (append + fsync selon la politique)"""
+        lines = [
+            json.dumps({"op": "put", "mission": mission_data}, ensure_ascii=False).encode('utf-8') + b'\n'
+            for mission_data in changed
+        ]
+        with open(self.log_file, 'ab') as f:
+            offset = f.tell()
+            if offset > self._log_position:
+                # Appele sous _mutation : le journal vient d'etre relu, les octets au-dela
+                # de _log_position sont un enregistrement tronque (arret pendant un ajout).
+                # Ils sont supprimes pour ne pas etre colles au nouvel enregistrement.
+                f.truncate(self._log_position)
+                offset = self._log_position
+            f.write(b''.join(lines))
+            self._log_store.sync(f)
+
+        # Sans verrou inter-processus (plateforme sans fcntl), un autre processus a pu
+        # ecrire entre-temps : ses enregistrements (et les notres) seront relus depuis
+        # l'ancienne position au prochain chargement.
+        if offset == self._log_position:
+            for mission_data, line in zip(changed, lines):
+                self._offsets[mission_data.get('id')] = offset
+                offset += len(line)
+                self._log_records += 1
+            self._log_position = offset
+        self._stats["appends"] += len(changed)
+
+    def get_stats(self) -> dict:
+        """Compteurs du cache et du journal (enregistrements, enregistrements encore valides)"""
+        with self._lock:
+            return dict(super().get_stats(), log_records=self._log_records, live_log_records=len(self._offsets))
+
+    def compact(self, min_records: int = 1) -> bool:
+        """
+        Reecrit le snapshot avec l'etat courant et vide le journal.
+        Le snapshot est ecrit hors verrou : les ecritures continuent pendant la
+        compaction et les enregistrements arrives entre-temps sont conserves.
+        Retourne True si une compaction a eu lieu.
+        """
+        with self._lock:
+            self._load()
+            if self._log_records < min_records:
+                return False
+            missions = list(self._records.values())
+            position = self._log_position
+            log_inode = self._log_inode
+
+        snapshot_tmp = f"{self.data_file}.{os.getpid()}.compact.tmp"
+        with open(snapshot_tmp, 'w', encoding='utf-8') as f:
+            json.dump(missions, f, ensure_ascii=False, indent=2)
+            self._store.sync(f)
+
+        with self._mutation():
+            if self._log_inode != log_inode:
+                # Un autre processus a compacte le journal entre-temps
+                os.remove(snapshot_tmp)
+                return False
+
+            with open(self.log_file, 'rb') as f:
+                f.seek(position)
+                tail = f.read(self._log_position - position)
+
+            log_tmp = f"{self.log_file}.{os.getpid()}.compact.tmp"
+            with open(log_tmp, 'wb') as f:
+                f.write(tail)
+                self._log_store.sync(f)
+
+            # Un arret entre les deux remplacements laisse le nouveau snapshot et
+            # l'ancien journal : le rejouer complet redonne le meme etat.
+            self._store.replace(snapshot_tmp)
+            self._log_store.replace(log_tmp)
+
+            self._signature = self._file_signature()
+            self._log_inode, _ = self._log_stat()
+            self._offsets = {
+                mission_id: offset - position
+                for mission_id, offset in self._offsets.items()
+                if offset >= position
+            }
+            self._log_records = tail.count(b'\n')
+            self._log_position = len(tail)
+            self._stats["compactions"] += 1
+            return True
+
+    def _compaction_loop(self, interval: float):
+        """Compacte periodiquement le journal lorsqu'il depasse le seuil"""
+        while not self._stop_compaction.wait(interval):
+            try:
+                self.compact(min_records=self.compaction_threshold)
+            except OSError:
+                self._stats["compaction_errors"] += 1
+
+    def close(self):
+        """Arrete la compaction en arriere-plan"""
+        self._stop_compaction.set()
+
+    def find_offset(self, mission_id: str) -> Optional[int]:
+        """Position du dernier enregistrement d'une mission dans le journal (None si dans le snapshot)"""
+        with self._lock:
+            self._load()
+            return self._offsets.get(mission_id)
@@ -4,16 +4,72 @@ Repository pour la gestion de la persistance des missions
 
 import json
 import os
-from typing import List, Optional
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from models.mission_model import MissionModel
 from dto.mission import MissionFilterDto
+from repositories.text_index import TextIndex
+from utils.file_store import JsonFileStore
+from utils.group_commit import GroupCommitter, Operation, Outcome, apply_operations
+from utils.pagination import page_key
+
+
+# Champs des missions indexes (valeur -> ensemble d'IDs)
+INDEXED_FIELDS = (
+    'status',
+    'type_code',
+    'publisher_id',
+    'worker_id',
+    'country',
+    'city',
+    'neighborhood'
+)
+
+# Champs texte indexes pour la recherche plein texte, avec leur poids
+TEXT_FIELDS = {
+    'title': 2.0,
+    'description': 1.0
+}
 
 
 class MissionRepository:
-    """Repository pour les operations CRUD sur les missions"""
+    """Repository pour les operations CRUD sur les missions
 
-    def __init__(self, data_file: str):
+    Les missions sont gardees en memoire (indexees par ID) et le fichier
+    n'est relu que lorsque sa signature (mtime, taille, inode) change,
+    c'est-a-dire lorsqu'un autre processus l'a modifie.
+    Des index secondaires (statut, type, publisher, worker, localisation),
+    des index tries sur le budget et sur (created_at, id) pour la pagination,
+    et un index plein texte (titre, description) sont maintenus a chaque ecriture pour servir les recherches.
+    Les ecritures sont atomiques et protegees par un verrou inter-processus ;
+    les mutations concurrentes sont regroupees en une seule ecriture.
+    Chaque ecriture estampille les missions modifiees d'une revision
+    croissante ; la plus grande est la version des donnees (data_version)
+    et un index trie (revision, id) sert la synchronisation differentielle.
+    Les ecouteurs enregistres par add_listener() recoivent les IDs des
+    missions modifiees apres chaque ecriture.
+    """
+
+    def __init__(self, data_file: str, fsync_policy: Optional[str] = None):
         self.data_file = data_file
+        self._store = JsonFileStore(data_file, fsync_policy)
+        self._lock = threading.RLock()
+        self._records: Dict[str, dict] = {}
+        self._positions: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        self._budget_index: List[tuple] = []
+        self._created_index: List[tuple] = []
+        self._publisher_index: Dict[str, List[tuple]] = {}
+        self._text_index = TextIndex(TEXT_FIELDS)
+        self._revision = 0
+        self._revision_index: List[tuple] = []
+        self._signature = None
+        self._stats = {"hits": 0, "reloads": 0, "reload_time": 0.0}
+        self._committer = GroupCommitter(self._commit)
+        self._listeners: List[Callable[[List[str]], None]] = []
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -32,86 +88,473 @@ class MissionRepository:
             return []
 
     def _write_missions(self, missions: List[dict]):
-        """Ecrit les missions dans le fichier"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(missions, f, ensure_ascii=False, indent=2)
+        """Ecrit les missions dans le fichier (fichier temporaire puis renommage)"""
+        self._store.write(missions)
+
+    def _file_signature(self) -> Optional[tuple]:
+        """Signature du fichier utilisee pour detecter les modifications externes"""
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _load(self) -> Dict[str, dict]:
+        """Retourne les missions en memoire, rechargees si le fichier a change"""
+        with self._lock:
+            # La signature est lue avant le contenu : une ecriture concurrente
+            # provoque au pire un rechargement supplementaire.
+            signature = self._file_signature()
+            if signature is not None and signature == self._signature:
+                self._stats["hits"] += 1
+                return self._records
+
+            start = time.perf_counter()
+            self._reset(self._read_missions())
+            self._signature = signature
+            self._stats["reloads"] += 1
+            self._stats["reload_time"] += time.perf_counter() - start
+            return self._records
+
+    def _reset(self, missions: Iterable[dict]):
+        """Remplace les missions en memoire et reconstruit tous les index"""
+        self._records = {}
+        self._positions = {}
+        self._indexes = {field: {} for field in INDEXED_FIELDS}
+        self._budget_index = []
+        self._created_index = []
+        self._publisher_index = {}
+        self._text_index = TextIndex(TEXT_FIELDS)
+        self._revision = 0
+        self._revision_index = []
+        for mission_data in missions:
+            # En cas de doublon, la premiere occurrence l'emporte
+            if mission_data.get('id') not in self._records:
+                self._put(mission_data, bulk=True)
+        self._budget_index.sort()
+        self._created_index.sort()
+        for keys in self._publisher_index.values():
+            keys.sort()
+        self._revision_index.sort()
+
+    @staticmethod
+    def _index_values(mission_data: dict) -> Iterable[tuple]:
+        """Retourne les couples (champ, valeur) indexes d'une mission"""
+        location = mission_data.get('location')
+        location = location if isinstance(location, dict) else {}
+        for field in INDEXED_FIELDS:
+            value = location.get(field, '') if field in ('country', 'city', 'neighborhood') else mission_data.get(field)
+            if value:
+                yield field, value
+
+    def _budget_entry(self, mission_data: dict) -> tuple:
+        """Entree de l'index budget : (budget, position, id)"""
+        mission_id = mission_data.get('id')
+        return (float(mission_data.get('budget', 0)), self._positions[mission_id], mission_id)
+
+    @staticmethod
+    def _revision_entry(mission_data: dict) -> Optional[tuple]:
+        """Entree de l'index des revisions : (revision, id), None si la mission n'en a pas"""
+        revision = mission_data.get('revision')
+        return (revision, mission_data.get('id')) if isinstance(revision, int) else None
+
+    def _put(self, mission_data: dict, bulk: bool = False):
+        """
+        Ajoute ou remplace une mission en maintenant les index.
+        En chargement groupe (bulk), les index tries le sont une seule fois par l'appelant.
+        """
+        mission_id = mission_data.get('id')
+        previous = self._records.get(mission_id)
+        if previous is not None:
+            for field, value in self._index_values(previous):
+                ids = self._indexes[field].get(value)
+                ids.discard(mission_id)
+                if not ids:
+                    del self._indexes[field][value]
+            del self._budget_index[bisect_left(self._budget_index, self._budget_entry(previous))]
+            del self._created_index[bisect_left(self._created_index, page_key(previous))]
+            publisher_keys = self._publisher_index.get(previous.get('publisher_id'))
+            if publisher_keys is not None:
+                del publisher_keys[bisect_left(publisher_keys, page_key(previous))]
+                if not publisher_keys:
+                    del self._publisher_index[previous.get('publisher_id')]
+            entry = self._revision_entry(previous)
+            if entry is not None:
+                del self._revision_index[bisect_left(self._revision_index, entry)]
+        else:
+            self._positions[mission_id] = len(self._positions)
+
+        self._records[mission_id] = mission_data
+        entry = self._revision_entry(mission_data)
+        if entry is not None:
+            self._revision = max(self._revision, entry[0])
+            if bulk:
+                self._revision_index.append(entry)
+            else:
+                insort(self._revision_index, entry)
+        for field, value in self._index_values(mission_data):
+            self._indexes[field].setdefault(value, set()).add(mission_id)
+        publisher_keys = self._publisher_index.setdefault(mission_data.get('publisher_id'), [])
+        if bulk:
+            self._budget_index.append(self._budget_entry(mission_data))
+            self._created_index.append(page_key(mission_data))
+            publisher_keys.append(page_key(mission_data))
+        else:
+            insort(self._budget_index, self._budget_entry(mission_data))
+            insort(self._created_index, page_key(mission_data))
+            insort(publisher_keys, page_key(mission_data))
+        self._text_index.add(mission_id, {field: mission_data.get(field, '') for field in TEXT_FIELDS})
+
+    def _intersect(self, criteria: Dict[str, str], restrict: Iterable[Set[str]] = ()) -> Optional[Set[str]]:
+        """
+        Intersecte les index des criteres d'egalite et les ensembles d'IDs fournis,
+        les plus petits ensembles en premier.
+        Retourne None si aucun critere n'est fourni (toutes les missions).
+        """
+        id_sets = [self._indexes[field].get(value, set()) for field, value in criteria.items()]
+        id_sets.extend(restrict)
+        if not id_sets:
+            return None
+
+        id_sets.sort(key=len)
+        candidates = set(id_sets[0])
+        for ids in id_sets[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+        return candidates
+
+    def _find_ids(
+        self,
+        criteria: Dict[str, str],
+        budget_min: Optional[float] = None,
+        budget_max: Optional[float] = None,
+        sort: Optional[str] = None,
+        restrict: Iterable[Set[str]] = (),
+        scores: Optional[Dict[str, float]] = None
+    ) -> List[str]:
+        """
+        Retourne les IDs des missions correspondant aux criteres d'egalite, a la
+        plage de budget, aux ensembles d'IDs de restrict et aux scores de pertinence
+        (si fournis). Les IDs sont tries par budget ('budget' / '-budget'), par
+        pertinence ou a defaut dans l'ordre du fichier.
+        A appeler avec le verrou pris, apres _load().
+        """
+        records = self._records
+        restrict = list(restrict)
+        if scores is not None:
+            restrict.append(set(scores))
+        candidates = self._intersect(criteria, restrict)
+
+        if budget_min is None and budget_max is None and not sort:
+            if candidates is None:
+                return list(records)
+            if scores is not None:
+                return sorted(candidates, key=lambda mission_id: (-scores[mission_id], self._positions[mission_id]))
+            return sorted(candidates, key=self._positions.__getitem__)
+
+        index = self._budget_index
+        low = bisect_left(index, (budget_min,)) if budget_min is not None else 0
+        high = bisect_right(index, (budget_max, float('inf'))) if budget_max is not None else len(index)
+
+        if candidates is not None and len(candidates) < high - low:
+            # Moins de candidats que de missions dans la plage : on filtre les candidats
+            entries = sorted(
+                entry for entry in (self._budget_entry(records[mission_id]) for mission_id in candidates)
+                if (budget_min is None or entry[0] >= budget_min)
+                and (budget_max is None or entry[0] <= budget_max)
+            )
+        else:
+            entries = index[low:high]
+            if candidates is not None:
+                entries = [entry for entry in entries if entry[2] in candidates]
+
+        if scores is not None and not sort:
+            entries = sorted(entries, key=lambda entry: (-scores[entry[2]], entry[1]))
+        elif not sort:
+            entries = sorted(entries, key=lambda entry: entry[1])
+        elif sort.startswith('-'):
+            entries = reversed(entries)
+        return [entry[2] for entry in entries]
+
+    def _save(self, changed: List[dict]):
+        """
+        Persiste les missions modifiees et memorise la nouvelle signature.
+        Le fichier JSON est reecrit en entier.
+        """
+        self._write_missions(list(self._records.values()))
+        self._signature = self._file_signature()
+
+    @contextmanager
+    def _mutation(self):
+        """
+        Cycle lecture-modification-ecriture : verrou du processus et verrou
+        inter-processus, puis rechargement des missions si un autre processus
+        les a modifiees.
+        """
+        with self._lock, self._store.lock():
+            self._load()
+            yield
+
+    def _commit(self, operations: List[Operation]) -> List[Outcome]:
+        """Applique un lot d'operations et le persiste en une seule ecriture"""
+        with self._mutation():
+            outcomes, changed = apply_operations(operations)
+            if changed:
+                self._stamp(changed)
+                try:
+                    self._save(changed)
+                except BaseException:
+                    # La memoire ne correspond plus au fichier : rechargement au prochain acces
+                    self._signature = None
+                    raise
+        if changed:
+            self._notify([mission_data.get('id') for mission_data in changed])
+        return outcomes
+
+    def _stamp(self, changed: List[dict]):
+        """Estampille les missions modifiees d'une nouvelle revision (la plus grande de l'index)"""
+        self._revision += 1
+        entries = []
+        for mission_data in changed:
+            entry = self._revision_entry(mission_data)
+            current = self._records.get(mission_data.get('id')) is mission_data
+            if current and entry is not None:
+                del self._revision_index[bisect_left(self._revision_index, entry)]
+            mission_data['revision'] = self._revision
+            # Une mission remplacee plus loin dans le meme lot n'est pas indexee
+            if current:
+                entries.append((self._revision, mission_data.get('id')))
+        self._revision_index.extend(sorted(entries))
+
+    def data_version(self) -> int:
+        """Version des missions : revision de la derniere ecriture (tous processus confondus)"""
+        with self._lock:
+            self._load()
+            return self._revision
+
+    def add_listener(self, listener: Callable[[List[str]], None]):
+        """Enregistre une fonction appelee avec les IDs des missions modifiees"""
+        self._listeners.append(listener)
+
+    def _notify(self, mission_ids: List[str]):
+        """Previent les ecouteurs des missions modifiees"""
+        for listener in self._listeners:
+            listener(mission_ids)
+
+    def get_stats(self) -> dict:
+        """Retourne les compteurs du cache (hits, rechargements, temps de rechargement) et des ecritures"""
+        with self._lock:
+            return dict(self._stats, size=len(self._records), **self._committer.get_stats())
 
     def create(self, mission: MissionModel) -> MissionModel:
         """Cree une nouvelle mission"""
-        missions = self._read_missions()
-        missions.append(mission.to_dict())
-        self._write_missions(missions)
-        return mission
+        def operation():
+            mission_data = mission.to_dict()
+            self._put(mission_data)
+            return mission, [mission_data]
+
+        return self._committer.submit(operation)
+
+    def create_many(self, missions: List[MissionModel]) -> List[MissionModel]:
+        """Cree plusieurs missions en une seule operation (une seule ecriture)"""
+        def operation():
+            records = [mission.to_dict() for mission in missions]
+            for mission_data in records:
+                self._put(mission_data)
+            return missions, records
+
+        return self._committer.submit(operation)
 
     def find_all(self) -> List[MissionModel]:
         """Recupere toutes les missions"""
-        missions_data = self._read_missions()
-        return [MissionModel.from_dict(m) for m in missions_data]
+        records = self._load()
+        return [MissionModel.from_dict(m) for m in list(records.values())]
+
+    def iter_all(self) -> Iterator[MissionModel]:
+        """Parcourt toutes les missions, hydratees une par une au fil de l'iteration"""
+        return (MissionModel.from_dict(mission_data) for mission_data in self.iter_records())
+
+    def iter_records(self) -> Iterator[dict]:
+        """Parcourt les missions stockees, sans hydratation (dictionnaires en lecture seule)"""
+        with self._lock:
+            records = list(self._load().values())
+        return iter(records)
 
     def find_by_id(self, mission_id: str) -> Optional[MissionModel]:
         """Trouve une mission par son ID"""
-        missions = self._read_missions()
-        for mission_data in missions:
-            if mission_data.get('id') == mission_id:
-                return MissionModel.from_dict(mission_data)
-        return None
+        mission_data = self._load().get(mission_id)
+        if mission_data is None:
+            return None
+        return MissionModel.from_dict(mission_data)
 
     def update(self, mission: MissionModel) -> MissionModel:
-        """Met a jour une mission existante"""
-        missions = self._read_missions()
-        for i, m in enumerate(missions):
-            if m.get('id') == mission.id:
-                missions[i] = mission.to_dict()
-                self._write_missions(missions)
-                return mission
-        raise ValueError(f"Mission avec l'ID {mission.id} non trouvee")
+        """Met a jour une mission existante (sa version est incrementee)"""
+        def operation():
+            current = self._records.get(mission.id)
+            if current is None:
+                raise ValueError(f"Mission avec l'ID {mission.id} non trouvee")
+            mission.version = current.get('version', 1) + 1
+            mission_data = mission.to_dict()
+            self._put(mission_data)
+            return mission, [mission_data]
 
-    def find_by_filters(self, filters: MissionFilterDto) -> List[MissionModel]:
-        """Trouve des missions selon des filtres"""
-        all_missions = self.find_all()
-        filtered_missions = []
+        return self._committer.submit(operation)
+
+    def update_if(self, mission: MissionModel, expected_status: str,
+                  expected_version: Optional[int] = None) -> Optional[MissionModel]:
+        """
+        Met a jour une mission seulement si son statut stocke vaut encore
+        expected_status et, si elle est fournie, sa version expected_version
+        (compare-and-set). La verification et l'ecriture sont faites dans le
+        meme lot, sous le verrou inter-processus.
+        Retourne la mission (version incrementee), ou None si elle a change entre-temps.
+        """
+        def operation():
+            current = self._records.get(mission.id)
+            if current is None:
+                raise ValueError(f"Mission avec l'ID {mission.id} non trouvee")
+            version = current.get('version', 1)
+            if current.get('status') != expected_status:
+                return None, []
+            if expected_version is not None and version != expected_version:
+                return None, []
+            mission.version = version + 1
+            mission_data = mission.to_dict()
+            self._put(mission_data)
+            return mission, [mission_data]
 
-        for mission in all_missions:
-            # Filtre par titre
-            if filters.title and filters.title.lower() not in mission.title.lower():
-                continue
+        return self._committer.submit(operation)
 
-            # Filtre par type
-            if filters.type_code and mission.type_code != filters.type_code:
-                continue
+    def find_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> Tuple[List[MissionModel], Optional[Tuple[str, str]]]:
+        """
+        Recupere une page de missions triees par (created_at, id), apres la cle after.
+        Seules les missions de la page sont hydratees.
+        Retourne les missions et la cle de la derniere (None s'il n'y a pas de page suivante).
+        """
+        page, next_key = self.find_page_records(limit, after)
+        return [MissionModel.from_dict(m) for m in page], next_key
 
-            # Filtre par localisation
-            if filters.country and mission.location.country != filters.country:
-                continue
-            if filters.city and mission.location.city != filters.city:
-                continue
-            if filters.neighborhood and mission.location.neighborhood != filters.neighborhood:
-                continue
+    def find_page_records(self, limit: int, after: Optional[Tuple[str, str]] = None) -> Tuple[List[dict], Optional[Tuple[str, str]]]:
+        """Comme find_page, sans hydratation (dictionnaires en lecture seule)"""
+        with self._lock:
+            self._load()
+            index = self._created_index
+            start = bisect_right(index, after) if after else 0
+            keys = index[start:start + limit + 1]
+            page = [self._records[mission_id] for _, mission_id in keys[:limit]]
+        next_key = keys[limit - 1] if len(keys) > limit else None
+        return page, next_key
 
-            # Filtre par budget
-            if filters.budget_min is not None and mission.budget < filters.budget_min:
-                continue
-            if filters.budget_max is not None and mission.budget > filters.budget_max:
-                continue
+    def find_publisher_page_records(
+        self,
+        publisher_id: str,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None
+    ) -> Tuple[List[dict], Optional[Tuple[str, str]]]:
+        """
+        Comme find_page_records, limite aux missions d'un publisher : la page est
+        lue dans l'index trie de ce publisher (cout proportionnel a ses missions)
+        """
+        with self._lock:
+            self._load()
+            index = self._publisher_index.get(publisher_id, [])
+            start = bisect_right(index, after) if after else 0
+            keys = index[start:start + limit + 1]
+            page = [self._records[mission_id] for _, mission_id in keys[:limit]]
+        next_key = keys[limit - 1] if len(keys) > limit else None
+        return page, next_key
+
+    def find_changed_records(self, since: int) -> Tuple[List[dict], int]:
+        """
+        Missions creees ou modifiees apres la version since, dans l'ordre des
+        ecritures (dictionnaires en lecture seule), et version courante.
+        """
+        with self._lock:
+            self._load()
+            index = self._revision_index
+            start = bisect_left(index, (since + 1,))
+            records = [self._records[mission_id] for _, mission_id in index[start:]]
+            return records, self._revision
+
+    def find_by_filters(self, filters: MissionFilterDto) -> List[MissionModel]:
+        """
+        Trouve des missions selon des filtres.
+        Avec des mots-cles (et sans tri explicite), les missions sont classees par pertinence.
+        """
+        return list(self.iter_by_filters(filters))
 
-            # Filtre par publisher
-            if filters.publisher_id and mission.publisher_id != filters.publisher_id:
-                continue
+    def iter_by_filters(self, filters: MissionFilterDto) -> Iterator[MissionModel]:
+        """Comme find_by_filters, en hydratant les missions une par une au fil de l'iteration"""
+        return (MissionModel.from_dict(mission_data) for mission_data in self.iter_records_by_filters(filters))
 
-            # Filtre par statut
-            if filters.status and mission.status != filters.status:
-                continue
+    def iter_records_by_filters(self, filters: MissionFilterDto) -> Iterator[dict]:
+        """Comme iter_by_filters, sans hydratation (dictionnaires en lecture seule)"""
+        criteria = {
+            field: getattr(filters, field)
+            for field in INDEXED_FIELDS
+            if getattr(filters, field, None)
+        }
 
-            filtered_missions.append(mission)
+        with self._lock:
+            self._load()
+            scores = self._text_index.search(filters.keywords) if filters.keywords else None
 
-        return filtered_missions
+            mission_ids = self._find_ids(
+                criteria,
+                filters.budget_min,
+                filters.budget_max,
+                filters.sort,
+                scores=scores
+            )
+            candidates = [self._records[mission_id] for mission_id in mission_ids]
+
+        # Filtre par titre : sous-chaine sans tenir compte de la casse. L'index des mots
+        # ne peut pas le restreindre (une sous-chaine peut commencer au milieu d'un mot).
+        title = filters.title.lower() if filters.title else None
+        for mission_data in candidates:
+            if not title or title in mission_data.get('title', '').lower():
+                yield mission_data
+
+    def _find_by_criteria(self, **criteria) -> List[MissionModel]:
+        """Trouve les missions correspondant a des criteres d'egalite indexes"""
+        with self._lock:
+            self._load()
+            candidates = [self._records[mission_id] for mission_id in self._find_ids(criteria)]
+        return [MissionModel.from_dict(m) for m in candidates]
 
     def find_by_publisher(self, publisher_id: str) -> List[MissionModel]:
         """Trouve toutes les missions d'un publisher"""
-        all_missions = self.find_all()
-        return [m for m in all_missions if m.publisher_id == publisher_id]
+        return self._find_by_criteria(publisher_id=publisher_id)
+
+    def find_by_worker(self, worker_id: str) -> List[MissionModel]:
+        """Trouve toutes les missions acceptees par un travailleur"""
+        return self._find_by_criteria(worker_id=worker_id)
 
     def find_by_status(self, status: str) -> List[MissionModel]:
         """Trouve toutes les missions avec un statut donne"""
-        all_missions = self.find_all()
-        return [m for m in all_missions if m.status == status]
+        return self._find_by_criteria(status=status)
+
+    def find_records_for_user(self, user_id: str) -> Tuple[List[dict], List[dict]]:
+        """
+        Missions creees et missions acceptees par un utilisateur, lues dans les
+        index publisher_id et worker_id (sans hydratation, ordre du fichier)
+        Returns: (creees, acceptees)
+        """
+        with self._lock:
+            self._load()
+            created = [self._records[mission_id] for mission_id in self._find_ids({'publisher_id': user_id})]
+            accepted = [self._records[mission_id] for mission_id in self._find_ids({'worker_id': user_id})]
+        return created, accepted
+
+    def count_for_user(self, user_id: str) -> Tuple[int, int]:
+        """
+        Nombre de missions creees et acceptees par un utilisateur (taille des index)
+        Returns: (creees, acceptees)
+        """
+        with self._lock:
+            self._load()
+            return (
+                len(self._indexes['publisher_id'].get(user_id, ())),
+                len(self._indexes['worker_id'].get(user_id, ()))
+            )
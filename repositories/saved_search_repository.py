@@ -0,0 +1,177 @@
+"""
+Repository pour la persistance des recherches sauvegardees et des boites de reception
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+from models.saved_search_model import InboxItemModel, SavedSearchModel
+from config.settings import INBOX_MAX_ITEMS
+from utils.file_store import JsonFileStore
+
+
+class SavedSearchRepository:
+    """
+    Recherches sauvegardees et correspondances (boite de reception par utilisateur)
+    dans un seul fichier JSON :
+    {"version": n, "percolated_version": v, "searches": [...], "inbox": [...]}
+
+    version augmente a chaque creation ou suppression de recherche ;
+    percolated_version est la version des missions deja comparees aux recherches.
+    Comme les autres repositories JSON, le contenu est garde en memoire, relu
+    quand la signature du fichier change, et ecrit de maniere atomique sous
+    verrou inter-processus. Une correspondance (recherche, mission) n'est
+    enregistree qu'une fois ; seules les INBOX_MAX_ITEMS plus recentes sont
+    conservees par utilisateur.
+    """
+
+    def __init__(self, data_file: str, fsync_policy: Optional[str] = None, inbox_max_items: Optional[int] = None):
+        self.data_file = data_file
+        self.inbox_max_items = inbox_max_items or INBOX_MAX_ITEMS
+        self._store = JsonFileStore(data_file, fsync_policy)
+        self._lock = threading.RLock()
+        self._data = self._empty()
+        self._matched: Set[Tuple[str, str]] = set()
+        self._signature = None
+        self._ensure_file_exists()
+
+    @staticmethod
+    def _empty() -> dict:
+        """Contenu d'un fichier vide"""
+        return {"version": 0, "percolated_version": None, "searches": [], "inbox": []}
+
+    def _ensure_file_exists(self):
+        """Cree le fichier de donnees s'il n'existe pas"""
+        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        if not os.path.exists(self.data_file):
+            self._store.write(self._empty())
+
+    def _file_signature(self) -> Optional[tuple]:
+        """Signature du fichier utilisee pour detecter les modifications externes"""
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _load(self) -> dict:
+        """Retourne le contenu en memoire, relu si le fichier a change"""
+        with self._lock:
+            signature = self._file_signature()
+            if signature is not None and signature == self._signature:
+                return self._data
+
+            try:
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = {}
+            self._data = {**self._empty(), **data}
+            self._matched = {(item.get('search_id'), item.get('mission_id')) for item in self._data['inbox']}
+            self._signature = signature
+            return self._data
+
+    @contextmanager
+    def _mutation(self):
+        """Cycle lecture-modification-ecriture sous verrou du processus et inter-processus"""
+        with self._lock, self._store.lock():
+            self._load()
+            try:
+                yield self._data
+                self._store.write(self._data)
+            except BaseException:
+                # La memoire ne correspond plus au fichier : rechargement au prochain acces
+                self._signature = None
+                raise
+            self._signature = self._file_signature()
+
+    def data_version(self) -> int:
+        """Version des recherches sauvegardees (incrementee a chaque creation ou suppression)"""
+        with self._lock:
+            return self._load()['version']
+
+    def create(self, search: SavedSearchModel) -> SavedSearchModel:
+        """Enregistre une recherche"""
+        with self._mutation() as data:
+            data['searches'].append(search.to_dict())
+            data['version'] += 1
+        return search
+
+    def delete(self, search_id: str) -> bool:
+        """Supprime une recherche et ses correspondances"""
+        with self._lock:
+            # ID inconnu : rien a ecrire, le fichier n'est pas reecrit
+            if not any(s.get('id') == search_id for s in self._load()['searches']):
+                return False
+        with self._mutation() as data:
+            searches = [s for s in data['searches'] if s.get('id') != search_id]
+            if len(searches) == len(data['searches']):
+                return False
+            data['searches'] = searches
+            data['inbox'] = [item for item in data['inbox'] if item.get('search_id') != search_id]
+            self._matched = {key for key in self._matched if key[0] != search_id}
+            data['version'] += 1
+        return True
+
+    def find_by_id(self, search_id: str) -> Optional[SavedSearchModel]:
+        """Trouve une recherche par son ID"""
+        with self._lock:
+            for search in self._load()['searches']:
+                if search.get('id') == search_id:
+                    return SavedSearchModel.from_dict(search)
+        return None
+
+    def find_all(self) -> List[SavedSearchModel]:
+        """Recupere toutes les recherches"""
+        with self._lock:
+            searches = list(self._load()['searches'])
+        return [SavedSearchModel.from_dict(s) for s in searches]
+
+    def find_by_user(self, user_id: str) -> List[SavedSearchModel]:
+        """Recupere les recherches d'un utilisateur"""
+        with self._lock:
+            searches = [s for s in self._load()['searches'] if s.get('user_id') == user_id]
+        return [SavedSearchModel.from_dict(s) for s in searches]
+
+    def percolated_version(self) -> Optional[int]:
+        """Version des missions deja comparees aux recherches (None si jamais initialisee)"""
+        with self._lock:
+            return self._load()['percolated_version']
+
+    def add_matches(self, items: List[InboxItemModel], version: int) -> int:
+        """
+        Ajoute des correspondances (les doublons recherche/mission sont ignores)
+        et fixe percolated_version a version, en une seule ecriture.
+        Retourne le nombre de correspondances ajoutees.
+        """
+        with self._mutation() as data:
+            search_ids = {s.get('id') for s in data['searches']}
+            added: Dict[str, int] = {}
+            for item in items:
+                key = (item.search_id, item.mission_id)
+                # Recherche supprimee entre-temps, ou correspondance deja connue
+                if item.search_id not in search_ids or key in self._matched:
+                    continue
+                data['inbox'].append(item.to_dict())
+                self._matched.add(key)
+                added[item.user_id] = added.get(item.user_id, 0) + 1
+            for user_id in added:
+                self._trim_inbox(data, user_id)
+            data['percolated_version'] = version
+        return sum(added.values())
+
+    def _trim_inbox(self, data: dict, user_id: str):
+        """Ne garde que les inbox_max_items correspondances les plus recentes de l'utilisateur"""
+        positions = [i for i, item in enumerate(data['inbox']) if item.get('user_id') == user_id]
+        excess = len(positions) - self.inbox_max_items
+        if excess > 0:
+            dropped = set(positions[:excess])
+            data['inbox'] = [item for i, item in enumerate(data['inbox']) if i not in dropped]
+
+    def find_inbox(self, user_id: str, limit: int) -> List[InboxItemModel]:
+        """Correspondances d'un utilisateur, les plus recentes en premier"""
+        with self._lock:
+            items = [item for item in self._load()['inbox'] if item.get('user_id') == user_id]
+        return [InboxItemModel.from_dict(item) for item in reversed(items[-limit:])]
@@ -0,0 +1,112 @@
+"""
+Acces partage a la base SQLite utilisee par les repositories SQLite
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from config.settings import FSYNC_POLICY
+from repositories.text_index import tokenize
+
+
+def _py_lower(value):
+    """Minuscules comme en Python (fonction SQL py_lower)"""
+    return value.lower() if isinstance(value, str) else value
+
+
+def _py_terms(value):
+    """
+    Termes d'un texte comme dans l'index plein texte en memoire (minuscules, sans
+    accents ni mots vides), separes et entoures d'espaces (fonction SQL py_terms)
+    """
+    return f" {' '.join(tokenize(value))} " if isinstance(value, str) else ' '
+
+
+class SqliteDatabase:
+    """
+    Fournit une connexion SQLite par thread (les connexions sqlite3 ne se
+    partagent pas entre threads). La base est en mode WAL : les lectures ne
+    bloquent pas les ecritures et plusieurs processus peuvent ecrire sans
+    corrompre le fichier.
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    # Nombre de lignes lues a la fois par les parcours iteratifs
+    FETCH_SIZE = 500
+
+    # Politique fsync (voir config.settings) -> PRAGMA synchronous
+    SYNCHRONOUS = {'always': 'FULL', 'batched': 'NORMAL', 'never': 'OFF'}
+
+    # Compteur de version des donnees par table (incremente a chaque ecriture)
+    VERSIONS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, db_file: str, fsync_policy: Optional[str] = None):
+        self.db_file = db_file
+        fsync_policy = fsync_policy or FSYNC_POLICY
+        if fsync_policy not in self.SYNCHRONOUS:
+            raise ValueError(f"Politique fsync invalide : {fsync_policy}")
+        self.synchronous = self.SYNCHRONOUS[fsync_policy]
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        self._has_fts5 = None
+
+    def connection(self) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant (creee a la demande)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None : les transactions sont gerees explicitement
+            conn = sqlite3.connect(self.db_file, timeout=self.BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            # lower() de SQLite ne traite que l'ASCII : meme casse que str.lower() de Python
+            conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+            conn.create_function("py_terms", 1, _py_terms, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Transaction d'ecriture (BEGIN IMMEDIATE : le verrou d'ecriture est pris des le debut)"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def has_fts5(self) -> bool:
+        """Indique si SQLite a ete compile avec FTS5 (recherche plein texte)"""
+        if self._has_fts5 is None:
+            try:
+                self.connection().execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+                self.connection().execute("DROP TABLE temp.fts5_probe")
+                self._has_fts5 = True
+            except sqlite3.OperationalError:
+                self._has_fts5 = False
+        return self._has_fts5
+
+    def bump_version(self, conn: sqlite3.Connection, name: str) -> int:
+        """Incremente la version des donnees name dans la transaction en cours et la retourne"""
+        conn.execute(
+            "INSERT INTO data_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (name,)
+        )
+        return conn.execute("SELECT version FROM data_versions WHERE name = ?", (name,)).fetchone()[0]
+
+    def data_version(self, name: str) -> int:
+        """Version courante des donnees name (0 si elles n'ont jamais ete modifiees)"""
+        row = self.connection().execute("SELECT version FROM data_versions WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
@@ -0,0 +1,423 @@
+"""
+Repository SQLite pour la persistance des missions
+"""
+
+import json
+from typing import Callable, Iterator, List, Optional, Tuple
+from models.mission_model import MissionModel
+from dto.mission import MissionFilterDto
+from repositories.mission_repository import INDEXED_FIELDS, TEXT_FIELDS
+from repositories.sqlite_database import SqliteDatabase
+from repositories.text_index import TextIndex, tokenize
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS missions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    type_code TEXT,
+    status TEXT,
+    publisher_id TEXT,
+    worker_id TEXT,
+    country TEXT,
+    city TEXT,
+    neighborhood TEXT,
+    budget REAL NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_missions_status ON missions(status);
+CREATE INDEX IF NOT EXISTS idx_missions_type_code ON missions(type_code);
+CREATE INDEX IF NOT EXISTS idx_missions_publisher_id ON missions(publisher_id);
+CREATE INDEX IF NOT EXISTS idx_missions_worker_id ON missions(worker_id);
+CREATE INDEX IF NOT EXISTS idx_missions_country ON missions(country);
+CREATE INDEX IF NOT EXISTS idx_missions_city ON missions(city);
+CREATE INDEX IF NOT EXISTS idx_missions_neighborhood ON missions(neighborhood);
+CREATE INDEX IF NOT EXISTS idx_missions_budget ON missions(budget);
+CREATE INDEX IF NOT EXISTS idx_missions_page ON missions(ifnull(created_at, ''), id);
+CREATE INDEX IF NOT EXISTS idx_missions_publisher_page ON missions(publisher_id, ifnull(created_at, ''), id);
+"""
+
+# Index cree apres la migration des bases anterieures a la colonne revision
+REVISION_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_missions_revision ON missions(revision);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS missions_fts USING fts5(
+    title, description,
+    content='missions', content_rowid='seq',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS missions_fts_insert AFTER INSERT ON missions BEGIN
+    INSERT INTO missions_fts(rowid, title, description) VALUES (new.seq, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS missions_fts_delete AFTER DELETE ON missions BEGIN
+    INSERT INTO missions_fts(missions_fts, rowid, title, description) VALUES ('delete', old.seq, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS missions_fts_update AFTER UPDATE OF title, description ON missions BEGIN
+    INSERT INTO missions_fts(missions_fts, rowid, title, description) VALUES ('delete', old.seq, old.title, old.description);
+    INSERT INTO missions_fts(rowid, title, description) VALUES (new.seq, new.title, new.description);
+END;
+"""
+
+COLUMNS = (
+    'id', 'title', 'description', 'type_code', 'status', 'publisher_id', 'worker_id',
+    'country', 'city', 'neighborhood', 'budget', 'created_at', 'updated_at', 'data', 'revision'
+)
+
+
+class SqliteMissionRepository:
+    """
+    Repository SQLite pour les operations CRUD sur les missions.
+    Meme interface que MissionRepository : les champs filtrables sont des
+    colonnes indexees et le document complet est stocke en JSON.
+    Chaque ecriture numerote les missions modifiees avec la version des
+    donnees (colonne revision) pour la synchronisation differentielle.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+        self._fts = database.has_fts5()
+        self._listeners: List[Callable[[List[str]], None]] = []
+        conn = database.connection()
+        conn.executescript(SCHEMA)
+        conn.executescript(database.VERSIONS_SCHEMA)
+        self._migrate(conn)
+        conn.executescript(REVISION_SCHEMA)
+        if self._fts:
+            conn.executescript(FTS_SCHEMA)
+
+    @staticmethod
+    def _migrate(conn):
+        """Ajoute la colonne revision aux bases creees avant son introduction"""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(missions)")}
+        if 'revision' not in columns:
+            conn.execute("ALTER TABLE missions ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+
+    def data_version(self) -> int:
+        """Version des missions, incrementee a chaque ecriture (tous processus confondus)"""
+        return self.database.data_version('missions')
+
+    def add_listener(self, listener: Callable[[List[str]], None]):
+        """Enregistre une fonction appelee avec les IDs des missions modifiees"""
+        self._listeners.append(listener)
+
+    def _notify(self, mission_ids: List[str]):
+        """Previent les ecouteurs des missions modifiees"""
+        for listener in self._listeners:
+            listener(mission_ids)
+
+    @staticmethod
+    def _to_row(mission_data: dict, revision: int = 0) -> tuple:
+        """Convertit le dictionnaire d'une mission en ligne de la table"""
+        location = mission_data.get('location')
+        location = location if isinstance(location, dict) else {}
+        return (
+            mission_data.get('id'),
+            mission_data.get('title') or '',
+            mission_data.get('description') or '',
+            mission_data.get('type_code'),
+            mission_data.get('status'),
+            mission_data.get('publisher_id'),
+            mission_data.get('worker_id'),
+            location.get('country'),
+            location.get('city'),
+            location.get('neighborhood'),
+            float(mission_data.get('budget', 0)),
+            mission_data.get('created_at'),
+            mission_data.get('updated_at'),
+            json.dumps(mission_data, ensure_ascii=False),
+            revision
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> List[MissionModel]:
+        """Execute une requete retournant la colonne data et hydrate les missions"""
+        rows = self.database.connection().execute(sql, params).fetchall()
+        return [MissionModel.from_dict(json.loads(row['data'])) for row in rows]
+
+    def _iter_records(self, sql: str, params: tuple = ()) -> Iterator[dict]:
+        """Lit la colonne data par blocs et la decode, sans hydratation"""
+        cursor = self.database.connection().execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(self.database.FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield json.loads(row['data'])
+        finally:
+            cursor.close()
+
+    def import_records(self, missions: List[dict]) -> int:
+        """Importe des missions brutes (IDs conserves, doublons ignores). Retourne le nombre importe."""
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        with self.database.transaction() as conn:
+            before = conn.execute("SELECT COUNT(*) FROM missions").fetchone()[0]
+            revision = self.database.bump_version(conn, 'missions')
+            conn.executemany(
+                f"INSERT OR IGNORE INTO missions ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [self._to_row(m, revision) for m in missions if m.get('id')]
+            )
+            return conn.execute("SELECT COUNT(*) FROM missions").fetchone()[0] - before
+
+    def create(self, mission: MissionModel) -> MissionModel:
+        """Cree une nouvelle mission"""
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        with self.database.transaction() as conn:
+            revision = self.database.bump_version(conn, 'missions')
+            conn.execute(
+                f"INSERT INTO missions ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                self._to_row(mission.to_dict(), revision)
+            )
+        self._notify([mission.id])
+        return mission
+
+    def create_many(self, missions: List[MissionModel]) -> List[MissionModel]:
+        """Cree plusieurs missions dans une seule transaction"""
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        with self.database.transaction() as conn:
+            revision = self.database.bump_version(conn, 'missions')
+            conn.executemany(
+                f"INSERT INTO missions ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [self._to_row(mission.to_dict(), revision) for mission in missions]
+            )
+        self._notify([mission.id for mission in missions])
+        return missions
+
+    def find_all(self) -> List[MissionModel]:
+        """Recupere toutes les missions"""
+        return self._query("SELECT data FROM missions ORDER BY seq")
+
+    def iter_all(self) -> Iterator[MissionModel]:
+        """Parcourt toutes les missions, hydratees une par une au fil de l'iteration"""
+        return (MissionModel.from_dict(mission_data) for mission_data in self.iter_records())
+
+    def iter_records(self) -> Iterator[dict]:
+        """Parcourt les missions stockees, sans hydratation"""
+        return self._iter_records("SELECT data FROM missions ORDER BY seq")
+
+    def find_by_id(self, mission_id: str) -> Optional[MissionModel]:
+        """Trouve une mission par son ID"""
+        missions = self._query("SELECT data FROM missions WHERE id = ?", (mission_id,))
+        return missions[0] if missions else None
+
+    def _current_state(self, conn, mission_id: str):
+        """Statut et version stockes d'une mission (dans la transaction en cours). ValueError si absente."""
+        current = conn.execute(
+            "SELECT status, ifnull(json_extract(data, '$.version'), 1) AS version FROM missions WHERE id = ?",
+            (mission_id,)
+        ).fetchone()
+        if current is None:
+            raise ValueError(f"Mission avec l'ID {mission_id} non trouvee")
+        return current
+
+    def update(self, mission: MissionModel) -> MissionModel:
+        """Met a jour une mission existante (sa version est incrementee)"""
+        assignments = ', '.join(f"{column} = ?" for column in COLUMNS[1:])
+        with self.database.transaction() as conn:
+            mission.version = self._current_state(conn, mission.id)['version'] + 1
+            row = self._to_row(mission.to_dict(), self.database.bump_version(conn, 'missions'))
+            conn.execute(f"UPDATE missions SET {assignments} WHERE id = ?", row[1:] + (row[0],))
+        self._notify([mission.id])
+        return mission
+
+    def update_if(self, mission: MissionModel, expected_status: str,
+                  expected_version: Optional[int] = None) -> Optional[MissionModel]:
+        """
+        Met a jour une mission seulement si son statut stocke vaut encore
+        expected_status et, si elle est fournie, sa version expected_version
+        (compare-and-set, sous le verrou d'ecriture de la transaction).
+        Retourne la mission (version incrementee), ou None si elle a change entre-temps.
+        """
+        assignments = ', '.join(f"{column} = ?" for column in COLUMNS[1:])
+        with self.database.transaction() as conn:
+            current = self._current_state(conn, mission.id)
+            if current['status'] != expected_status:
+                return None
+            if expected_version is not None and current['version'] != expected_version:
+                return None
+            mission.version = current['version'] + 1
+            row = self._to_row(mission.to_dict(), self.database.bump_version(conn, 'missions'))
+            conn.execute(f"UPDATE missions SET {assignments} WHERE id = ?", row[1:] + (row[0],))
+        self._notify([mission.id])
+        return mission
+
+    def find_changed_records(self, since: int) -> Tuple[List[dict], int]:
+        """
+        Missions creees ou modifiees apres la version since, dans l'ordre des
+        ecritures, et version courante (lue avant : une ecriture concurrente
+        est au pire renvoyee une seconde fois au prochain appel).
+        """
+        version = self.data_version()
+        records = list(self._iter_records("SELECT data FROM missions WHERE revision > ? ORDER BY revision, seq", (since,)))
+        return records, version
+
+    def find_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> Tuple[List[MissionModel], Optional[Tuple[str, str]]]:
+        """
+        Recupere une page de missions triees par (created_at, id), apres la cle after.
+        Retourne les missions et la cle de la derniere (None s'il n'y a pas de page suivante).
+        """
+        page, next_key = self.find_page_records(limit, after)
+        return [MissionModel.from_dict(m) for m in page], next_key
+
+    def find_page_records(self, limit: int, after: Optional[Tuple[str, str]] = None) -> Tuple[List[dict], Optional[Tuple[str, str]]]:
+        """Comme find_page, sans hydratation"""
+        where, params = "", [limit + 1]
+        if after:
+            where = "WHERE (ifnull(created_at, ''), id) > (?, ?)"
+            params = [after[0], after[1], limit + 1]
+        rows = self.database.connection().execute(
+            f"SELECT ifnull(created_at, '') AS page_created_at, id, data FROM missions {where} "
+            "ORDER BY ifnull(created_at, ''), id LIMIT ?",
+            tuple(params)
+        ).fetchall()
+        next_key = (rows[limit - 1]['page_created_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+        return [json.loads(row['data']) for row in rows[:limit]], next_key
+
+    def find_publisher_page_records(
+        self,
+        publisher_id: str,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None
+    ) -> Tuple[List[dict], Optional[Tuple[str, str]]]:
+        """Comme find_page_records, limite aux missions d'un publisher (index idx_missions_publisher_page)"""
+        where, params = "WHERE publisher_id = ?", [publisher_id, limit + 1]
+        if after:
+            where += " AND (ifnull(created_at, ''), id) > (?, ?)"
+            params = [publisher_id, after[0], after[1], limit + 1]
+        rows = self.database.connection().execute(
+            f"SELECT ifnull(created_at, '') AS page_created_at, id, data FROM missions {where} "
+            "ORDER BY ifnull(created_at, ''), id LIMIT ?",
+            tuple(params)
+        ).fetchall()
+        next_key = (rows[limit - 1]['page_created_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+        return [json.loads(row['data']) for row in rows[:limit]], next_key
+
+    @staticmethod
+    def _match_expression(text: str, column: Optional[str] = None) -> Optional[str]:
+        """Construit une expression MATCH FTS5 (tous les termes, en prefixe)"""
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        expression = ' AND '.join(
+            f'"{token}"*' if len(token) >= TextIndex.MIN_PREFIX_LENGTH else f'"{token}"'
+            for token in dict.fromkeys(tokens)
+        )
+        return f"{{{column}}} : ({expression})" if column else expression
+
+    def _filter_sql(self, filters: MissionFilterDto) -> Tuple[str, list, Optional[str]]:
+        """Construit la clause WHERE, ses parametres et le MATCH des mots-cles"""
+        clauses, params = [], []
+        for field in INDEXED_FIELDS:
+            value = getattr(filters, field, None)
+            if value:
+                clauses.append(f"m.{field} = ?")
+                params.append(value)
+
+        if filters.budget_min is not None:
+            clauses.append("m.budget >= ?")
+            params.append(filters.budget_min)
+        if filters.budget_max is not None:
+            clauses.append("m.budget <= ?")
+            params.append(filters.budget_max)
+
+        if filters.title:
+            # Sous-chaine sans tenir compte de la casse, comme MissionRepository
+            clauses.append("instr(py_lower(m.title), ?) > 0")
+            params.append(filters.title.lower())
+
+        keywords_match = None
+        if filters.keywords:
+            if self._fts:
+                keywords_match = self._match_expression(filters.keywords)
+            else:
+                # Sans FTS5 : chaque terme doit commencer un terme du titre ou de la
+                # description (termes courts : terme entier), comme avec TextIndex ; sans classement
+                for token in dict.fromkeys(tokenize(filters.keywords)):
+                    term = f" {token}" if len(token) >= TextIndex.MIN_PREFIX_LENGTH else f" {token} "
+                    clauses.append("(instr(py_terms(m.title), ?) > 0 OR instr(py_terms(m.description), ?) > 0)")
+                    params.extend([term, term])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params, keywords_match
+
+    def find_by_filters(self, filters: MissionFilterDto) -> List[MissionModel]:
+        """
+        Trouve des missions selon des filtres.
+        Avec des mots-cles (et sans tri explicite), les missions sont classees par pertinence.
+        """
+        return list(self.iter_by_filters(filters))
+
+    def iter_by_filters(self, filters: MissionFilterDto) -> Iterator[MissionModel]:
+        """Comme find_by_filters, en lisant les missions par blocs au fil de l'iteration"""
+        return (MissionModel.from_dict(mission_data) for mission_data in self.iter_records_by_filters(filters))
+
+    def iter_records_by_filters(self, filters: MissionFilterDto) -> Iterator[dict]:
+        """Comme iter_by_filters, sans hydratation"""
+        where, params, keywords_match = self._filter_sql(filters)
+        weights = ', '.join(str(weight) for weight in TEXT_FIELDS.values())
+
+        if filters.sort:
+            order = "m.budget DESC, m.seq DESC" if filters.sort.startswith('-') else "m.budget, m.seq"
+        elif keywords_match:
+            order = f"bm25(missions_fts, {weights}), m.seq"
+        else:
+            order = "m.seq"
+
+        if keywords_match:
+            where = f"{where} AND missions_fts MATCH ?" if where else "WHERE missions_fts MATCH ?"
+            params.append(keywords_match)
+            return self._iter_records(
+                f"SELECT m.data FROM missions m JOIN missions_fts ON missions_fts.rowid = m.seq {where} ORDER BY {order}",
+                tuple(params)
+            )
+        return self._iter_records(f"SELECT m.data FROM missions m {where} ORDER BY {order}", tuple(params))
+
+    def find_by_publisher(self, publisher_id: str) -> List[MissionModel]:
+        """Trouve toutes les missions d'un publisher"""
+        return self._query("SELECT data FROM missions WHERE publisher_id = ? ORDER BY seq", (publisher_id,))
+
+    def find_by_worker(self, worker_id: str) -> List[MissionModel]:
+        """Trouve toutes les missions acceptees par un travailleur"""
+        return self._query("SELECT data FROM missions WHERE worker_id = ? ORDER BY seq", (worker_id,))
+
+    def find_by_status(self, status: str) -> List[MissionModel]:
+        """Trouve toutes les missions avec un statut donne"""
+        return self._query("SELECT data FROM missions WHERE status = ? ORDER BY seq", (status,))
+
+    def find_records_for_user(self, user_id: str) -> Tuple[List[dict], List[dict]]:
+        """
+        Missions creees et missions acceptees par un utilisateur, en une requete
+        servie par les index publisher_id et worker_id
+        Returns: (creees, acceptees)
+        """
+        rows = self.database.connection().execute(
+            "SELECT data, publisher_id, worker_id FROM missions "
+            "WHERE publisher_id = ? OR worker_id = ? ORDER BY seq",
+            (user_id, user_id)
+        ).fetchall()
+        created, accepted = [], []
+        for row in rows:
+            mission_data = json.loads(row['data'])
+            if row['publisher_id'] == user_id:
+                created.append(mission_data)
+            if row['worker_id'] == user_id:
+                accepted.append(mission_data)
+        return created, accepted
+
+    def count_for_user(self, user_id: str) -> Tuple[int, int]:
+        """
+        Nombre de missions creees et acceptees par un utilisateur
+        Returns: (creees, acceptees)
+        """
+        row = self.database.connection().execute(
+            "SELECT (SELECT COUNT(*) FROM missions WHERE publisher_id = ?), "
+            "(SELECT COUNT(*) FROM missions WHERE worker_id = ?)",
+            (user_id, user_id)
+        ).fetchone()
+        return row[0], row[1]
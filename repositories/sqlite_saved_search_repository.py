@@ -0,0 +1,135 @@
+"""
+Repository SQLite pour les recherches sauvegardees et les boites de reception
+"""
+
+import json
+from typing import List, Optional
+from models.saved_search_model import InboxItemModel, SavedSearchModel
+from repositories.sqlite_database import SqliteDatabase
+from config.settings import INBOX_MAX_ITEMS
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_searches (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_saved_searches_user_id ON saved_searches(user_id);
+CREATE TABLE IF NOT EXISTS inbox_items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    search_id TEXT NOT NULL,
+    mission_id TEXT NOT NULL,
+    matched_at TEXT,
+    UNIQUE (search_id, mission_id)
+);
+CREATE INDEX IF NOT EXISTS idx_inbox_items_user_id ON inbox_items(user_id, seq);
+"""
+
+
+class SqliteSavedSearchRepository:
+    """
+    Repository SQLite des recherches sauvegardees et des correspondances.
+    Meme interface que SavedSearchRepository ; les versions (recherches et
+    missions deja comparees) sont gardees dans la table data_versions.
+    """
+
+    def __init__(self, database: SqliteDatabase, inbox_max_items: Optional[int] = None):
+        self.database = database
+        self.inbox_max_items = inbox_max_items or INBOX_MAX_ITEMS
+        conn = database.connection()
+        conn.executescript(SCHEMA)
+        conn.executescript(database.VERSIONS_SCHEMA)
+
+    def data_version(self) -> int:
+        """Version des recherches sauvegardees (incrementee a chaque creation ou suppression)"""
+        return self.database.data_version('saved_searches')
+
+    def create(self, search: SavedSearchModel) -> SavedSearchModel:
+        """Enregistre une recherche"""
+        with self.database.transaction() as conn:
+            conn.execute(
+                "INSERT INTO saved_searches (id, user_id, data) VALUES (?, ?, ?)",
+                (search.id, search.user_id, json.dumps(search.to_dict(), ensure_ascii=False))
+            )
+            self.database.bump_version(conn, 'saved_searches')
+        return search
+
+    def delete(self, search_id: str) -> bool:
+        """Supprime une recherche et ses correspondances"""
+        with self.database.transaction() as conn:
+            cursor = conn.execute("DELETE FROM saved_searches WHERE id = ?", (search_id,))
+            if not cursor.rowcount:
+                return False
+            conn.execute("DELETE FROM inbox_items WHERE search_id = ?", (search_id,))
+            self.database.bump_version(conn, 'saved_searches')
+        return True
+
+    def _query(self, sql: str, params: tuple = ()) -> List[SavedSearchModel]:
+        """Execute une requete retournant la colonne data"""
+        rows = self.database.connection().execute(sql, params).fetchall()
+        return [SavedSearchModel.from_dict(json.loads(row['data'])) for row in rows]
+
+    def find_by_id(self, search_id: str) -> Optional[SavedSearchModel]:
+        """Trouve une recherche par son ID"""
+        searches = self._query("SELECT data FROM saved_searches WHERE id = ?", (search_id,))
+        return searches[0] if searches else None
+
+    def find_all(self) -> List[SavedSearchModel]:
+        """Recupere toutes les recherches"""
+        return self._query("SELECT data FROM saved_searches ORDER BY seq")
+
+    def find_by_user(self, user_id: str) -> List[SavedSearchModel]:
+        """Recupere les recherches d'un utilisateur"""
+        return self._query("SELECT data FROM saved_searches WHERE user_id = ? ORDER BY seq", (user_id,))
+
+    def percolated_version(self) -> Optional[int]:
+        """Version des missions deja comparees aux recherches (None si jamais initialisee)"""
+        row = self.database.connection().execute(
+            "SELECT version FROM data_versions WHERE name = 'percolated_missions'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def add_matches(self, items: List[InboxItemModel], version: int) -> int:
+        """
+        Ajoute des correspondances (les doublons recherche/mission sont ignores)
+        et fixe percolated_version a version, dans une seule transaction.
+        Retourne le nombre de correspondances ajoutees.
+        """
+        added = 0
+        with self.database.transaction() as conn:
+            users = set()
+            for item in items:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO inbox_items (id, user_id, search_id, mission_id, matched_at) "
+                    "SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM saved_searches WHERE id = ?)",
+                    (item.id, item.user_id, item.search_id, item.mission_id, item.matched_at, item.search_id)
+                )
+                if cursor.rowcount:
+                    added += 1
+                    users.add(item.user_id)
+            for user_id in users:
+                # Ne garde que les correspondances les plus recentes de l'utilisateur
+                conn.execute(
+                    "DELETE FROM inbox_items WHERE user_id = ? AND seq NOT IN "
+                    "(SELECT seq FROM inbox_items WHERE user_id = ? ORDER BY seq DESC LIMIT ?)",
+                    (user_id, user_id, self.inbox_max_items)
+                )
+            conn.execute(
+                "INSERT INTO data_versions (name, version) VALUES ('percolated_missions', ?) "
+                "ON CONFLICT(name) DO UPDATE SET version = excluded.version",
+                (version,)
+            )
+        return added
+
+    def find_inbox(self, user_id: str, limit: int) -> List[InboxItemModel]:
+        """Correspondances d'un utilisateur, les plus recentes en premier"""
+        rows = self.database.connection().execute(
+            "SELECT id, user_id, search_id, mission_id, matched_at FROM inbox_items "
+            "WHERE user_id = ? ORDER BY seq DESC LIMIT ?",
+            (user_id, limit)
+        ).fetchall()
+        return [InboxItemModel.from_dict(dict(row)) for row in rows]
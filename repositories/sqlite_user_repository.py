@@ -0,0 +1,224 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from models.user_model import UserModel
+from repositories.sqlite_database import SqliteDatabase
+from repositories.user_repository import normalize_phone
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Clé de la colonne email indexée (casse et espaces ignorés)"""
+    return email.strip().lower() if email else None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL UNIQUE,
+    email TEXT,
+    phone_number TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_users_phone_number ON users(phone_number);
+CREATE INDEX IF NOT EXISTS idx_users_page ON users(ifnull(json_extract(data, '$.created_at'), ''), user_id);
+"""
+
+
+class SqliteUserRepository:
+    """
+    Repository SQLite pour gérer la persistance des utilisateurs.
+    Même interface que UserRepository : l'email normalisé et le téléphone
+    sont des colonnes indexées, l'utilisateur complet est stocké en JSON.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+        database.connection().executescript(SCHEMA)
+        database.connection().executescript(database.VERSIONS_SCHEMA)
+
+    def data_version(self) -> int:
+        """Version des utilisateurs, incrémentée à chaque écriture (tous processus confondus)"""
+        return self.database.data_version('users')
+
+    @staticmethod
+    def _to_row(user_data: dict) -> tuple:
+        """Convertit le dictionnaire d'un utilisateur en ligne de la table"""
+        return (
+            user_data.get('user_id'),
+            normalize_email(user_data.get('email')),
+            normalize_phone(user_data.get('phone_number')),
+            json.dumps(user_data, ensure_ascii=False)
+        )
+
+    def _query_one(self, sql: str, params: tuple) -> Optional[UserModel]:
+        """Retourne le premier utilisateur correspondant à la requête"""
+        row = self.database.connection().execute(sql, params).fetchone()
+        return UserModel.from_dict(json.loads(row['data'])) if row else None
+
+    def import_records(self, users: List[dict]) -> int:
+        """Importe des utilisateurs bruts (IDs conservés, doublons ignorés). Retourne le nombre importé."""
+        with self.database.transaction() as conn:
+            before = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (user_id, email, phone_number, data) VALUES (?, ?, ?, ?)",
+                [self._to_row(user) for user in users if user.get('user_id')]
+            )
+            imported = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] - before
+            if imported:
+                self.database.bump_version(conn, 'users')
+            return imported
+
+    def create(self, user: UserModel) -> UserModel:
+        """Crée un nouvel utilisateur"""
+        # Génère un ID unique
+        user.user_id = str(uuid.uuid4())
+
+        with self.database.transaction() as conn:
+            conn.execute(
+                "INSERT INTO users (user_id, email, phone_number, data) VALUES (?, ?, ?, ?)",
+                self._to_row(user.to_dict(exclude_password=False))
+            )
+            self.database.bump_version(conn, 'users')
+        return user
+
+    def find_all(self) -> List[UserModel]:
+        """Récupère tous les utilisateurs"""
+        rows = self.database.connection().execute("SELECT data FROM users ORDER BY seq").fetchall()
+        return [UserModel.from_dict(json.loads(row['data'])) for row in rows]
+
+    def iter_all(self) -> Iterator[UserModel]:
+        """Parcourt tous les utilisateurs, lus par blocs au fil de l'itération"""
+        cursor = self.database.connection().execute("SELECT data FROM users ORDER BY seq")
+        try:
+            while True:
+                rows = cursor.fetchmany(self.database.FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield UserModel.from_dict(json.loads(row['data']))
+        finally:
+            cursor.close()
+
+    def find_by_id(self, user_id: str) -> Optional[UserModel]:
+        """Trouve un utilisateur par son ID"""
+        return self._query_one("SELECT data FROM users WHERE user_id = ?", (user_id,))
+
+    def find_by_ids(self, user_ids: List[str]) -> Dict[str, UserModel]:
+        """Trouve plusieurs utilisateurs par leur ID en une seule requête (IDs inconnus absents du résultat)"""
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return {}
+        placeholders = ', '.join('?' for _ in user_ids)
+        rows = self.database.connection().execute(
+            f"SELECT data FROM users WHERE user_id IN ({placeholders})", user_ids
+        ).fetchall()
+        users = [UserModel.from_dict(json.loads(row['data'])) for row in rows]
+        return {user.user_id: user for user in users}
+
+    def find_page(self, limit: int, after: Optional[Tuple[str, str]] = None,
+                  exclude_deleted: bool = False) -> Tuple[List[UserModel], Optional[Tuple[str, str]]]:
+        """
+        Récupère une page d'utilisateurs triés par (created_at, ID), après la clé after.
+        Retourne les utilisateurs et la clé du dernier (None s'il n'y a pas de page suivante).
+        """
+        created_at = "ifnull(json_extract(data, '$.created_at'), '')"
+        clauses, params = [], []
+        if after:
+            clauses.append(f"({created_at}, user_id) > (?, ?)")
+            params.extend(after)
+        if exclude_deleted:
+            clauses.append("NOT ifnull(json_extract(data, '$.is_deleted'), 0)")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.database.connection().execute(
+            f"SELECT {created_at} AS page_created_at, user_id, data FROM users {where} "
+            f"ORDER BY {created_at}, user_id LIMIT ?",
+            tuple(params) + (limit + 1,)
+        ).fetchall()
+        next_key = (rows[limit - 1]['page_created_at'], rows[limit - 1]['user_id']) if len(rows) > limit else None
+        return [UserModel.from_dict(json.loads(row['data'])) for row in rows[:limit]], next_key
+
+    def find_by_email(self, email: str) -> Optional[UserModel]:
+        """Trouve un utilisateur par son email (correspondance exacte, la colonne indexée est normalisée)"""
+        return self._query_one(
+            "SELECT data FROM users WHERE email = ? AND json_extract(data, '$.email') = ? ORDER BY seq LIMIT 1",
+            (normalize_email(email), email)
+        )
+
+    def find_by_phone(self, phone_number: str) -> Optional[UserModel]:
+        """Trouve un utilisateur par son numéro de téléphone"""
+        return self._query_one(
+            "SELECT data FROM users WHERE phone_number = ? ORDER BY seq LIMIT 1",
+            (normalize_phone(phone_number),)
+        )
+
+    def update(self, user_id: str, user: UserModel, expected_version: Optional[int] = None) -> Optional[UserModel]:
+        """
+        Met à jour un utilisateur et incrémente sa version.
+        Si expected_version est fourni, la mise à jour n'a lieu que si la version
+        stockée est toujours celle-ci (sinon None, comme pour un ID inconnu).
+        """
+        # Conserve l'ID original
+        user.user_id = user_id
+        # Met à jour la date de modification
+        user.updated_at = datetime.utcnow().isoformat()
+
+        with self.database.transaction() as conn:
+            row = conn.execute(
+                "SELECT ifnull(json_extract(data, '$.version'), 1) AS version FROM users WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+            if row is None or (expected_version is not None and row['version'] != expected_version):
+                return None
+
+            user.version = row['version'] + 1
+            conn.execute(
+                "UPDATE users SET email = ?, phone_number = ?, data = ? WHERE user_id = ?",
+                self._to_row(user.to_dict(exclude_password=False))[1:] + (user_id,)
+            )
+            self.database.bump_version(conn, 'users')
+        return user
+
+    def delete(self, user_id: str) -> bool:
+        """Supprime un utilisateur (soft delete)"""
+        return self._update_fields(user_id, is_deleted=True)
+
+    def update_photo_url(self, user_id: str, photo_url: str) -> bool:
+        """Met à jour l'URL de la photo de profil"""
+        return self._update_fields(user_id, photo_url=photo_url)
+
+    def update_fields_many(self, updates: Dict[str, dict]) -> int:
+        """
+        Met à jour des champs de plusieurs utilisateurs en une seule transaction
+        (sans modifier updated_at ni la version). Les IDs inconnus sont ignorés.
+        Retourne le nombre d'utilisateurs mis à jour.
+        """
+        updated = 0
+        with self.database.transaction() as conn:
+            for user_id, fields in updates.items():
+                row = conn.execute("SELECT data FROM users WHERE user_id = ?", (user_id,)).fetchone()
+                if row is None:
+                    continue
+                user_data = {**json.loads(row['data']), **fields}
+                conn.execute(
+                    "UPDATE users SET email = ?, phone_number = ?, data = ? WHERE user_id = ?",
+                    self._to_row(user_data)[1:] + (user_id,)
+                )
+                updated += 1
+            if updated:
+                self.database.bump_version(conn, 'users')
+        return updated
+
+    def _update_fields(self, user_id: str, **fields) -> bool:
+        """Met à jour quelques champs d'un utilisateur et sa date de modification"""
+        with self.database.transaction() as conn:
+            row = conn.execute("SELECT data FROM users WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                return False
+
+            user_data = {**json.loads(row['data']), **fields, 'updated_at': datetime.utcnow().isoformat()}
+            user_data['version'] = user_data.get('version', 1) + 1
+            conn.execute("UPDATE users SET data = ? WHERE user_id = ?", (json.dumps(user_data, ensure_ascii=False), user_id))
+            self.database.bump_version(conn, 'users')
+            return True
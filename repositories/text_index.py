@@ -0,0 +1,152 @@
+"""
+Index plein texte en memoire (index inverse + classement BM25)
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+# Mots vides francais ignores a l'indexation et dans les requetes
+STOPWORDS = frozenset({
+    "a", "au", "aux", "avec", "ce", "ces", "d", "dans", "de", "des", "du",
+    "en", "et", "l", "la", "le", "les", "ou", "par", "pour", "sur", "un", "une"
+})
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+
+
+def normalize_text(text: str) -> str:
+    """Met le texte en minuscules et retire les accents ("Réparation" -> "reparation")"""
+    text = text or ''
+    if text.isascii():
+        return text.lower()
+    return _COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Decoupe un texte en termes normalises, sans les mots vides"""
+    return [token for token in _TOKEN_PATTERN.findall(normalize_text(text)) if token not in STOPWORDS]
+
+
+class TextIndex:
+    """
+    Index inverse sur plusieurs champs texte d'un document.
+
+    Chaque terme de requete est compare en prefixe aux termes indexes
+    ("repar" trouve "reparation"). Un document correspond s'il contient tous
+    les termes de la requete ; les resultats sont classes par BM25, avec un
+    poids par champ.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MIN_PREFIX_LENGTH = 2
+
+    def __init__(self, fields: Dict[str, float]):
+        self.fields = dict(fields)
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {field: {} for field in self.fields}
+        self._vocabulary: Dict[str, List[str]] = {field: [] for field in self.fields}
+        self._doc_terms: Dict[str, Dict[str, Counter]] = {}
+        self._lengths: Dict[str, Dict[str, int]] = {field: {} for field in self.fields}
+        self._total_length: Dict[str, int] = {field: 0 for field in self.fields}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: str, texts: Dict[str, str]):
+        """Indexe (ou reindexe) un document"""
+        terms = {field: Counter(tokenize(texts.get(field, ''))) for field in self.fields}
+        previous = self._doc_terms.get(doc_id)
+        if previous == terms:
+            return
+        if previous is not None:
+            self.remove(doc_id)
+
+        self._doc_terms[doc_id] = terms
+        for field, counts in terms.items():
+            postings = self._postings[field]
+            for term, frequency in counts.items():
+                if term not in postings:
+                    postings[term] = {}
+                    insort(self._vocabulary[field], term)
+                postings[term][doc_id] = frequency
+            length = sum(counts.values())
+            self._lengths[field][doc_id] = length
+            self._total_length[field] += length
+
+    def remove(self, doc_id: str):
+        """Retire un document de l'index"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for field, counts in terms.items():
+            postings = self._postings[field]
+            for term in counts:
+                docs = postings[term]
+                docs.pop(doc_id, None)
+                if not docs:
+                    del postings[term]
+                    vocabulary = self._vocabulary[field]
+                    del vocabulary[bisect_left(vocabulary, term)]
+            self._total_length[field] -= self._lengths[field].pop(doc_id)
+
+    def _expand(self, field: str, token: str) -> Iterable[str]:
+        """Termes indexes commencant par le terme de requete"""
+        if len(token) < self.MIN_PREFIX_LENGTH:
+            return [token] if token in self._postings[field] else []
+
+        vocabulary = self._vocabulary[field]
+        expanded = []
+        for i in range(bisect_left(vocabulary, token), len(vocabulary)):
+            if not vocabulary[i].startswith(token):
+                break
+            expanded.append(vocabulary[i])
+        return expanded
+
+    def search(self, query: str, fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, float]]:
+        """
+        Recherche les documents contenant tous les termes de la requete.
+        Retourne {doc_id: score BM25}, ou None si la requete ne contient aucun terme.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return None
+
+        fields = list(fields or self.fields)
+        expanded = [
+            [(field, term) for field in fields for term in self._expand(field, token)]
+            for token in tokens
+        ]
+
+        # Intersection des listes de documents, les plus petites en premier
+        matches: Optional[Set[str]] = None
+        for token_terms in sorted(expanded, key=lambda terms: sum(len(self._postings[f][t]) for f, t in terms)):
+            token_docs: Set[str] = set()
+            for field, term in token_terms:
+                token_docs.update(self._postings[field][term])
+            matches = token_docs if matches is None else matches & token_docs
+            if not matches:
+                return {}
+
+        # Score BM25 des seuls documents retenus
+        total_docs = len(self._doc_terms)
+        scores = dict.fromkeys(matches, 0.0)
+        for field, term in {pair for terms in expanded for pair in terms}:
+            docs = self._postings[field][term]
+            lengths = self._lengths[field]
+            weight = self.fields[field]
+            average_length = self._total_length[field] / total_docs
+            idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            if len(matches) < len(docs):
+                hits = ((doc_id, docs[doc_id]) for doc_id in matches if doc_id in docs)
+            else:
+                hits = ((doc_id, frequency) for doc_id, frequency in docs.items() if doc_id in matches)
+            for doc_id, frequency in hits:
+                norm = 1 - self.B + self.B * lengths[doc_id] / average_length
+                scores[doc_id] += weight * idf * frequency * (self.K1 + 1) / (frequency + self.K1 * norm)
+        return scores
@@ -1,15 +1,44 @@
 import json
 import os
-from typing import List, Optional
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 from models.user_model import UserModel
 from config.settings import DATA_FILE
+from utils.file_store import JsonFileStore
+from utils.group_commit import GroupCommitter, Operation, Outcome, apply_operations
+from utils.pagination import page_key
+
+
+def normalize_phone(phone_number: Optional[str]) -> Optional[str]:
+    """Normalise un numéro de téléphone pour l'index"""
+    return phone_number.strip() if phone_number else None
 
 
 class UserRepository:
-    """Repository pour gérer la persistance des utilisateurs"""
+    """Repository pour gérer la persistance des utilisateurs
 
-    def __init__(self):
-        self.data_file = DATA_FILE
+    Les utilisateurs sont gardés en mémoire avec des index par ID, email
+    (exact, comme la recherche d'origine), numéro de téléphone et (created_at, ID) pour la pagination. Le fichier n'est relu que lorsque sa
+    signature (mtime, taille, inode) change. Les écritures sont atomiques
+    et protégées par un verrou inter-processus ; les mutations concurrentes
+    sont regroupées en une seule écriture. Chaque écriture estampille les
+    utilisateurs modifiés d'une révision croissante ; la plus grande est la
+    version des données (data_version).
+    """
+
+    def __init__(self, data_file: Optional[str] = None, fsync_policy: Optional[str] = None):
+        self.data_file = data_file or DATA_FILE
+        self._store = JsonFileStore(self.data_file, fsync_policy)
+        self._lock = threading.RLock()
+        self._records: Dict[str, dict] = {}
+        self._by_email: Dict[str, str] = {}
+        self._by_phone: Dict[str, str] = {}
+        self._created_index: List[tuple] = []
+        self._revision = 0
+        self._signature = None
+        self._committer = GroupCommitter(self._commit)
         self._ensure_data_file()
 
     def _ensure_data_file(self):
@@ -28,95 +57,259 @@ class UserRepository:
             return []
 
     def _write_data(self, data: List[dict]):
-        """Écrit les données dans le fichier JSON"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Écrit les données dans le fichier JSON (fichier temporaire puis renommage)"""
+        self._store.write(data)
+
+    def _file_signature(self) -> Optional[tuple]:
+        """Signature du fichier utilisée pour détecter les modifications externes"""
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _index(self, user_data: dict, bulk: bool = False):
+        """
+        Ajoute un utilisateur aux index (le premier enregistrement l'emporte).
+        En mode bulk (rechargement complet), l'index de pagination n'est pas
+        trié ici : _load le trie une seule fois à la fin.
+        """
+        user_id = user_data.get('user_id')
+        email = user_data.get('email')
+        if email:
+            self._by_email.setdefault(email, user_id)
+        phone = normalize_phone(user_data.get('phone_number'))
+        if phone:
+            self._by_phone.setdefault(phone, user_id)
+        if bulk:
+            self._created_index.append(page_key(user_data, 'user_id'))
+        else:
+            insort(self._created_index, page_key(user_data, 'user_id'))
+
+    def _unindex(self, user_data: dict):
+        """Retire un utilisateur des index"""
+        user_id = user_data.get('user_id')
+        email = user_data.get('email')
+        if email and self._by_email.get(email) == user_id:
+            del self._by_email[email]
+        phone = normalize_phone(user_data.get('phone_number'))
+        if phone and self._by_phone.get(phone) == user_id:
+            del self._by_phone[phone]
+        del self._created_index[bisect_left(self._created_index, page_key(user_data, 'user_id'))]
+
+    def _load(self) -> Dict[str, dict]:
+        """Retourne les utilisateurs en mémoire, rechargés si le fichier a changé"""
+        with self._lock:
+            signature = self._file_signature()
+            if signature is not None and signature == self._signature:
+                return self._records
+
+            self._records = {}
+            self._by_email = {}
+            self._by_phone = {}
+            self._created_index = []
+            self._revision = 0
+            for user_data in self._read_data():
+                # En cas de doublon, la première occurrence l'emporte
+                if user_data.get('user_id') not in self._records:
+                    self._records[user_data.get('user_id')] = user_data
+                    self._index(user_data, bulk=True)
+                    revision = user_data.get('revision')
+                    if isinstance(revision, int) and revision > self._revision:
+                        self._revision = revision
+            self._created_index.sort()
+            self._signature = signature
+            return self._records
+
+    def _save(self):
+        """Persiste les utilisateurs en mémoire et mémorise la nouvelle signature"""
+        self._write_data(list(self._records.values()))
+        self._signature = self._file_signature()
+
+    @contextmanager
+    def _mutation(self):
+        """
+        Cycle lecture-modification-écriture : verrou du processus et verrou
+        inter-processus, puis rechargement si un autre processus a écrit.
+        """
+        with self._lock, self._store.lock():
+            self._load()
+            yield
+
+    def _commit(self, operations: List[Operation]) -> List[Outcome]:
+        """Applique un lot d'opérations et le persiste en une seule écriture"""
+        with self._mutation():
+            outcomes, changed = apply_operations(operations)
+            if changed:
+                self._revision += 1
+                for user_data in changed:
+                    user_data['revision'] = self._revision
+                try:
+                    self._save()
+                except BaseException:
+                    # La mémoire ne correspond plus au fichier : rechargement au prochain accès
+                    self._signature = None
+                    raise
+        return outcomes
+
+    def data_version(self) -> int:
+        """Version des utilisateurs : révision de la dernière écriture (tous processus confondus)"""
+        with self._lock:
+            self._load()
+            return self._revision
+
+    def _put(self, user_data: dict):
+        """Remplace un enregistrement en maintenant les index"""
+        previous = self._records.get(user_data.get('user_id'))
+        if previous is not None:
+            self._unindex(previous)
+        self._records[user_data.get('user_id')] = user_data
+        self._index(user_data)
 
     def create(self, user: UserModel) -> UserModel:
         """Crée un nouvel utilisateur"""
-        users = self._read_data()
-
         # Génère un ID unique
         import uuid
         user.user_id = str(uuid.uuid4())
 
-        user_dict = user.to_dict(exclude_password=False)
-        users.append(user_dict)
-        self._write_data(users)
+        def operation():
+            user_data = user.to_dict(exclude_password=False)
+            self._put(user_data)
+            return user, [user_data]
 
-        return user
+        return self._committer.submit(operation)
 
     def find_all(self) -> List[UserModel]:
         """Récupère tous les utilisateurs"""
-        users_data = self._read_data()
+        users_data = list(self._load().values())
         return [UserModel.from_dict(user) for user in users_data]
 
+    def iter_all(self) -> Iterator[UserModel]:
+        """Parcourt tous les utilisateurs, hydratés un par un au fil de l'itération"""
+        with self._lock:
+            users_data = list(self._load().values())
+        for user in users_data:
+            yield UserModel.from_dict(user)
+
     def find_by_id(self, user_id: str) -> Optional[UserModel]:
         """Trouve un utilisateur par son ID"""
-        users = self._read_data()
-        for user_data in users:
-            if user_data.get('user_id') == user_id:
-                return UserModel.from_dict(user_data)
-        return None
+        user_data = self._load().get(user_id)
+        return UserModel.from_dict(user_data) if user_data else None
+
+    def find_by_ids(self, user_ids: List[str]) -> Dict[str, UserModel]:
+        """Trouve plusieurs utilisateurs par leur ID en une seule lecture (IDs inconnus absents du résultat)"""
+        with self._lock:
+            records = self._load()
+            users_data = [records[user_id] for user_id in set(user_ids) if user_id in records]
+        return {user['user_id']: UserModel.from_dict(user) for user in users_data}
+
+    def find_page(self, limit: int, after: Optional[Tuple[str, str]] = None,
+                  exclude_deleted: bool = False) -> Tuple[List[UserModel], Optional[Tuple[str, str]]]:
+        """
+        Récupère une page d'utilisateurs triés par (created_at, ID), après la clé after.
+        Seuls les utilisateurs de la page sont hydratés.
+        Retourne les utilisateurs et la clé du dernier (None s'il n'y a pas de page suivante).
+        """
+        page, next_key = [], None
+        with self._lock:
+            records = self._load()
+            index = self._created_index
+            position = bisect_right(index, after) if after else 0
+            while position < len(index):
+                key = index[position]
+                position += 1
+                user_data = records[key[1]]
+                if exclude_deleted and user_data.get('is_deleted'):
+                    continue
+                if len(page) == limit:
+                    next_key = page_key(page[-1], 'user_id')
+                    break
+                page.append(user_data)
+        return [UserModel.from_dict(user) for user in page], next_key
 
     def find_by_email(self, email: str) -> Optional[UserModel]:
         """Trouve un utilisateur par son email"""
-        users = self._read_data()
-        for user_data in users:
-            if user_data.get('email') == email:
-                return UserModel.from_dict(user_data)
-        return None
+        with self._lock:
+            records = self._load()
+            user_id = self._by_email.get(email)
+            user_data = records.get(user_id) if user_id is not None else None
+        return UserModel.from_dict(user_data) if user_data else None
 
     def find_by_phone(self, phone_number: str) -> Optional[UserModel]:
         """Trouve un utilisateur par son numéro de téléphone"""
-        users = self._read_data()
-        for user_data in users:
-            if user_data.get('phone_number') == phone_number:
-                return UserModel.from_dict(user_data)
-        return None
-
-    def update(self, user_id: str, user: UserModel) -> Optional[UserModel]:
-        """Met à jour un utilisateur"""
-        users = self._read_data()
-
-        for i, user_data in enumerate(users):
-            if user_data.get('user_id') == user_id:
-                # Conserve l'ID original
-                user.user_id = user_id
-                # Met à jour la date de modification
-                from datetime import datetime
-                user.updated_at = datetime.utcnow().isoformat()
-
-                users[i] = user.to_dict(exclude_password=False)
-                self._write_data(users)
-                return user
-
-        return None
+        with self._lock:
+            records = self._load()
+            user_id = self._by_phone.get(normalize_phone(phone_number))
+            user_data = records.get(user_id) if user_id is not None else None
+        return UserModel.from_dict(user_data) if user_data else None
 
-    def delete(self, user_id: str) -> bool:
-        """Supprime un utilisateur (soft delete)"""
-        users = self._read_data()
+    def update(self, user_id: str, user: UserModel, expected_version: Optional[int] = None) -> Optional[UserModel]:
+        """
+        Met à jour un utilisateur et incrémente sa version.
+        Si expected_version est fourni, la mise à jour n'a lieu que si la version
+        stockée est toujours celle-ci (sinon None, comme pour un ID inconnu).
+        """
+        def operation():
+            current = self._records.get(user_id)
+            if current is None:
+                return None, []
+            version = current.get('version', 1)
+            if expected_version is not None and version != expected_version:
+                return None, []
+
+            # Conserve l'ID original
+            user.user_id = user_id
+            user.version = version + 1
+            # Met à jour la date de modification
+            from datetime import datetime
+            user.updated_at = datetime.utcnow().isoformat()
 
-        for i, user_data in enumerate(users):
-            if user_data.get('user_id') == user_id:
-                users[i]['is_deleted'] = True
-                from datetime import datetime
-                users[i]['updated_at'] = datetime.utcnow().isoformat()
-                self._write_data(users)
-                return True
+            user_data = user.to_dict(exclude_password=False)
+            self._put(user_data)
+            return user, [user_data]
 
-        return False
+        return self._committer.submit(operation)
+
+    def delete(self, user_id: str) -> bool:
+        """Supprime un utilisateur (soft delete)"""
+        return self._update_fields(user_id, is_deleted=True)
 
     def update_photo_url(self, user_id: str, photo_url: str) -> bool:
         """Met à jour l'URL de la photo de profil"""
-        users = self._read_data()
+        return self._update_fields(user_id, photo_url=photo_url)
+
+    def update_fields_many(self, updates: Dict[str, dict]) -> int:
+        """
+        Met à jour des champs de plusieurs utilisateurs en une seule écriture
+        (sans modifier updated_at ni la version). Les IDs inconnus sont ignorés.
+        Retourne le nombre d'utilisateurs mis à jour.
+        """
+        def operation():
+            changed = []
+            for user_id, fields in updates.items():
+                user_data = self._records.get(user_id)
+                if user_data is not None:
+                    user_data = {**user_data, **fields}
+                    self._put(user_data)
+                    changed.append(user_data)
+            return len(changed), changed
+
+        return self._committer.submit(operation)
+
+    def _update_fields(self, user_id: str, **fields) -> bool:
+        """Met à jour quelques champs d'un utilisateur et sa date de modification"""
+        def operation():
+            user_data = self._records.get(user_id)
+            if user_data is None:
+                return False, []
 
-        for i, user_data in enumerate(users):
-            if user_data.get('user_id') == user_id:
-                users[i]['photo_url'] = photo_url
-                from datetime import datetime
-                users[i]['updated_at'] = datetime.utcnow().isoformat()
-                self._write_data(users)
-                return True
+            from datetime import datetime
+            user_data = {
+                **user_data, **fields,
+                'updated_at': datetime.utcnow().isoformat(),
+                'version': user_data.get('version', 1) + 1
+            }
+            self._put(user_data)
+            return True, [user_data]
 
-        return False
+        return self._committer.submit(operation)
@@ -2,9 +2,16 @@
 Service pour la logique metier des missions
 """
 
-from typing import Optional, List, Tuple
+import threading
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 from models.mission_model import MissionModel
 from repositories.mission_repository import MissionRepository
+from repositories.user_repository import UserRepository
+from utils.event_bus import EventBus, Subscription
+from utils.fragment_cache import FragmentCache, encode_fragment
+from utils.pagination import decode_cursor, encode_cursor
 from dto.mission import (
     MissionCreateDto,
     MissionDisplayDto,
@@ -47,92 +54,425 @@ MISSION_TYPES = {
     )
 }
 
+# Types de missions au format d'affichage, calcules une seule fois (chemin de lecture rapide)
+MISSION_TYPE_DICTS = {code: mission_type.to_dict() for code, mission_type in MISSION_TYPES.items()}
+
+# Filtres acceptes par le flux temps reel des missions
+EVENT_FILTERS = ('city', 'type_code', 'budget_min', 'budget_max')
+
+# Evenement diffuse pour une mission ecrite dans ce statut (seules les
+# transitions publish / accept produisent ces statuts)
+EVENT_TYPES = {"PUBLISHED": "mission.published", "ASSIGNED": "mission.accepted"}
+
+# Utilisateurs pouvant etre inclus dans les missions (?expand=publisher,worker)
+EXPAND_FIELDS = ('publisher', 'worker')
+
+# Nombre de missions dont les utilisateurs sont lus ensemble dans une liste
+EXPAND_BATCH_SIZE = 500
+
+
+class UserSummaries:
+    """
+    Resumes des utilisateurs (nom, photo) inclus dans une reponse, memorises le
+    temps de la requete : les IDs pas encore connus sont lus ensemble
+    (find_by_ids), chaque utilisateur au plus une fois.
+    """
+
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+        self._summaries: Dict[str, Optional[dict]] = {}
+
+    def load(self, user_ids: Iterable[Optional[str]]):
+        """Lit en une fois les utilisateurs pas encore memorises"""
+        missing = {user_id for user_id in user_ids if user_id and user_id not in self._summaries}
+        if not missing:
+            return
+        users = self.user_repository.find_by_ids(list(missing))
+        for user_id in missing:
+            user = users.get(user_id)
+            # Utilisateur inconnu ou supprime : null dans la reponse
+            self._summaries[user_id] = None if user is None or user.is_deleted else {
+                "user_id": user.user_id,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "photo_url": user.photo_url
+            }
+
+    def get(self, user_id: Optional[str]) -> Optional[dict]:
+        """Resume d'un utilisateur deja lu (None si absent)"""
+        return self._summaries.get(user_id) if user_id else None
+
 
 class MissionService:
     """Service pour la gestion des missions"""
 
-    def __init__(self, repository: MissionRepository):
+    def __init__(
+        self,
+        repository: MissionRepository,
+        events: Optional[EventBus] = None,
+        user_repository: Optional[UserRepository] = None,
+        poll_interval: Optional[float] = None
+    ):
         self.repository = repository
+        # Bus des evenements temps reel (mission publiee, acceptee), si fourni.
+        # Les evenements sont lus dans le flux des modifications du repository :
+        # apres chaque ecriture de ce processus et toutes les poll_interval
+        # secondes (ecritures des autres processus).
+        self.events = events
+        self._relay_lock = threading.Lock()
+        self._relayed_version = repository.data_version() if events is not None else None
+        # Utilisateurs inclus dans les reponses avec ?expand=publisher,worker, si fourni
+        self.user_repository = user_repository
+        # Fragments JSON des missions au format d'affichage, liberes a chaque modification
+        self.fragments = FragmentCache(self._to_display_dict)
+        repository.add_listener(self.fragments.invalidate)
+        if events is not None and poll_interval:
+            thread = threading.Thread(target=self._run_relay, args=(poll_interval,), daemon=True)
+            thread.start()
+
+    def data_version(self) -> int:
+        """Version des missions (change a chaque ecriture), pour les ETags"""
+        return self.repository.data_version()
+
+    def users_data_version(self) -> Optional[int]:
+        """Version des utilisateurs inclus par ?expand, pour les ETags (None sans repository)"""
+        return self.user_repository.data_version() if self.user_repository is not None else None
+
+    def _user_summaries(self) -> UserSummaries:
+        """Memo des utilisateurs d'une reponse (ValueError si expand n'est pas disponible)"""
+        if self.user_repository is None:
+            raise ValueError("Le parametre expand n'est pas disponible")
+        return UserSummaries(self.user_repository)
+
+    @staticmethod
+    def _with_users(mission: dict, expand: Tuple[str, ...], summaries: UserSummaries) -> dict:
+        """Mission au format d'affichage completee des resumes publisher / worker"""
+        return {**mission, **{field: summaries.get(mission.get(f"{field}_id")) for field in expand}}
+
+    def _iter_expanded_json(self, records: Iterable[dict], expand: Tuple[str, ...]) -> Iterator[str]:
+        """
+        Missions encodees avec les utilisateurs de expand : une lecture groupee des
+        utilisateurs par lot de EXPAND_BATCH_SIZE missions (chacun lu au plus une fois)
+        """
+        summaries = self._user_summaries()
+
+        def generate():
+            remaining = iter(records)
+            while True:
+                batch = [self._to_display_dict(mission_data) for mission_data in islice(remaining, EXPAND_BATCH_SIZE)]
+                if not batch:
+                    return
+                summaries.load(mission.get(f"{field}_id") for mission in batch for field in expand)
+                for mission in batch:
+                    yield encode_fragment(self._with_users(mission, expand, summaries))
+
+        return generate()
+
+    def expand_mission(self, mission: dict, expand: Tuple[str, ...]) -> dict:
+        """
+        Ajoute a une mission (format d'affichage) le resume des utilisateurs de expand
+        Raises: ValueError si expand n'est pas disponible
+        """
+        summaries = self._user_summaries()
+        summaries.load(mission.get(f"{field}_id") for field in expand)
+        return self._with_users(mission, expand, summaries)
+
+    def relay_events(self) -> int:
+        """
+        Diffuse les evenements des missions ecrites depuis le dernier passage,
+        par ce processus ou par un autre (flux des modifications du repository)
+
+        Le flux ne garde que l'etat courant de chaque mission : si plusieurs
+        transitions d'une mission ont lieu entre deux passages (en pratique dans
+        un autre processus, pendant poll_interval), seule la derniere produit un
+        evenement. Une mission publiee puis acceptee ne donne que mission.accepted,
+        une mission acceptee puis terminee aucun evenement.
+        Returns: nombre d'evenements diffuses
+        """
+        if self.events is None:
+            return 0
+        with self._relay_lock:
+            since = self._relayed_version
+            records, version = self.repository.find_changed_records(since)
+            if version <= since:
+                # Rien de nouveau, ou donnees remplacees (version inferieure) : on repart de version
+                self._relayed_version = version
+                return 0
+            published = 0
+            for mission_data in records:
+                event_type = EVENT_TYPES.get(mission_data.get('status'))
+                if event_type is None:
+                    continue
+                self.events.publish({
+                    "type": event_type,
+                    "mission": mission_data,
+                    "version": version,
+                    # Encode une seule fois, quel que soit le nombre d'abonnes
+                    "data": encode_fragment(self._to_display_dict(mission_data))
+                })
+                published += 1
+            self._relayed_version = version
+            return published
+
+    def _safe_relay_events(self):
+        """Relais apres une ecriture deja enregistree : une erreur est retentee au passage suivant"""
+        try:
+            self.relay_events()
+        except Exception:
+            pass
+
+    def _run_relay(self, poll_interval: float):
+        """Relais periodique des ecritures des autres processus"""
+        while True:
+            time.sleep(poll_interval)
+            self._safe_relay_events()
+
+    def subscribe_events(self, filters_data: dict) -> Subscription:
+        """
+        Abonnement aux evenements des missions correspondant aux filtres
+        (city, type_code, budget_min, budget_max ; les autres parametres sont ignores)
+        Raises: ValueError si les filtres sont invalides ou si le flux n'est pas active
+        """
+        if self.events is None:
+            raise ValueError("Le flux temps reel des missions n'est pas active")
+        filter_dto = self._validated_filters({field: filters_data.get(field) for field in EVENT_FILTERS})
+        return self.events.subscribe(lambda event: filter_dto.matches(event["mission"]))
 
     def _get_mission_type(self, type_code: str) -> MissionTypeDto:
         """Recupere le type de mission depuis le code"""
         return MISSION_TYPES.get(type_code, MISSION_TYPES["OTHER"])
 
+    def _build_mission(self, data: dict) -> Tuple[Optional[MissionModel], Optional[str]]:
+        """
+        Valide les donnees de creation et construit la mission (sans l'enregistrer)
+        Returns: (mission, message d'erreur)
+        """
+        # Convertir en DTO et valider
+        create_dto = MissionCreateDto.from_dict(data)
+        is_valid, error_message = create_dto.validate()
+
+        if not is_valid:
+            return None, error_message
+
+        # Verifier que le type de mission existe
+        if create_dto.type_code not in MISSION_TYPES:
+            return None, f"Type de mission invalide: {create_dto.type_code}"
+
+        mission = MissionModel(
+            title=create_dto.title,
+            description=create_dto.description,
+            type_code=create_dto.type_code,
+            location=create_dto.location,
+            budget=create_dto.budget,
+            publisher_id=create_dto.publisher_id,
+            work_days=create_dto.work_days,
+            status="PUBLISHED" if create_dto.publish else "DRAFT"
+        )
+        return mission, None
+
     def create_mission(self, data: dict) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
         """
         Cree une nouvelle mission
         Returns: (success, message, mission_display_dto)
         """
         try:
-            # Convertir en DTO et valider
-            create_dto = MissionCreateDto.from_dict(data)
-            is_valid, error_message = create_dto.validate()
-
-            if not is_valid:
+            mission, error_message = self._build_mission(data)
+            if error_message:
                 return False, error_message, None
 
-            # Verifier que le type de mission existe
-            if create_dto.type_code not in MISSION_TYPES:
-                return False, f"Type de mission invalide: {create_dto.type_code}", None
-
-            # Creer le modele
-            mission = MissionModel(
-                title=create_dto.title,
-                description=create_dto.description,
-                type_code=create_dto.type_code,
-                location=create_dto.location,
-                budget=create_dto.budget,
-                publisher_id=create_dto.publisher_id,
-                work_days=create_dto.work_days,
-                status="PUBLISHED" if create_dto.publish else "DRAFT"
-            )
-
             # Sauvegarder
             created_mission = self.repository.create(mission)
+            self._safe_relay_events()
 
-            # Creer le DTO de reponse
-            mission_type = self._get_mission_type(created_mission.type_code)
-            display_dto = MissionDisplayDto(
-                id=created_mission.id,
-                title=created_mission.title,
-                description=created_mission.description,
-                type=mission_type,
-                location=created_mission.location,
-                budget=str(created_mission.budget),
-                publisher_id=created_mission.publisher_id,
-                status=created_mission.status,
-                work_days=created_mission.work_days
-            )
-
-            status_msg = "publiee" if create_dto.publish else "creee en brouillon"
-            return True, f"Mission {status_msg} avec succes", display_dto
+            status_msg = "publiee" if created_mission.status == "PUBLISHED" else "creee en brouillon"
+            return True, f"Mission {status_msg} avec succes", self._to_display_dto(created_mission)
 
         except Exception as e:
             return False, f"Erreur lors de la creation: {str(e)}", None
 
+    def create_missions(self, items: list) -> Tuple[List[MissionDisplayDto], List[dict]]:
+        """
+        Cree plusieurs missions : tous les elements sont valides d'abord, puis les
+        missions valides sont enregistrees en une seule ecriture (create_many).
+        Les elements invalides sont ignores et signales par leur position.
+        Returns: (missions creees, erreurs [{"index", "message"}])
+        """
+        missions = []
+        errors = []
+        for index, data in enumerate(items):
+            if not isinstance(data, dict):
+                errors.append({"index": index, "message": "Mission invalide : un objet JSON est attendu"})
+                continue
+            try:
+                mission, error_message = self._build_mission(data)
+            except Exception as e:
+                mission, error_message = None, f"Erreur lors de la creation: {str(e)}"
+            if error_message:
+                errors.append({"index": index, "message": error_message})
+            else:
+                missions.append(mission)
+
+        if missions:
+            self.repository.create_many(missions)
+            self._safe_relay_events()
+        return [self._to_display_dto(mission) for mission in missions], errors
+
+    def _to_display_dto(self, mission: MissionModel) -> MissionDisplayDto:
+        """Convertit une mission en DTO d'affichage"""
+        return MissionDisplayDto(
+            id=mission.id,
+            title=mission.title,
+            description=mission.description,
+            type=self._get_mission_type(mission.type_code),
+            location=mission.location,
+            budget=str(mission.budget),
+            publisher_id=mission.publisher_id,
+            status=mission.status,
+            work_days=mission.work_days,
+            worker_id=getattr(mission, 'worker_id', None),
+            version=mission.version
+        )
+
+    def _to_display_dict(self, data: dict) -> dict:
+        """
+        Convertit une mission stockee directement au format d'affichage, sans
+        passer par MissionModel ni MissionDisplayDto. Meme resultat que
+        _to_display_dto(MissionModel.from_dict(data)).to_dict().
+        """
+        location = data.get('location', {})
+        work_days = data.get('work_days', [])
+        if not data.get('id') or not isinstance(location, dict) or not all(isinstance(wd, dict) for wd in work_days):
+            # Donnees atypiques : chemin complet
+            return self._to_display_dto(MissionModel.from_dict(data)).to_dict()
+
+        result = {
+            "id": data['id'],
+            "title": data.get('title', ''),
+            "description": data.get('description', ''),
+            "type": MISSION_TYPE_DICTS.get(data.get('type_code', ''), MISSION_TYPE_DICTS["OTHER"]),
+            "location": {
+                "country": location.get('country', ''),
+                "city": location.get('city', ''),
+                "neighborhood": location.get('neighborhood', '')
+            },
+            "budget": str(float(data.get('budget', 0))),
+            "publisher_id": data.get('publisher_id', ''),
+            "status": data.get('status', 'DRAFT'),
+            "work_days": [
+                {"day": wd.get('day', ''), "start_time": wd.get('start_time', ''), "end_time": wd.get('end_time', '')}
+                for wd in work_days
+            ],
+            "version": data.get('version', 1)
+        }
+        if data.get('worker_id'):
+            result["worker_id"] = data['worker_id']
+        return result
+
     def get_all_missions(self) -> List[MissionDisplayDto]:
         """Recupere toutes les missions"""
         missions = self.repository.find_all()
-        display_dtos = []
-
-        for mission in missions:
-            mission_type = self._get_mission_type(mission.type_code)
-            worker_id = getattr(mission, 'worker_id', None)
-            display_dto = MissionDisplayDto(
-                id=mission.id,
-                title=mission.title,
-                description=mission.description,
-                type=mission_type,
-                location=mission.location,
-                budget=str(mission.budget),
-                publisher_id=mission.publisher_id,
-                status=mission.status,
-                work_days=mission.work_days,
-                worker_id=worker_id
-            )
-            display_dtos.append(display_dto)
-
-        return display_dtos
+        return [self._to_display_dto(mission) for mission in missions]
+
+    def iter_all_missions_data(self) -> Iterator[dict]:
+        """Parcourt toutes les missions au format d'affichage (lecture seule, sans modeles ni DTOs)"""
+        return (self._to_display_dict(mission_data) for mission_data in self.repository.iter_records())
+
+    def get_missions_page_data(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """
+        Recupere une page de missions au format d'affichage (triees par date de creation puis ID)
+        Returns: (missions, curseur de la page suivante ou None)
+        Leve ValueError si le curseur est invalide.
+        """
+        missions, next_key = self.repository.find_page_records(limit, decode_cursor(cursor))
+        return [self._to_display_dict(mission_data) for mission_data in missions], encode_cursor(next_key)
+
+    def iter_all_missions_json(self, expand: Tuple[str, ...] = ()) -> Iterator[str]:
+        """
+        Comme iter_all_missions_data, chaque mission etant deja encodee en JSON (fragments en cache).
+        Avec expand, les resumes des utilisateurs sont inclus (encodage sans cache).
+        """
+        if expand:
+            return self._iter_expanded_json(self.repository.iter_records(), expand)
+        return (self.fragments.get(mission_data) for mission_data in self.repository.iter_records())
+
+    def get_missions_page_json(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        expand: Tuple[str, ...] = ()
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        Comme get_missions_page_data, chaque mission etant deja encodee en JSON (fragments en cache)
+        Leve ValueError si le curseur est invalide.
+        """
+        missions, next_key = self.repository.find_page_records(limit, decode_cursor(cursor))
+        if expand:
+            return list(self._iter_expanded_json(missions, expand)), encode_cursor(next_key)
+        return [self.fragments.get(mission_data) for mission_data in missions], encode_cursor(next_key)
+
+    def get_publisher_missions_json(
+        self,
+        publisher_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        Missions creees par un utilisateur (fragments JSON en cache), lues dans l'index
+        du publisher : toutes sans limit, sinon une page triee par date de creation
+        Returns: (missions, curseur de la page suivante ou None)
+        Leve ValueError si le curseur est invalide.
+        """
+        if limit is None:
+            missions, _ = self.repository.find_records_for_user(publisher_id)
+            return [self.fragments.get(mission_data) for mission_data in missions], None
+        missions, next_key = self.repository.find_publisher_page_records(publisher_id, limit, decode_cursor(cursor))
+        return [self.fragments.get(mission_data) for mission_data in missions], encode_cursor(next_key)
+
+    def get_mission_changes_json(self, since: int) -> Tuple[List[str], int, bool]:
+        """
+        Missions creees ou modifiees depuis la version since (fragments JSON en cache)
+        Returns: (missions, version courante, full)
+        full est vrai si since vaut 0 ou est inconnue (superieure a la version
+        courante) : toutes les missions sont alors renvoyees et remplacent celles du client.
+        Leve ValueError si since est negative.
+        """
+        if since < 0:
+            raise ValueError("Le parametre since doit etre un entier positif")
+        missions, version = self.repository.find_changed_records(since)
+        full = since == 0 or since > version
+        if full:
+            version = self.repository.data_version()
+            missions = self.repository.iter_records()
+        return [self.fragments.get(mission_data) for mission_data in missions], version, full
+
+    def get_missions_for_user(self, user_id: str, counts_only: bool = False) -> dict:
+        """
+        Missions creees et acceptees par un utilisateur (format d'affichage), lues
+        dans les index publisher_id / worker_id plutot qu'en parcourant toutes les missions
+        Returns: {created_missions, accepted_missions, total_created, total_accepted, total}
+        Avec counts_only, seuls les totaux sont calcules (taille des index).
+        """
+        if counts_only:
+            total_created, total_accepted = self.repository.count_for_user(user_id)
+            return {
+                "total_created": total_created,
+                "total_accepted": total_accepted,
+                "total": total_created + total_accepted
+            }
+
+        created, accepted = self.repository.find_records_for_user(user_id)
+        return {
+            "created_missions": [self._to_display_dict(mission_data) for mission_data in created],
+            "accepted_missions": [self._to_display_dict(mission_data) for mission_data in accepted],
+            "total_created": len(created),
+            "total_accepted": len(accepted),
+            "total": len(created) + len(accepted)
+        }
+
+    def get_mission_version(self, mission_id: str) -> Optional[int]:
+        """Version d'une mission (ETag de GET /api/missions/<id>), None si elle n'existe pas"""
+        mission = self.repository.find_by_id(mission_id)
+        return mission.version if mission else None
 
     def get_mission_by_id(self, mission_id: str) -> Optional[MissionDisplayDto]:
         """Recupere une mission par son ID"""
@@ -141,49 +481,64 @@ class MissionService:
         if not mission:
             return None
 
-        mission_type = self._get_mission_type(mission.type_code)
-        worker_id = getattr(mission, 'worker_id', None)
-        return MissionDisplayDto(
-            id=mission.id,
-            title=mission.title,
-            description=mission.description,
-            type=mission_type,
-            location=mission.location,
-            budget=str(mission.budget),
-            publisher_id=mission.publisher_id,
-            status=mission.status,
-            work_days=mission.work_days,
-            worker_id=worker_id
-        )
+        return self._to_display_dto(mission)
 
     def get_missions_by_filters(self, filters_data: dict) -> List[MissionDisplayDto]:
-        """Recherche des missions avec des filtres"""
+        """
+        Recherche des missions avec des filtres
+        Raises: ValueError si les filtres sont invalides
+        """
+        missions = self.repository.find_by_filters(self._validated_filters(filters_data))
+        return [self._to_display_dto(mission) for mission in missions]
+
+    def iter_missions_by_filters_data(self, filters_data: dict) -> Iterator[dict]:
+        """
+        Comme get_missions_by_filters, au format d'affichage (lecture seule, sans modeles
+        ni DTOs). Les filtres sont valides avant le debut du parcours.
+        Raises: ValueError si les filtres sont invalides
+        """
+        missions = self.repository.iter_records_by_filters(self._validated_filters(filters_data))
+        return (self._to_display_dict(mission_data) for mission_data in missions)
+
+    def iter_missions_by_filters_json(self, filters_data: dict, expand: Tuple[str, ...] = ()) -> Iterator[str]:
+        """
+        Comme iter_missions_by_filters_data, chaque mission etant deja encodee en JSON (fragments en cache)
+        Raises: ValueError si les filtres sont invalides
+        """
+        missions = self.repository.iter_records_by_filters(self._validated_filters(filters_data))
+        if expand:
+            return self._iter_expanded_json(missions, expand)
+        return (self.fragments.get(mission_data) for mission_data in missions)
+
+    @staticmethod
+    def _validated_filters(filters_data: dict) -> MissionFilterDto:
+        """Construit et valide les filtres de recherche (ValueError si invalides)"""
         filter_dto = MissionFilterDto.from_dict(filters_data)
-        missions = self.repository.find_by_filters(filter_dto)
-
-        display_dtos = []
-        for mission in missions:
-            mission_type = self._get_mission_type(mission.type_code)
-            worker_id = getattr(mission, 'worker_id', None)
-            display_dto = MissionDisplayDto(
-                id=mission.id,
-                title=mission.title,
-                description=mission.description,
-                type=mission_type,
-                location=mission.location,
-                budget=str(mission.budget),
-                publisher_id=mission.publisher_id,
-                status=mission.status,
-                work_days=mission.work_days,
-                worker_id=worker_id
-            )
-            display_dtos.append(display_dto)
-
-        return display_dtos
-
-    def publish_mission(self, mission_id: str, user_id: str) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
+        is_valid, error_message = filter_dto.validate()
+        if not is_valid:
+            raise ValueError(error_message)
+        return filter_dto
+
+    @staticmethod
+    def _version_conflict_message(version: int) -> str:
+        """Message d'echec d'une mise a jour basee sur une version perimee (If-Match)"""
+        return f"La mission a ete modifiee entre-temps (version actuelle: {version})"
+
+    def _status_conflict_message(self, mission_id: str, action: str, expected_status: str) -> str:
+        """Message d'echec d'une transition refusee parce que la mission a change entre-temps"""
+        current = self.repository.find_by_id(mission_id)
+        if not current:
+            return "Mission non trouvee"
+        if current.status == expected_status:
+            # Meme statut : seule la version a change (autre modification concurrente)
+            return self._version_conflict_message(current.version)
+        return f"Cette mission ne peut pas etre {action} (statut: {current.status})"
+
+    def publish_mission(self, mission_id: str, user_id: str,
+                        expected_version: Optional[int] = None) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
         """
         Publie une mission (passe de DRAFT a PUBLISHED)
+        expected_version : version attendue par le client (If-Match), sinon celle lue
         Returns: (success, message, mission_display_dto)
         """
         try:
@@ -197,6 +552,10 @@ class MissionService:
             if not mission.is_owner(user_id):
                 return False, "Vous n'etes pas autorise a publier cette mission", None
 
+            # Version attendue par le client (If-Match)
+            if expected_version is not None and mission.version != expected_version:
+                return False, self._version_conflict_message(mission.version), None
+
             # Verifier le statut
             if mission.status == "PUBLISHED":
                 return False, "Cette mission est deja publiee", None
@@ -207,31 +566,22 @@ class MissionService:
             # Publier la mission
             mission.publish()
 
-            # Sauvegarder
-            updated_mission = self.repository.update(mission)
-
-            # Creer le DTO de reponse
-            mission_type = self._get_mission_type(updated_mission.type_code)
-            display_dto = MissionDisplayDto(
-                id=updated_mission.id,
-                title=updated_mission.title,
-                description=updated_mission.description,
-                type=mission_type,
-                location=updated_mission.location,
-                budget=str(updated_mission.budget),
-                publisher_id=updated_mission.publisher_id,
-                status=updated_mission.status,
-                work_days=updated_mission.work_days
-            )
-
-            return True, "Mission publiee avec succes", display_dto
+            # Sauvegarder, si la mission n'a pas change entre-temps (statut et version lus)
+            updated_mission = self.repository.update_if(mission, "DRAFT", mission.version)
+            if updated_mission is None:
+                return False, self._status_conflict_message(mission_id, "publiee", "DRAFT"), None
+            self._safe_relay_events()
+
+            return True, "Mission publiee avec succes", self._to_display_dto(updated_mission)
 
         except Exception as e:
             return False, f"Erreur lors de la publication: {str(e)}", None
 
-    def accept_mission(self, mission_id: str, user_id: str) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
+    def accept_mission(self, mission_id: str, user_id: str,
+                       expected_version: Optional[int] = None) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
         """
         Accepte une mission - Un utilisateur devient le travailleur de la mission
+        expected_version : version attendue par le client (If-Match), sinon celle lue
         Returns: (success, message, mission_display_dto)
         """
         try:
@@ -245,6 +595,10 @@ class MissionService:
             if mission.is_owner(user_id):
                 return False, "Vous ne pouvez pas accepter votre propre mission", None
 
+            # Version attendue par le client (If-Match)
+            if expected_version is not None and mission.version != expected_version:
+                return False, self._version_conflict_message(mission.version), None
+
             # Verifier le statut - seules les missions PUBLISHED peuvent etre acceptees
             if mission.status != "PUBLISHED":
                 return False, f"Cette mission ne peut pas etre acceptee (statut: {mission.status})", None
@@ -252,31 +606,22 @@ class MissionService:
             # Accepter la mission
             mission.accept(user_id)
 
-            # Sauvegarder
-            updated_mission = self.repository.update(mission)
-
-            # Creer le DTO de reponse
-            mission_type = self._get_mission_type(updated_mission.type_code)
-            display_dto = MissionDisplayDto(
-                id=updated_mission.id,
-                title=updated_mission.title,
-                description=updated_mission.description,
-                type=mission_type,
-                location=updated_mission.location,
-                budget=str(updated_mission.budget),
-                publisher_id=updated_mission.publisher_id,
-                status=updated_mission.status,
-                work_days=updated_mission.work_days
-            )
-
-            return True, "Mission acceptee avec succes", display_dto
+            # Sauvegarder, si personne ne l'a modifiee ou acceptee entre-temps (une seule acceptation gagne)
+            updated_mission = self.repository.update_if(mission, "PUBLISHED", mission.version)
+            if updated_mission is None:
+                return False, self._status_conflict_message(mission_id, "acceptee", "PUBLISHED"), None
+            self._safe_relay_events()
+
+            return True, "Mission acceptee avec succes", self._to_display_dto(updated_mission)
 
         except Exception as e:
             return False, f"Erreur lors de l'acceptation: {str(e)}", None
 
-    def complete_mission(self, mission_id: str, user_id: str) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
+    def complete_mission(self, mission_id: str, user_id: str,
+                         expected_version: Optional[int] = None) -> Tuple[bool, str, Optional[MissionDisplayDto]]:
         """
         Termine une mission - Peut etre fait par le proprietaire ou le travailleur
+        expected_version : version attendue par le client (If-Match), sinon celle lue
         Returns: (success, message, mission_display_dto)
         """
         try:
@@ -293,6 +638,10 @@ class MissionService:
             if not is_owner and not is_worker:
                 return False, "Vous n'etes pas autorise a terminer cette mission", None
 
+            # Version attendue par le client (If-Match)
+            if expected_version is not None and mission.version != expected_version:
+                return False, self._version_conflict_message(mission.version), None
+
             # Verifier le statut - seules les missions ASSIGNED peuvent etre terminees
             if mission.status != "ASSIGNED":
                 return False, f"Cette mission ne peut pas etre terminee (statut: {mission.status})", None
@@ -300,24 +649,12 @@ class MissionService:
             # Terminer la mission
             mission.complete()
 
-            # Sauvegarder
-            updated_mission = self.repository.update(mission)
-
-            # Creer le DTO de reponse
-            mission_type = self._get_mission_type(updated_mission.type_code)
-            display_dto = MissionDisplayDto(
-                id=updated_mission.id,
-                title=updated_mission.title,
-                description=updated_mission.description,
-                type=mission_type,
-                location=updated_mission.location,
-                budget=str(updated_mission.budget),
-                publisher_id=updated_mission.publisher_id,
-                status=updated_mission.status,
-                work_days=updated_mission.work_days
-            )
-
-            return True, "Mission terminee avec succes", display_dto
+            # Sauvegarder, si la mission n'a pas change entre-temps (statut et version lus)
+            updated_mission = self.repository.update_if(mission, "ASSIGNED", mission.version)
+            if updated_mission is None:
+                return False, self._status_conflict_message(mission_id, "terminee", "ASSIGNED"), None
+
+            return True, "Mission terminee avec succes", self._to_display_dto(updated_mission)
 
         except Exception as e:
             return False, f"Erreur lors de la completion: {str(e)}", None
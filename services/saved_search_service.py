@@ -0,0 +1,285 @@
+"""
+Service pour les recherches sauvegardees et la notification des missions publiees correspondantes
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.saved_search_model import InboxItemModel, SavedSearchModel
+from repositories.saved_search_repository import SavedSearchRepository
+from repositories.text_index import TextIndex, tokenize
+from services.mission_service import MissionService
+from dto.mission import MissionFilterDto
+
+
+# Criteres acceptes dans une recherche sauvegardee (le statut est toujours PUBLISHED,
+# le tri n'a pas de sens pour une notification)
+SAVED_SEARCH_FILTERS = (
+    'title', 'keywords', 'type_code', 'country', 'city', 'neighborhood',
+    'budget_min', 'budget_max', 'publisher_id'
+)
+
+# Criteres numeriques ; les autres sont des chaines de caracteres
+BUDGET_FILTERS = ('budget_min', 'budget_max')
+
+# Tranches de budget de l'index : [2^(n-1), 2^n[, la derniere regroupe les budgets superieurs
+MAX_BUDGET_BUCKET = 40
+
+
+def budget_bucket(budget: float) -> int:
+    """Numero de la tranche de budget (puissances de 2)"""
+    return min(int(max(budget, 0)).bit_length(), MAX_BUDGET_BUCKET)
+
+
+def _text_matches(query: str, tokens: List[str]) -> bool:
+    """
+    Meme regle que TextIndex.search : chaque terme de la requete doit etre
+    un terme du texte, ou le debut d'un terme s'il est assez long
+    """
+    for term in set(tokenize(query)):
+        if len(term) < TextIndex.MIN_PREFIX_LENGTH:
+            if term not in tokens:
+                return False
+        elif not any(token.startswith(term) for token in tokens):
+            return False
+    return True
+
+
+class SearchPercolator:
+    """
+    Index inverse des recherches sauvegardees (percolation) : au lieu de
+    rejouer chaque recherche a chaque publication, les recherches sont
+    indexees par leur critere le plus selectif (ville, sinon type, sinon
+    tranches de budget couvertes). Une mission n'est comparee qu'aux
+    recherches rangees sous sa ville, son type, sa tranche de budget, et
+    a celles sans aucun de ces criteres.
+    """
+
+    def __init__(self, searches: Iterable[SavedSearchModel]):
+        self._index: Dict[tuple, List[Tuple[SavedSearchModel, MissionFilterDto]]] = {}
+        self.size = 0
+        for search in searches:
+            try:
+                filter_dto = MissionFilterDto.from_dict(search.filters)
+            except (TypeError, ValueError):
+                # Recherche enregistree invalide : ignoree plutot que de bloquer les autres
+                continue
+            for key in self._search_keys(filter_dto):
+                self._index.setdefault(key, []).append((search, filter_dto))
+            self.size += 1
+
+    @staticmethod
+    def _search_keys(filter_dto: MissionFilterDto) -> List[tuple]:
+        """Cles sous lesquelles une recherche est rangee"""
+        if filter_dto.city:
+            return [('city', filter_dto.city)]
+        if filter_dto.type_code:
+            return [('type_code', filter_dto.type_code)]
+        if filter_dto.budget_min is not None or filter_dto.budget_max is not None:
+            first = budget_bucket(filter_dto.budget_min or 0)
+            last = MAX_BUDGET_BUCKET if filter_dto.budget_max is None else budget_bucket(filter_dto.budget_max)
+            return [('budget', bucket) for bucket in range(first, last + 1)]
+        return [('all',)]
+
+    @staticmethod
+    def _mission_keys(mission_data: dict) -> List[tuple]:
+        """Cles des recherches candidates pour une mission"""
+        location = mission_data.get('location')
+        location = location if isinstance(location, dict) else {}
+        return [
+            ('city', location.get('city')),
+            ('type_code', mission_data.get('type_code')),
+            ('budget', budget_bucket(float(mission_data.get('budget', 0)))),
+            ('all',)
+        ]
+
+    def match(self, mission_data: dict) -> List[SavedSearchModel]:
+        """Recherches auxquelles la mission correspond"""
+        matched = []
+        text_tokens = None
+        for key in self._mission_keys(mission_data):
+            for search, filter_dto in self._index.get(key, ()):
+                try:
+                    if text_tokens is None and filter_dto.keywords:
+                        text_tokens = tokenize(mission_data.get('title', '')) + tokenize(mission_data.get('description', ''))
+                    if self._search_matches(filter_dto, mission_data, text_tokens):
+                        matched.append(search)
+                except (AttributeError, TypeError, ValueError):
+                    # Critere de type inattendu (recherche enregistree avant validation) :
+                    # seule cette recherche est ignoree, le rattrapage continue
+                    continue
+        return matched
+
+    @staticmethod
+    def _search_matches(filter_dto: MissionFilterDto, mission_data: dict, text_tokens: Optional[List[str]]) -> bool:
+        """Une recherche correspond-elle a la mission (memes regles que la recherche)"""
+        if not filter_dto.matches(mission_data):
+            return False
+        if filter_dto.title and filter_dto.title.lower() not in mission_data.get('title', '').lower():
+            return False
+        if filter_dto.keywords and not _text_matches(filter_dto.keywords, text_tokens):
+            return False
+        return True
+
+
+class SavedSearchService:
+    """
+    Service des recherches sauvegardees.
+
+    Les missions publiees depuis le dernier passage (percolated_version) sont
+    lues avec le flux des modifications du repository des missions et
+    comparees aux recherches par le percolateur ; les correspondances sont
+    ajoutees a la boite de reception de chaque utilisateur. Ce rattrapage
+    est declenche par les evenements mission.published, toutes les
+    poll_interval secondes (publications d'un autre processus) et avant
+    chaque lecture de la boite de reception.
+    """
+
+    def __init__(
+        self,
+        repository: SavedSearchRepository,
+        mission_service: MissionService,
+        poll_interval: Optional[float] = None
+    ):
+        self.repository = repository
+        self.mission_service = mission_service
+        self._lock = threading.Lock()
+        self._percolator: Optional[SearchPercolator] = None
+        self._percolator_version = None
+        if poll_interval:
+            thread = threading.Thread(target=self._run, args=(poll_interval,), daemon=True)
+            thread.start()
+
+    def create_search(self, user_id: str, data: dict) -> Tuple[bool, str, Optional[dict]]:
+        """
+        Enregistre une recherche (criteres de SAVED_SEARCH_FILTERS)
+        Returns: (success, message, search_dict)
+        """
+        filters = data.get('filters')
+        if not isinstance(filters, dict):
+            return False, "Le champ filters doit etre un objet", None
+
+        unknown = sorted(set(filters) - set(SAVED_SEARCH_FILTERS))
+        if unknown:
+            return False, f"Criteres non supportes: {', '.join(unknown)}", None
+        filters = {field: value for field, value in filters.items() if value not in (None, '')}
+        if not filters:
+            return False, "Au moins un critere est requis", None
+        for field, value in filters.items():
+            if field in BUDGET_FILTERS:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return False, "Les budgets doivent etre des nombres", None
+            elif not isinstance(value, str):
+                return False, f"Le critere {field} doit etre une chaine de caracteres", None
+
+        try:
+            filter_dto = MissionFilterDto.from_dict(filters)
+        except (TypeError, ValueError):
+            return False, "Les budgets doivent etre des nombres", None
+        is_valid, error_message = filter_dto.validate()
+        if not is_valid:
+            return False, error_message, None
+        for field in ('budget_min', 'budget_max'):
+            if getattr(filter_dto, field) is None:
+                filters.pop(field, None)
+            else:
+                filters[field] = getattr(filter_dto, field)
+
+        # Les missions deja publiees ne sont pas notifiees a une nouvelle recherche
+        self.catch_up()
+        search = SavedSearchModel(user_id=user_id, filters=filters, name=str(data.get('name') or ''))
+        self.repository.create(search)
+        return True, "Recherche sauvegardee avec succes", search.to_dict()
+
+    def list_searches(self, user_id: str) -> List[dict]:
+        """Recherches sauvegardees d'un utilisateur"""
+        return [search.to_dict() for search in self.repository.find_by_user(user_id)]
+
+    def delete_search(self, search_id: str, user_id: str) -> Tuple[bool, str]:
+        """
+        Supprime une recherche et ses correspondances
+        Returns: (success, message)
+        """
+        search = self.repository.find_by_id(search_id)
+        if not search:
+            return False, "Recherche non trouvee"
+        if search.user_id != user_id:
+            return False, "Vous n'etes pas le proprietaire de cette recherche"
+        self.repository.delete(search_id)
+        return True, "Recherche supprimee avec succes"
+
+    def get_inbox(self, user_id: str, limit: int) -> List[dict]:
+        """Missions correspondant aux recherches de l'utilisateur, les plus recentes en premier"""
+        self.catch_up()
+        items = []
+        for item in self.repository.find_inbox(user_id, limit):
+            mission = self.mission_service.get_mission_by_id(item.mission_id)
+            items.append({
+                **item.to_dict(),
+                "mission": mission.to_dict() if mission else None
+            })
+        return items
+
+    def catch_up(self) -> int:
+        """
+        Compare aux recherches les missions publiees depuis le dernier passage
+        Returns: nombre de correspondances ajoutees
+        """
+        with self._lock:
+            missions = self.mission_service.repository
+            since = self.repository.percolated_version()
+            if since is None:
+                # Premier demarrage : seules les publications a venir sont notifiees
+                self.repository.add_matches([], missions.data_version())
+                return 0
+
+            records, version = missions.find_changed_records(since)
+            if version == since:
+                return 0
+
+            percolator = self._current_percolator()
+            items = []
+            for mission_data in records:
+                if mission_data.get('status') != "PUBLISHED":
+                    continue
+                for search in percolator.match(mission_data):
+                    items.append(InboxItemModel(
+                        user_id=search.user_id,
+                        search_id=search.id,
+                        mission_id=mission_data.get('id')
+                    ))
+            return self.repository.add_matches(items, version)
+
+    def _current_percolator(self) -> SearchPercolator:
+        """Percolateur des recherches, reconstruit quand elles ont change"""
+        version = self.repository.data_version()
+        if self._percolator is None or version != self._percolator_version:
+            self._percolator = SearchPercolator(self.repository.find_all())
+            self._percolator_version = version
+        return self._percolator
+
+    def _run(self, poll_interval: float):
+        """Rattrapage a chaque publication, et periodiquement en l'absence d'evenement"""
+        events = self.mission_service.events
+        while True:
+            subscription = None
+            if events is not None:
+                subscription = events.subscribe(lambda event: event["type"] == "mission.published")
+            try:
+                self._safe_catch_up()
+                if subscription is None:
+                    time.sleep(poll_interval)
+                    continue
+                # Un abonnement ferme (file pleine) est recree au tour suivant
+                for _ in subscription.events(poll_interval):
+                    self._safe_catch_up()
+            finally:
+                if subscription is not None:
+                    subscription.close()
+
+    def _safe_catch_up(self):
+        """Rattrapage en arriere-plan : une erreur est retentee au passage suivant"""
+        try:
+            self.catch_up()
+        except Exception:
+            pass
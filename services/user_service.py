@@ -1,9 +1,11 @@
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from models.user_model import UserModel, LoginModel
 from repositories.user_repository import UserRepository
 from utils.jwt_utils import generate_tokens, refresh_access_token
+from utils.write_behind import WriteBehindBuffer
+from utils.pagination import decode_cursor, encode_cursor
 from dto.user import CreateUserRequest, UpdateUserRequest, UserResponse, UserListResponse
 from dto.auth import LoginRequest, LoginResponse, RefreshTokenRequest, RefreshTokenResponse
 
@@ -11,8 +13,25 @@ from dto.auth import LoginRequest, LoginResponse, RefreshTokenRequest, RefreshTo
 class UserService:
     """Service pour la logique métier des utilisateurs"""
 
-    def __init__(self, repository: UserRepository):
+    def __init__(self, repository: UserRepository, metadata_buffer: Optional[WriteBehindBuffer] = None):
         self.repository = repository
+        # Métadonnées non critiques (last_login) écrites en différé, si fourni
+        self.metadata_buffer = metadata_buffer
+
+    def _with_pending(self, user: Optional[UserModel]) -> Optional[UserModel]:
+        """Applique à l'utilisateur les métadonnées pas encore persistées"""
+        if user and self.metadata_buffer:
+            for field, value in self.metadata_buffer.pending(user.user_id).items():
+                setattr(user, field, value)
+        return user
+
+    def data_version(self, user_id: Optional[str] = None) -> tuple:
+        """
+        Version des utilisateurs pour les ETags : version du repository et, pour
+        user_id, métadonnées en attente d'écriture (qui modifient les réponses).
+        """
+        pending = self.metadata_buffer.pending(user_id) if self.metadata_buffer and user_id else {}
+        return self.repository.data_version(), sorted(pending.items())
 
     def create_user(self, request_dto: CreateUserRequest) -> tuple[bool, str, Optional[UserResponse]]:
         """
@@ -50,34 +69,90 @@ class UserService:
     def get_all_users(self) -> UserListResponse:
         """Récupère tous les utilisateurs non supprimés"""
         all_users = self.repository.find_all()
-        active_users = [user for user in all_users if not user.is_deleted]
+        active_users = [self._with_pending(user) for user in all_users if not user.is_deleted]
         user_responses = [UserResponse.from_model(user) for user in active_users]
         return UserListResponse(users=user_responses, total=len(user_responses))
 
+    def iter_users(self) -> Iterator[UserResponse]:
+        """Parcourt les utilisateurs non supprimés sans les charger tous en mémoire (réponses streamées)"""
+        for user in self.repository.iter_all():
+            if not user.is_deleted:
+                yield UserResponse.from_model(self._with_pending(user))
+
+    def get_users_page(self, limit: int, cursor: Optional[str] = None) -> tuple[UserListResponse, Optional[str]]:
+        """
+        Récupère une page d'utilisateurs non supprimés (triés par date de création puis ID)
+        Returns: (user_list_response, curseur de la page suivante ou None)
+        Lève ValueError si le curseur est invalide.
+        """
+        users, next_key = self.repository.find_page(limit, decode_cursor(cursor), exclude_deleted=True)
+        user_responses = [UserResponse.from_model(self._with_pending(user)) for user in users]
+        return UserListResponse(users=user_responses, total=len(user_responses)), encode_cursor(next_key)
+
     def get_user_by_id(self, user_id: str) -> Optional[UserResponse]:
         """Récupère un utilisateur par son ID"""
-        user = self.repository.find_by_id(user_id)
+        user = self._with_pending(self.repository.find_by_id(user_id))
         if user and not user.is_deleted:
             return UserResponse.from_model(user)
         return None
 
+    def get_users_by_ids(
+        self,
+        user_ids: List[str],
+        fields: Optional[List[str]] = None
+    ) -> tuple[bool, str, Optional[dict]]:
+        """
+        Récupère plusieurs utilisateurs en une seule lecture du repository.
+        fields restreint les champs renvoyés (user_id est toujours inclus).
+        Returns: (success, message, {"users": [...] dans l'ordre des IDs, "not_found": [...]})
+        """
+        if fields is not None:
+            unknown = sorted(set(fields) - set(UserResponse.__dataclass_fields__))
+            if unknown:
+                return False, f"Champs inconnus : {', '.join(unknown)}", None
+
+        users = self.repository.find_by_ids(user_ids)
+        found, not_found = [], []
+        for user_id in dict.fromkeys(user_ids):
+            user = self._with_pending(users.get(user_id))
+            if not user or user.is_deleted:
+                not_found.append(user_id)
+                continue
+            user_dict = UserResponse.from_model(user).to_dict()
+            if fields is not None:
+                user_dict = {key: user_dict[key] for key in ('user_id', *fields)}
+            found.append(user_dict)
+        return True, f"{len(found)} utilisateur(s) trouvé(s)", {"users": found, "not_found": not_found}
+
     def get_user_by_email(self, email: str) -> Optional[UserResponse]:
         """Récupère un utilisateur par son email"""
-        user = self.repository.find_by_email(email)
+        user = self._with_pending(self.repository.find_by_email(email))
         if user and not user.is_deleted:
             return UserResponse.from_model(user)
         return None
 
     def get_user_by_phone(self, phone_number: str) -> Optional[UserResponse]:
         """Récupère un utilisateur par son numéro de téléphone"""
-        user = self.repository.find_by_phone(phone_number)
+        user = self._with_pending(self.repository.find_by_phone(phone_number))
         if user and not user.is_deleted:
             return UserResponse.from_model(user)
         return None
 
-    def update_user(self, user_id: str, request_dto: UpdateUserRequest) -> tuple[bool, str, Optional[UserResponse]]:
+    @staticmethod
+    def _version_conflict_message(version: int) -> str:
+        """Message d'échec d'une mise à jour basée sur une version périmée (If-Match)"""
+        return f"L'utilisateur a été modifié entre-temps (version actuelle : {version})"
+
+    def update_user(
+        self,
+        user_id: str,
+        request_dto: UpdateUserRequest,
+        expected_version: Optional[int] = None
+    ) -> tuple[bool, str, Optional[UserResponse]]:
         """
-        Met à jour un utilisateur
+        Met à jour un utilisateur.
+        expected_version (en-tête If-Match) : la mise à jour échoue si la version
+        de l'utilisateur a changé depuis.
         Returns: (success, message, user_response)
         """
         # Validation du DTO
@@ -88,6 +163,8 @@ class UserService:
         existing_user = self.repository.find_by_id(user_id)
         if not existing_user or existing_user.is_deleted:
             return False, "Utilisateur non trouvé", None
+        if expected_version is not None and existing_user.version != expected_version:
+            return False, self._version_conflict_message(existing_user.version), None
 
         # Prépare les données à mettre à jour
         user_data = request_dto.to_dict()
@@ -103,21 +180,25 @@ class UserService:
         # Vérifie l'unicité de l'email si modifié
         if 'email' in user_data and user_data['email'] != existing_user.email:
             email_exists = self.repository.find_by_email(user_data['email'])
-            if email_exists:
+            if email_exists and email_exists.user_id != user_id:
                 return False, "Cet email est déjà utilisé", None
 
         # Vérifie l'unicité du téléphone si modifié
         if 'phone_number' in user_data and user_data['phone_number'] != existing_user.phone_number:
             phone_exists = self.repository.find_by_phone(user_data['phone_number'])
-            if phone_exists:
+            if phone_exists and phone_exists.user_id != user_id:
                 return False, "Ce numéro de téléphone est déjà utilisé", None
 
         user = UserModel.from_dict(user_data)
-        updated_user = self.repository.update(user_id, user)
+        # La version lue sert de garde : une modification concurrente fait échouer l'écriture
+        updated_user = self.repository.update(user_id, user, expected_version=existing_user.version)
 
         if updated_user:
             user_response = UserResponse.from_model(updated_user)
             return True, "Utilisateur mis à jour avec succès", user_response
+        current = self.repository.find_by_id(user_id)
+        if current:
+            return False, self._version_conflict_message(current.version), None
         return False, "Erreur lors de la mise à jour", None
 
     def delete_user(self, user_id: str) -> tuple[bool, str]:
@@ -158,9 +239,12 @@ class UserService:
         if not check_password_hash(user.password, request_dto.password):
             return False, "Identifiants incorrects", None
 
-        # Met à jour la date de dernière connexion
+        # Met à jour la date de dernière connexion (en différé si un tampon est configuré)
         user.last_login = datetime.utcnow().isoformat()
-        self.repository.update(user.user_id, user)
+        if self.metadata_buffer:
+            self.metadata_buffer.record(user.user_id, last_login=user.last_login)
+        else:
+            self.repository.update(user.user_id, user)
 
         # Génère les tokens JWT (access + refresh)
         access_token, refresh_token = generate_tokens(user.user_id, user.email)
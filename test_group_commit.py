@@ -0,0 +1,90 @@
+# Test du regroupement des ecritures (GroupCommitter)
+# Verifie qu'un ecrivain seul n'attend pas la fenetre, que des ecrivains
+# concurrents partagent une seule ecriture et qu'un echec d'ecriture est
+# renvoye a chaque appelant du lot
+
+import threading
+import time
+
+from utils.group_commit import GroupCommitter, apply_operations
+
+WRITERS = 8
+
+
+class BlockingCommit:
+    """commit() dont le premier appel attend qu'on le libere, pour accumuler un lot derriere lui"""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.batches = []
+        self.release = threading.Event()
+
+    def __call__(self, operations):
+        self.batches.append(len(operations))
+        if len(self.batches) == 1:
+            self.release.wait(5)
+        elif self.error is not None:
+            raise self.error
+        outcomes, _ = apply_operations(operations)
+        return outcomes
+
+
+def run_writers(committer: GroupCommitter, commit: BlockingCommit) -> list:
+    """Un premier ecrivain bloque l'ecriture, WRITERS autres attendent en file puis sont liberes"""
+    results = []
+
+    def writer(value):
+        try:
+            results.append(committer.submit(lambda: (value, [])))
+        except Exception as error:
+            results.append(error)
+
+    first = threading.Thread(target=writer, args=(-1,))
+    first.start()
+    while not commit.batches:
+        time.sleep(0.001)
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    while len(committer._queue) < WRITERS:
+        time.sleep(0.001)
+    commit.release.set()
+    for thread in [first] + threads:
+        thread.join(5)
+    return results
+
+
+def test_single_writer_does_not_wait():
+    committer = GroupCommitter(lambda operations: apply_operations(operations)[0], window=2, max_batch=64)
+    start = time.monotonic()
+    assert committer.submit(lambda: ("ok", [])) == "ok"
+    assert time.monotonic() - start < 1
+    print("✅ un ecrivain seul est acquitte sans attendre la fenetre")
+
+
+def test_concurrent_writers_share_one_commit():
+    commit = BlockingCommit()
+    committer = GroupCommitter(commit, window=2, max_batch=WRITERS)
+    results = run_writers(committer, commit)
+    assert commit.batches == [1, WRITERS]
+    assert sorted(results) == list(range(-1, WRITERS))
+    print("✅ ecrivains concurrents regroupes en une seule ecriture")
+
+
+def test_commit_failure_reaches_every_waiter():
+    commit = BlockingCommit(OSError("disque plein"))
+    committer = GroupCommitter(commit, window=2, max_batch=WRITERS)
+    results = run_writers(committer, commit)
+    assert commit.batches == [1, WRITERS]
+    errors = [result for result in results if isinstance(result, OSError)]
+    assert len(errors) == WRITERS and -1 in results
+    print("✅ l'echec d'une ecriture est renvoye a chaque appelant du lot")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU REGROUPEMENT DES ECRITURES")
+    print("=" * 60)
+    test_single_writer_does_not_wait()
+    test_concurrent_writers_share_one_commit()
+    test_commit_failure_reaches_every_waiter()
@@ -0,0 +1,69 @@
+# Test des ETags et reponses 304 (If-None-Match) des GET de missions et de /auth/me
+# Verifie qu'une reponse inchangee donne 304 sans corps, et qu'une ecriture,
+# d'autres parametres ou un autre utilisateur donnent un nouvel ETag
+
+from testing_app import BACKENDS, PASSWORD, app_client, mission_body, register_user
+
+
+def test_mission_lists_not_modified():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            headers, user_id = register_user(client, 1)
+            client.post("/api/missions/", json=mission_body(user_id, publish=True), headers=headers)
+
+            for url in ("/api/missions/", "/missions/", "/api/missions/changes?since=0"):
+                response = client.get(url)
+                etag = response.headers["ETag"]
+                assert response.status_code == 200 and etag.startswith('W/"')
+
+                not_modified = client.get(url, headers={"If-None-Match": etag})
+                assert not_modified.status_code == 304
+                assert not_modified.get_data() == b""
+                assert not_modified.headers["ETag"] == etag
+
+            # Autres parametres : autre ETag
+            etag = client.get("/api/missions/").headers["ETag"]
+            response = client.get("/api/missions/?limit=1", headers={"If-None-Match": etag})
+            assert response.status_code == 200 and response.headers["ETag"] != etag
+
+            # Une ecriture change la version des donnees
+            client.post("/api/missions/", json=mission_body(user_id, "Autre mission"), headers=headers)
+            response = client.get("/api/missions/", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert len(response.get_json()["data"]) == 2
+    print("✅ listes de missions : 304 tant que rien ne change, 200 apres une ecriture")
+
+
+def test_etag_depends_on_user():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            first, _ = register_user(client, 1)
+            second, _ = register_user(client, 2)
+            etag = client.get("/api/missions/me", headers=first).headers["ETag"]
+            assert client.get("/api/missions/me", headers={**first, "If-None-Match": etag}).status_code == 304
+            assert client.get("/api/missions/me", headers={**second, "If-None-Match": etag}).status_code == 200
+    print("✅ l'ETag d'un utilisateur ne vaut pas pour un autre")
+
+
+def test_profile_not_modified():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            headers, _ = register_user(client, 1)
+            response = client.get("/auth/me", headers=headers)
+            etag = response.headers["ETag"]
+            assert client.get("/auth/me", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+            # Nouvelle connexion : last_login change (meme s'il n'est pas encore ecrit)
+            client.post("/auth/login", json={"email": "user1@example.com", "password": PASSWORD})
+            response = client.get("/auth/me", headers={**headers, "If-None-Match": etag})
+            assert response.status_code == 200 and response.headers["ETag"] != etag
+    print("✅ /auth/me : 304 tant que le profil ne change pas")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DES ETAGS (IF-NONE-MATCH)")
+    print("=" * 60)
+    test_mission_lists_not_modified()
+    test_etag_depends_on_user()
+    test_profile_not_modified()
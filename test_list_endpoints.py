@@ -0,0 +1,117 @@
+# Test des listes d'utilisateurs et de missions via le client de test Flask
+# Verifie les reponses streamees (?stream=json|ndjson) lues jusqu'au bout,
+# le parcours des pages (?limit=&cursor=) et les parametres invalides (400),
+# sur les stockages json et sqlite
+
+import json
+
+from testing_app import BACKENDS, app_client, mission_body, register_user
+
+# Listes testees : (URL, extraction des elements de data, cle d'identifiant)
+LISTS = (
+    ("/users/all", lambda data: data["users"], "user_id"),
+    ("/api/missions/", lambda data: data, "id"),
+    ("/missions/", lambda data: data, "id"),
+)
+
+
+def populate(client) -> dict:
+    """Trois utilisateurs et cinq missions. Retourne les IDs attendus par liste."""
+    user_ids = set()
+    for n in range(3):
+        headers, user_id = register_user(client, n)
+        user_ids.add(user_id)
+    mission_ids = set()
+    for n in range(5):
+        response = client.post("/api/missions/", json=mission_body(user_id, f"Mission {n}", publish=n % 2 == 0),
+                               headers=headers)
+        assert response.status_code == 201
+        mission_ids.add(response.get_json()["data"]["id"])
+    return {"/users/all": user_ids, "/api/missions/": mission_ids, "/missions/": mission_ids}
+
+
+def follow_pages(client, url: str, items, key: str, limit: int = 2) -> list:
+    """Parcourt toutes les pages d'une liste en suivant next_cursor"""
+    ids, cursor = [], None
+    while True:
+        query = f"?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url + query).get_json()
+        assert body["success"]
+        page = items(body["data"])
+        assert len(page) <= limit
+        ids.extend(item[key] for item in page)
+        pagination = body["pagination"]
+        assert pagination["limit"] == limit
+        if not pagination["has_more"]:
+            assert pagination["next_cursor"] is None
+            return ids
+        cursor = pagination["next_cursor"]
+
+
+def test_users_ndjson_stream():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            user_ids = {register_user(client, n)[1] for n in range(3)}
+            response = client.get("/users/all?stream=ndjson")
+            assert response.status_code == 200
+            assert response.mimetype == "application/x-ndjson"
+            lines = response.get_data(as_text=True).splitlines()
+            users = [json.loads(line) for line in lines]
+            assert {user["user_id"] for user in users} == user_ids
+            assert all("password" not in user for user in users)
+    print("✅ /users/all?stream=ndjson lu jusqu'au bout")
+
+
+def test_streamed_lists():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            expected = populate(client)
+            for url, items, key in LISTS:
+                response = client.get(url + "?stream=json")
+                assert response.status_code == 200
+                body = json.loads(response.get_data(as_text=True))
+                assert body["success"]
+                assert {item[key] for item in items(body["data"])} == expected[url]
+
+                response = client.get(url + "?stream=ndjson")
+                assert response.status_code == 200
+                lines = response.get_data(as_text=True).splitlines()
+                assert {json.loads(line)[key] for line in lines} == expected[url]
+    print("✅ listes streamees (json, ndjson) completes")
+
+
+def test_cursor_pagination():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            expected = populate(client)
+            for url, items, key in LISTS:
+                ids = follow_pages(client, url, items, key)
+                assert len(ids) == len(set(ids)) and set(ids) == expected[url]
+                # Une page demandee en streaming a le meme contenu
+                first = client.get(url + "?limit=2").get_json()
+                streamed = json.loads(client.get(url + "?limit=2&stream=json").get_data(as_text=True))
+                assert items(streamed["data"]) == items(first["data"])
+                assert streamed["pagination"] == first["pagination"]
+    print("✅ pages suivies jusqu'a la derniere, sans doublon ni oubli")
+
+
+def test_invalid_list_parameters():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            populate(client)
+            for url, _, _ in LISTS:
+                for query in ("?limit=0", "?limit=abc", "?limit=100000", "?limit=2&cursor=invalide", "?stream=xml"):
+                    response = client.get(url + query)
+                    assert response.status_code == 400, (url, query)
+                    assert response.get_json()["success"] is False
+    print("✅ limit, cursor ou stream invalides refuses (400)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DES LISTES (STREAMING ET PAGINATION)")
+    print("=" * 60)
+    test_users_ndjson_stream()
+    test_streamed_lists()
+    test_cursor_pagination()
+    test_invalid_list_parameters()
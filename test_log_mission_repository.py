@@ -0,0 +1,77 @@
+# Test du stockage des missions en journal (STORAGE_BACKEND = "log")
+# Verifie le rejeu du journal, la compaction et la reprise apres un arret
+# pendant un ajout (fin de journal tronquee)
+
+import os
+import tempfile
+
+from models.mission_model import MissionModel
+from repositories.log_mission_repository import LogMissionRepository
+
+
+def make_mission(title: str) -> MissionModel:
+    """Mission minimale pour les tests"""
+    return MissionModel.from_dict({
+        "title": title,
+        "description": "Mission de test",
+        "type_code": "CLEANING",
+        "location": {"country": "GN", "city": "Conakry", "neighborhood": "Kaloum"},
+        "budget": 100,
+        "publisher_id": "publisher",
+        "status": "DRAFT",
+        "work_days": [{"day": "2030-01-01", "start_time": "08:00:00", "end_time": "12:00:00"}]
+    })
+
+
+def open_repository(data_file: str) -> LogMissionRepository:
+    """Ouvre le journal sans compaction en arriere-plan"""
+    return LogMissionRepository(data_file, compaction_interval=None)
+
+
+def test_replay_and_compaction():
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "missions.json")
+        repository = open_repository(data_file)
+        first = repository.create(make_mission("Premiere"))
+        second = repository.create(make_mission("Seconde"))
+        second.title = "Seconde modifiee"
+        repository.update(second)
+
+        reopened = open_repository(data_file)
+        assert {m.id: m.title for m in reopened.find_all()} == {first.id: "Premiere", second.id: "Seconde modifiee"}
+        assert reopened.find_by_id(second.id).version == 2
+
+        assert reopened.compact()
+        assert os.path.getsize(data_file + ".log") == 0
+        assert open_repository(data_file).find_by_id(second.id).title == "Seconde modifiee"
+        print("✅ journal rejoue a l'ouverture, compaction sans perte")
+
+
+def test_torn_tail_recovery():
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "missions.json")
+        before = open_repository(data_file).create(make_mission("Avant l'arret"))
+
+        # Arret pendant un ajout : derniere ligne incomplete
+        with open(data_file + ".log", "ab") as f:
+            f.write(b'{"op": "put", "mission": {"id": "tronquee", "tit')
+
+        recovered = open_repository(data_file)
+        assert recovered.find_by_id("tronquee") is None
+        after = recovered.create(make_mission("Apres l'arret"))
+
+        reopened = open_repository(data_file)
+        assert reopened.find_by_id(before.id) is not None
+        assert reopened.find_by_id(after.id) is not None, "mission creee apres l'arret perdue"
+        assert reopened.find_by_id("tronquee") is None
+        with open(data_file + ".log", "rb") as f:
+            assert f.read().endswith(b"\n")
+        print("✅ fin de journal tronquee supprimee avant le premier ajout")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU STOCKAGE EN JOURNAL DES MISSIONS")
+    print("=" * 60)
+    test_replay_and_compaction()
+    test_torn_tail_recovery()
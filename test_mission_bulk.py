@@ -0,0 +1,80 @@
+# Test de la creation en masse (POST /api/missions/bulk)
+# Verifie les corps JSON et NDJSON, les elements invalides signales par leur
+# position, l'ecriture unique par requete et les refus (400, 401)
+
+import json
+
+import controllers.mission_controller as mission_controller
+from testing_app import BACKENDS, app_client, mission_body, register_user
+
+
+def data_version(client) -> int:
+    """Version des missions (data.version de /changes)"""
+    return client.get("/api/missions/changes?since=0").get_json()["data"]["version"]
+
+
+def test_bulk_json_array():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            headers, user_id = register_user(client, 1)
+            invalid = {**mission_body(user_id), "title": ""}
+            items = [mission_body(user_id, "Premiere", publish=True), invalid, "pas un objet", mission_body(user_id, "Seconde")]
+            before = data_version(client)
+
+            response = client.post("/api/missions/bulk", json=items, headers=headers)
+            assert response.status_code == 201
+            body = response.get_json()
+            assert [m["title"] for m in body["data"]] == ["Premiere", "Seconde"]
+            assert [m["status"] for m in body["data"]] == ["PUBLISHED", "DRAFT"]
+            assert [error["index"] for error in body["errors"]] == [1, 2]
+            # Une seule ecriture pour tout le lot
+            assert data_version(client) == before + 1
+
+            listed = client.get("/api/missions/").get_json()["data"]
+            assert {m["id"] for m in listed} == {m["id"] for m in body["data"]}
+    print("✅ tableau JSON : missions valides creees en une ecriture, erreurs par position")
+
+
+def test_bulk_ndjson():
+    with app_client() as client:
+        headers, user_id = register_user(client, 1)
+        lines = [json.dumps(mission_body(user_id, f"Mission {n}")) for n in range(3)]
+        lines.insert(1, "{ligne illisible")
+        response = client.post("/api/missions/bulk", data="\n".join(lines) + "\n",
+                               content_type="application/x-ndjson", headers=headers)
+        assert response.status_code == 201
+        body = response.get_json()
+        assert len(body["data"]) == 3
+        assert [error["index"] for error in body["errors"]] == [1]
+    print("✅ NDJSON : une mission par ligne, ligne illisible signalee")
+
+
+def test_bulk_rejected():
+    with app_client() as client:
+        headers, user_id = register_user(client, 1)
+        assert client.post("/api/missions/bulk", json=[mission_body(user_id)]).status_code == 401
+        assert client.post("/api/missions/bulk", json={"title": "pas un tableau"}, headers=headers).status_code == 400
+        assert client.post("/api/missions/bulk", json=[], headers=headers).status_code == 400
+
+        response = client.post("/api/missions/bulk", json=[{"title": ""}], headers=headers)
+        assert response.status_code == 400
+        assert response.get_json()["errors"][0]["index"] == 0
+
+        limit = mission_controller.BULK_MAX_MISSIONS
+        mission_controller.BULK_MAX_MISSIONS = 2
+        try:
+            response = client.post("/api/missions/bulk", json=[mission_body(user_id)] * 3, headers=headers)
+        finally:
+            mission_controller.BULK_MAX_MISSIONS = limit
+        assert response.status_code == 400
+        assert client.get("/api/missions/").get_json()["data"] == []
+    print("✅ corps invalide, vide, sans mission valide ou trop grand refuse")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA CREATION EN MASSE")
+    print("=" * 60)
+    test_bulk_json_array()
+    test_bulk_ndjson()
+    test_bulk_rejected()
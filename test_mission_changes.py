@@ -0,0 +1,65 @@
+# Test de la synchronisation differentielle (GET /api/missions/changes?since=)
+# Verifie le premier appel complet, les appels suivants limites aux missions
+# modifiees (une seule fois chacune, dans leur etat courant) et les erreurs 400
+
+from testing_app import BACKENDS, app_client, mission_body, register_user
+
+
+def changes(client, since: int) -> dict:
+    """data de /changes pour since"""
+    response = client.get(f"/api/missions/changes?since={since}")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["success"]
+    assert body["data"]["total"] == len(body["data"]["missions"])
+    return body["data"]
+
+
+def test_delta_sync():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            headers, user_id = register_user(client, 1)
+            worker, _ = register_user(client, 2)
+            created = [
+                client.post("/api/missions/", json=mission_body(user_id, f"Mission {n}"), headers=headers).get_json()["data"]
+                for n in range(3)
+            ]
+
+            full = changes(client, 0)
+            assert full["full"] is True
+            assert {m["id"] for m in full["missions"]} == {m["id"] for m in created}
+            version = full["version"]
+
+            # Rien de nouveau
+            empty = changes(client, version)
+            assert empty["missions"] == [] and empty["full"] is False and empty["version"] == version
+
+            # Une mission publiee puis acceptee est renvoyee une fois, dans son etat courant
+            mission_id = created[1]["id"]
+            assert client.post(f"/api/missions/{mission_id}/publish", headers=headers).status_code == 200
+            assert client.post(f"/api/missions/{mission_id}/accept", headers=worker).status_code == 200
+            delta = changes(client, version)
+            assert delta["full"] is False and delta["version"] > version
+            assert [(m["id"], m["status"]) for m in delta["missions"]] == [(mission_id, "ASSIGNED")]
+
+            # Version inconnue (superieure a la version courante) : tout est renvoye
+            unknown = changes(client, delta["version"] + 100)
+            assert unknown["full"] is True and len(unknown["missions"]) == 3
+    print("✅ /changes : complet au premier appel, puis seulement les missions modifiees")
+
+
+def test_invalid_since():
+    with app_client() as client:
+        for since in ("-1", "abc", "1.5"):
+            response = client.get(f"/api/missions/changes?since={since}")
+            assert response.status_code == 400, since
+            assert response.get_json()["success"] is False
+    print("✅ since invalide refuse (400)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA SYNCHRONISATION DIFFERENTIELLE")
+    print("=" * 60)
+    test_delta_sync()
+    test_invalid_since()
@@ -0,0 +1,81 @@
+# Test du flux temps reel des missions (evenements du bus)
+# Verifie qu'une ecriture est diffusee une seule fois dans son processus et
+# qu'elle est relayee aux abonnes d'un autre processus (autre repository sur
+# les memes fichiers)
+
+import os
+import tempfile
+
+from repositories.mission_repository import MissionRepository
+from services.mission_service import MissionService
+from utils.event_bus import EventBus
+
+
+def mission_data(title: str, publish: bool) -> dict:
+    """Donnees de creation d'une mission"""
+    return {
+        "title": title,
+        "description": "Nettoyage complet des bureaux",
+        "type_code": "CLEANING",
+        "location": {"country": "GN", "city": "Conakry", "neighborhood": "Kaloum"},
+        "budget": 150,
+        "publisher_id": "publisher",
+        "publish": publish,
+        "work_days": [{"day": "2030-01-01", "start_time": "08:00:00", "end_time": "12:00:00"}]
+    }
+
+
+def open_service(data_file: str) -> MissionService:
+    """Service d'un processus : son propre repository et son propre bus, sans relais periodique"""
+    return MissionService(MissionRepository(data_file), EventBus())
+
+
+def drain(subscription) -> list:
+    """Evenements deja en file (type, id de la mission)"""
+    received = []
+    for event in subscription.events(0.01):
+        if event is None:
+            break
+        received.append((event["type"], event["mission"]["id"]))
+    return received
+
+
+def test_local_write_is_published_once():
+    with tempfile.TemporaryDirectory() as directory:
+        service = open_service(os.path.join(directory, "missions.json"))
+        subscription = service.subscribe_events({})
+        success, _, draft = service.create_mission(mission_data("Brouillon", publish=False))
+        assert success
+        success, _, published = service.create_mission(mission_data("Publiee", publish=True))
+        assert success
+        assert service.relay_events() == 0
+        assert drain(subscription) == [("mission.published", published.id)]
+        print("✅ ecriture locale diffusee une seule fois, brouillons ignores")
+
+
+def test_other_process_writes_are_relayed():
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "missions.json")
+        writer = open_service(data_file)
+        reader = open_service(data_file)
+        subscription = reader.subscribe_events({"city": "Conakry"})
+
+        success, _, mission = writer.create_mission(mission_data("Publiee ailleurs", publish=True))
+        assert success
+        success, _, _ = writer.accept_mission(mission.id, "worker")
+        assert success
+        assert drain(subscription) == []
+
+        assert reader.relay_events() == 1
+        # Publication puis acceptation lues ensemble : seul l'etat courant est relaye
+        assert drain(subscription) == [("mission.accepted", mission.id)]
+        assert reader.relay_events() == 0
+        print("✅ ecritures d'un autre processus relayees aux abonnes")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU FLUX TEMPS REEL DES MISSIONS")
+    print("=" * 60)
+    test_local_write_is_published_once()
+    test_other_process_writes_are_relayed()
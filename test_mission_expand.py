@@ -0,0 +1,94 @@
+# Test des utilisateurs inclus dans les missions (?expand=publisher,worker)
+# Verifie les resumes d'utilisateurs sur la liste, le detail, la recherche et
+# le streaming, l'ETag qui suit les modifications d'utilisateurs et les 400
+
+import json
+
+from testing_app import BACKENDS, app_client, mission_body, register_user, user_body
+
+SUMMARY_FIELDS = {"user_id", "first_name", "last_name", "photo_url"}
+
+
+def test_expand_publisher_and_worker():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            publisher, publisher_id = register_user(client, 1)
+            worker, worker_id = register_user(client, 2)
+            open_mission = client.post("/api/missions/", json=mission_body(publisher_id, "Ouverte", publish=True),
+                                       headers=publisher).get_json()["data"]
+            taken = client.post("/api/missions/", json=mission_body(publisher_id, "Prise", publish=True),
+                                headers=publisher).get_json()["data"]
+            assert client.post(f"/api/missions/{taken['id']}/accept", headers=worker).status_code == 200
+
+            response = client.get("/api/missions/?expand=publisher,worker")
+            assert response.status_code == 200
+            missions = {m["id"]: m for m in response.get_json()["data"]}
+            for mission in missions.values():
+                assert set(mission["publisher"]) == SUMMARY_FIELDS
+                assert mission["publisher"]["user_id"] == publisher_id
+                assert mission["publisher"]["first_name"] == "Prenom1"
+            assert missions[open_mission["id"]]["worker"] is None
+            assert missions[taken["id"]]["worker"]["user_id"] == worker_id
+
+            # Sans expand, aucun champ ajoute
+            plain = client.get("/api/missions/").get_json()["data"]
+            assert all("publisher" not in m and "worker" not in m for m in plain)
+
+            detail = client.get(f"/api/missions/{taken['id']}?expand=worker").get_json()["data"]
+            assert detail["worker"]["first_name"] == "Prenom2" and "publisher" not in detail
+
+            found = client.post("/api/missions/search?expand=publisher", json={"city": "Conakry"}).get_json()["data"]
+            assert len(found) == 2 and all(m["publisher"]["user_id"] == publisher_id for m in found)
+
+            lines = client.get("/missions/?expand=publisher&stream=ndjson").get_data(as_text=True).splitlines()
+            assert [json.loads(line)["publisher"]["user_id"] for line in lines] == [publisher_id] * 2
+    print("✅ resumes publisher / worker sur la liste, le detail, la recherche et le streaming")
+
+
+def test_expand_etag_follows_users():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            publisher, publisher_id = register_user(client, 1)
+            mission = client.post("/api/missions/", json=mission_body(publisher_id), headers=publisher).get_json()["data"]
+            for url in ("/api/missions/?expand=publisher", f"/api/missions/{mission['id']}?expand=publisher"):
+                etag = client.get(url).headers["ETag"]
+                assert etag.startswith('W/"')
+                assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+            list_etag = client.get("/api/missions/?expand=publisher").headers["ETag"]
+            detail_url = f"/api/missions/{mission['id']}?expand=publisher"
+            detail_etag = client.get(detail_url).headers["ETag"]
+            # Le detail avec et sans expand n'a pas le meme ETag
+            assert client.get(f"/api/missions/{mission['id']}").headers["ETag"] != detail_etag
+
+            # Modifier le publieur change la reponse, sans ecriture sur les missions
+            assert client.put(f"/users/{publisher_id}", json=user_body(1, "Renomme")).status_code == 200
+            response = client.get("/api/missions/?expand=publisher", headers={"If-None-Match": list_etag})
+            assert response.status_code == 200
+            assert response.get_json()["data"][0]["publisher"]["first_name"] == "Renomme"
+            response = client.get(detail_url, headers={"If-None-Match": detail_etag})
+            assert response.status_code == 200
+            assert response.get_json()["data"]["publisher"]["first_name"] == "Renomme"
+    print("✅ l'ETag avec expand suit les modifications des utilisateurs")
+
+
+def test_invalid_expand():
+    with app_client() as client:
+        publisher, publisher_id = register_user(client, 1)
+        mission = client.post("/api/missions/", json=mission_body(publisher_id), headers=publisher).get_json()["data"]
+        for url in ("/api/missions/?expand=foo", "/api/missions/?expand=publisher,password",
+                    f"/api/missions/{mission['id']}?expand=foo", "/missions/?expand=foo"):
+            response = client.get(url)
+            assert response.status_code == 400, url
+            assert response.get_json()["success"] is False
+        assert client.post("/api/missions/search?expand=foo", json={}).status_code == 400
+    print("✅ valeurs de expand inconnues refusees (400)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DES UTILISATEURS INCLUS (EXPAND)")
+    print("=" * 60)
+    test_expand_publisher_and_worker()
+    test_expand_etag_follows_users()
+    test_invalid_expand()
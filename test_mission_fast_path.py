@@ -0,0 +1,128 @@
+# Test du chemin de lecture rapide des missions
+# Verifie que les listes servies directement depuis les donnees stockees
+# sont identiques octet par octet a celles construites via MissionModel / MissionDisplayDto
+
+import json
+import os
+import tempfile
+
+from flask import Flask
+
+from models.mission_model import MissionModel
+from repositories.mission_repository import MissionRepository
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_mission_repository import SqliteMissionRepository
+from services.mission_service import MissionService, MISSION_TYPES
+
+# Encodeur JSON de Flask (celui utilise par jsonify)
+json_provider = Flask(__name__).json
+
+WORK_DAY = {"day": "2025-12-01", "start_time": "09:00:00", "end_time": "17:00:00"}
+
+
+def sample_missions():
+    """Missions couvrant les cas particuliers des donnees stockees"""
+    missions = []
+    for index, type_code in enumerate(list(MISSION_TYPES) + ["INCONNU", ""]):
+        missions.append({
+            "id": f"mission-{index}",
+            "title": f"Mission {index} - reparation d'ete",
+            "description": "Description avec accents : deja, ete, garcon, élève",
+            "type_code": type_code,
+            "location": {"country": "Guinee", "city": "Conakry", "neighborhood": "Kaloum"},
+            "budget": 1500 + index * 250.5,
+            "publisher_id": f"user-{index % 3}",
+            "status": ["DRAFT", "PUBLISHED", "ASSIGNED", "COMPLETED"][index % 4],
+            "work_days": [WORK_DAY] * (index % 3),
+            "created_at": f"2025-01-{index + 1:02d}T10:00:00",
+            "updated_at": None
+        })
+    missions[1]["worker_id"] = "user-9"
+    missions[2]["worker_id"] = ""
+    missions.append({"id": "mission-incomplete", "created_at": "2025-02-01T00:00:00"})
+    missions.append({
+        "id": "mission-partial-location",
+        "title": "Livraison",
+        "type_code": "DELIVERY",
+        "location": {"city": "Dakar"},
+        "budget": "2500",
+        "work_days": [{"day": "2025-03-01"}],
+        "created_at": "2025-02-02T00:00:00",
+        "extra_field": "ignore"
+    })
+    return missions
+
+
+def slow_path(service, missions):
+    """Chemin complet : dict -> MissionModel -> MissionDisplayDto -> dict"""
+    return [service._to_display_dto(MissionModel.from_dict(m)).to_dict() for m in missions]
+
+
+def assert_identical(expected, actual, label):
+    """Compare les encodages JSON (jsonify et json.dumps) octet par octet"""
+    assert json_provider.dumps(expected) == json_provider.dumps(actual), label
+    assert json.dumps(expected) == json.dumps(actual), label
+    print(f"✅ {label} : {len(actual)} mission(s) identiques")
+
+
+def check_service(service):
+    """Compare chemin rapide et chemin complet sur liste, pages et recherche"""
+    records = list(service.repository.iter_records())
+    assert_identical(slow_path(service, records), list(service.iter_all_missions_data()), "liste complete")
+    assert_identical([m.to_dict() for m in service.get_all_missions()], list(service.iter_all_missions_data()), "get_all_missions")
+
+    page, cursor = service.get_missions_page_data(4)
+    models, _ = service.repository.find_page(4)
+    assert_identical(slow_path(service, [m.to_dict() for m in models]), page, "premiere page")
+    page, _ = service.get_missions_page_data(4, cursor)
+    models, _ = service.repository.find_page(4, (models[-1].created_at, models[-1].id))
+    assert_identical(slow_path(service, [m.to_dict() for m in models]), page, "page suivante")
+
+    for filters in ({}, {"status": "PUBLISHED"}, {"sort": "-budget"}, {"keywords": "reparation"}):
+        expected = [m.to_dict() for m in service.get_missions_by_filters(filters)]
+        assert_identical(expected, list(service.iter_missions_by_filters_data(filters)), f"recherche {filters}")
+
+    check_fragments(service)
+
+
+def check_fragments(service):
+    """Les fragments en cache sont identiques a l'encodage de jsonify et invalides a la modification"""
+    expected = [json_provider.dumps(m, separators=(',', ':')) for m in service.iter_all_missions_data()]
+    assert list(service.iter_all_missions_json()) == expected
+    assert list(service.iter_all_missions_json()) == expected
+    assert service.fragments.get_stats()["hits"] >= len(expected)
+
+    mission = service.repository.find_by_id("mission-1")
+    mission.title = "Titre modifie"
+    service.repository.update(mission)
+    assert service.fragments.get_stats()["invalidations"] == 1
+    fragments = {json.loads(f)["id"]: f for f in service.iter_all_missions_json()}
+    assert json.loads(fragments["mission-1"])["title"] == "Titre modifie"
+    page, _ = service.get_missions_page_json(3)
+    assert page == [json_provider.dumps(m, separators=(',', ':')) for m in service.get_missions_page_data(3)[0]]
+    print(f"✅ fragments JSON en cache : {len(expected)} mission(s), invalidation a la mise a jour")
+
+
+def test_fast_path_json_repository():
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "missions.json")
+        with open(data_file, "w", encoding="utf-8") as f:
+            json.dump(sample_missions(), f, ensure_ascii=False)
+        check_service(MissionService(MissionRepository(data_file)))
+
+
+def test_fast_path_sqlite_repository():
+    with tempfile.TemporaryDirectory() as directory:
+        repository = SqliteMissionRepository(SqliteDatabase(os.path.join(directory, "eqos.db")))
+        repository.import_records(sample_missions())
+        check_service(MissionService(repository))
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU CHEMIN DE LECTURE RAPIDE DES MISSIONS")
+    print("=" * 60)
+    print("\nStockage JSON")
+    test_fast_path_json_repository()
+    print("\nStockage SQLite")
+    test_fast_path_sqlite_repository()
@@ -0,0 +1,67 @@
+# Test de la recherche par mots-cles des missions
+# Verifie que le stockage JSON (TextIndex), SQLite avec FTS5 et SQLite sans
+# FTS5 trouvent les memes missions (accents ignores, tous les termes requis)
+
+import os
+import tempfile
+
+from dto.mission import MissionFilterDto
+from models.mission_model import MissionModel
+from repositories.mission_repository import MissionRepository
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_mission_repository import SqliteMissionRepository
+
+MISSIONS = (
+    ("Réparation de fuite", "Plombier pour une fuite dans la cuisine"),
+    ("Reparation toiture", "Tuiles cassées après l'orage"),
+    ("Ménage des bureaux", "Nettoyage complet, vitres comprises"),
+    ("Cours de maths", "Élève de terminale, préparation du BAC"),
+)
+
+QUERIES = ("reparation", "RÉPARATION fuite", "fuite toiture", "eleve bac", "vitres nettoyage", "de la", "cuisine")
+
+
+def make_mission(title: str, description: str) -> MissionModel:
+    """Mission minimale pour les tests"""
+    return MissionModel.from_dict({
+        "title": title,
+        "description": description,
+        "type_code": "OTHER",
+        "location": {"country": "GN", "city": "Conakry", "neighborhood": "Kaloum"},
+        "budget": 100,
+        "publisher_id": "publisher",
+        "status": "PUBLISHED",
+        "work_days": []
+    })
+
+
+def titles(repository, keywords: str) -> set:
+    """Titres des missions trouvees pour les mots-cles"""
+    return {m.title for m in repository.find_by_filters(MissionFilterDto(keywords=keywords))}
+
+
+def test_keywords_match_across_backends():
+    with tempfile.TemporaryDirectory() as directory:
+        json_repository = MissionRepository(os.path.join(directory, "missions.json"))
+        fts_repository = SqliteMissionRepository(SqliteDatabase(os.path.join(directory, "fts.db")))
+        fallback_repository = SqliteMissionRepository(SqliteDatabase(os.path.join(directory, "fallback.db")))
+        # Base sans FTS5 : recherche de secours
+        fallback_repository._fts = False
+        for repository in (json_repository, fts_repository, fallback_repository):
+            for title, description in MISSIONS:
+                repository.create(make_mission(title, description))
+
+        for keywords in QUERIES:
+            expected = titles(json_repository, keywords)
+            if fts_repository._fts:
+                assert titles(fts_repository, keywords) == expected, keywords
+            assert titles(fallback_repository, keywords) == expected, keywords
+        assert titles(fallback_repository, "RÉPARATION fuite") == {"Réparation de fuite"}
+        print("✅ memes resultats par mots-cles en JSON, SQLite FTS5 et SQLite sans FTS5")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA RECHERCHE PAR MOTS-CLES")
+    print("=" * 60)
+    test_keywords_match_across_backends()
@@ -0,0 +1,72 @@
+# Test des versions par enregistrement et de la concurrence optimiste (If-Match)
+# Verifie l'ETag fort du detail d'une mission, le 409 d'une version perimee sur
+# publish / accept / complete et PUT /users/<id>, et le nouvel ETag apres succes
+
+from testing_app import BACKENDS, app_client, mission_body, register_user, user_body
+
+
+def test_mission_if_match():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            publisher, user_id = register_user(client, 1)
+            worker, _ = register_user(client, 2)
+            created = client.post("/api/missions/", json=mission_body(user_id), headers=publisher).get_json()["data"]
+            assert created["version"] == 1
+            url = f"/api/missions/{created['id']}"
+
+            response = client.get(url)
+            assert response.headers["ETag"] == '"1"'
+            assert client.get(url, headers={"If-None-Match": '"1"'}).status_code == 304
+
+            assert client.post(url + "/publish", headers={**publisher, "If-Match": "pas-un-etag"}).status_code == 400
+            stale = client.post(url + "/publish", headers={**publisher, "If-Match": '"7"'})
+            assert stale.status_code == 409 and stale.get_json()["success"] is False
+            assert client.get(url).get_json()["data"]["status"] == "DRAFT"
+
+            published = client.post(url + "/publish", headers={**publisher, "If-Match": '"1"'})
+            assert published.status_code == 200
+            assert published.headers["ETag"] == '"2"'
+            assert published.get_json()["data"]["version"] == 2
+            assert client.get(url, headers={"If-None-Match": '"1"'}).status_code == 200
+
+            # Version lue avant la publication : perimee
+            assert client.post(url + "/accept", headers={**worker, "If-Match": '"1"'}).status_code == 409
+            accepted = client.post(f"/missions/{created['id']}/accept", headers={**worker, "If-Match": "*"})
+            assert accepted.status_code == 200
+            assert accepted.get_json()["data"]["worker_id"]
+
+            assert client.post(url + "/complete", headers={**publisher, "If-Match": '"2"'}).status_code == 409
+            completed = client.post(url + "/complete", headers={**publisher, "If-Match": '"3"'})
+            assert completed.status_code == 200
+            assert completed.get_json()["data"]["status"] == "COMPLETED"
+            assert completed.headers["ETag"] == '"4"'
+    print("✅ missions : 409 sur version perimee, ETag de la nouvelle version apres succes")
+
+
+def test_user_if_match():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            headers, user_id = register_user(client, 1)
+            assert client.get("/auth/me", headers=headers).get_json()["data"]["version"] == 1
+
+            stale = client.put(f"/users/{user_id}", json=user_body(1, "Perime"), headers={"If-Match": '"9"'})
+            assert stale.status_code == 409 and stale.get_json()["success"] is False
+
+            updated = client.put(f"/users/{user_id}", json=user_body(1, "Nouveau"), headers={"If-Match": '"1"'})
+            assert updated.status_code == 200
+            assert updated.headers["ETag"] == '"2"'
+            assert updated.get_json()["data"]["version"] == 2
+
+            assert client.put(f"/users/{user_id}", json=user_body(1, "Dernier"), headers={"If-Match": '"1"'}).status_code == 409
+            # Sans If-Match, la mise a jour passe et incremente la version
+            response = client.put(f"/users/{user_id}", json=user_body(1, "Dernier"))
+            assert response.status_code == 200 and response.get_json()["data"]["version"] == 3
+    print("✅ utilisateurs : 409 sur version perimee, version incrementee a chaque mise a jour")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA CONCURRENCE OPTIMISTE (IF-MATCH)")
+    print("=" * 60)
+    test_mission_if_match()
+    test_user_if_match()
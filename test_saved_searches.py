@@ -0,0 +1,91 @@
+# Test des recherches sauvegardees
+# Verifie la validation des criteres, qu'une recherche invalide deja
+# enregistree n'empeche pas les autres d'etre notifiees et que la
+# suppression d'une recherche inconnue ne reecrit pas le fichier
+
+import os
+import tempfile
+
+from models.saved_search_model import SavedSearchModel
+from repositories.mission_repository import MissionRepository
+from repositories.saved_search_repository import SavedSearchRepository
+from services.mission_service import MissionService
+from services.saved_search_service import SavedSearchService
+
+
+def mission_data(title: str) -> dict:
+    """Mission publiee a la creation"""
+    return {
+        "title": title,
+        "description": "Nettoyage complet des bureaux",
+        "type_code": "CLEANING",
+        "location": {"country": "GN", "city": "Conakry", "neighborhood": "Kaloum"},
+        "budget": 150,
+        "publisher_id": "publisher",
+        "publish": True,
+        "work_days": [{"day": "2030-01-01", "start_time": "08:00:00", "end_time": "12:00:00"}]
+    }
+
+
+def open_service(directory: str) -> SavedSearchService:
+    """Service des recherches sur des fichiers temporaires, sans rattrapage en arriere-plan"""
+    missions = MissionService(MissionRepository(os.path.join(directory, "missions.json")))
+    return SavedSearchService(SavedSearchRepository(os.path.join(directory, "saved_searches.json")), missions)
+
+
+def test_filter_types_are_validated():
+    with tempfile.TemporaryDirectory() as directory:
+        service = open_service(directory)
+        for filters in ({"title": 123}, {"city": ["Conakry"]}, {"budget_min": "cent"}, {"budget_max": True}):
+            success, message, _ = service.create_search("user", {"filters": filters})
+            assert not success, filters
+        assert service.list_searches("user") == []
+
+        success, _, search = service.create_search("user", {"filters": {"city": "Conakry", "budget_min": 100}})
+        assert success and search["filters"] == {"city": "Conakry", "budget_min": 100.0}
+        print("✅ criteres de type invalide refuses")
+
+
+def test_invalid_stored_search_does_not_block_catch_up():
+    with tempfile.TemporaryDirectory() as directory:
+        service = open_service(directory)
+        success, _, search = service.create_search("user", {"filters": {"title": "nettoyage"}})
+        assert success
+        # Recherche enregistree avant la validation des types
+        service.repository.create(SavedSearchModel(user_id="other", filters={"title": 123}))
+        service.repository.create(SavedSearchModel(user_id="other", filters={"budget_min": "cent"}))
+
+        success, _, mission = service.mission_service.create_mission(mission_data("Nettoyage de bureaux"))
+        assert success
+
+        inbox = service.get_inbox("user", 10)
+        assert [item["mission_id"] for item in inbox] == [mission.id]
+        assert inbox[0]["search_id"] == search["id"]
+        assert service.get_inbox("other", 10) == []
+        print("✅ une recherche invalide n'empeche pas le rattrapage des autres")
+
+
+def test_delete_unknown_search_does_not_write():
+    with tempfile.TemporaryDirectory() as directory:
+        service = open_service(directory)
+        success, _, search = service.create_search("user", {"filters": {"city": "Conakry"}})
+        assert success
+        data_file = service.repository.data_file
+        before = os.stat(data_file)
+
+        assert service.repository.delete("inconnue") is False
+        after = os.stat(data_file)
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+        assert service.repository.delete(search["id"]) is True
+        assert os.stat(data_file).st_ino != before.st_ino
+        print("✅ suppression d'une recherche inconnue sans reecriture du fichier")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DES RECHERCHES SAUVEGARDEES")
+    print("=" * 60)
+    test_filter_types_are_validated()
+    test_invalid_stored_search_does_not_block_catch_up()
+    test_delete_unknown_search_does_not_write()
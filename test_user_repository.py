@@ -0,0 +1,78 @@
+# Test du repository des utilisateurs (fichier JSON et SQLite)
+# Verifie la recherche exacte par email et l'ordre de pagination apres rechargement
+
+import json
+import os
+import tempfile
+
+from models.user_model import UserModel
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_user_repository import SqliteUserRepository
+from repositories.user_repository import UserRepository
+
+
+def make_user(email: str, phone_number: str) -> UserModel:
+    """Utilisateur minimal pour les tests"""
+    return UserModel(
+        first_name="Awa",
+        last_name="Diallo",
+        birth_date="1990-01-01",
+        email=email,
+        phone_number=phone_number,
+        password="secret",
+        user_type="WORKER",
+        country="GN",
+        address="Kaloum"
+    )
+
+
+def check_exact_email(repository):
+    """Les emails qui ne different que par la casse restent distincts"""
+    upper = repository.create(make_user("Awa@Example.com", "+224600000001"))
+    lower = repository.create(make_user("awa@example.com", "+224600000002"))
+    assert repository.find_by_email("Awa@Example.com").user_id == upper.user_id
+    assert repository.find_by_email("awa@example.com").user_id == lower.user_id
+    assert repository.find_by_email("AWA@EXAMPLE.COM") is None
+
+
+def test_exact_email_json():
+    with tempfile.TemporaryDirectory() as directory:
+        check_exact_email(UserRepository(os.path.join(directory, "users.json")))
+        print("✅ recherche par email exacte (JSON)")
+
+
+def test_exact_email_sqlite():
+    with tempfile.TemporaryDirectory() as directory:
+        check_exact_email(SqliteUserRepository(SqliteDatabase(os.path.join(directory, "app.db"))))
+        print("✅ recherche par email exacte (SQLite)")
+
+
+def test_page_order_after_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "users.json")
+        users = []
+        for i in range(50):
+            user = make_user(f"user{i}@example.com", f"+2246000{i:05d}").to_dict(exclude_password=False)
+            user.update(user_id=f"user-{i:02d}", created_at=f"2030-01-01T00:00:{(i * 7) % 50:02d}")
+            users.append(user)
+        with open(data_file, "w", encoding="utf-8") as f:
+            json.dump(users, f)
+
+        repository = UserRepository(data_file)
+        page, after = repository.find_page(20)
+        ids = [user.user_id for user in page]
+        while after is not None:
+            page, after = repository.find_page(20, after=after)
+            ids.extend(user.user_id for user in page)
+        expected = sorted(users, key=lambda user: (user["created_at"], user["user_id"]))
+        assert ids == [user["user_id"] for user in expected]
+        print("✅ pagination triee apres rechargement complet")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU REPOSITORY DES UTILISATEURS")
+    print("=" * 60)
+    test_exact_email_json()
+    test_exact_email_sqlite()
+    test_page_order_after_reload()
@@ -0,0 +1,62 @@
+# Test de la lecture groupee des utilisateurs (POST /users/batch)
+# Verifie l'ordre des IDs demandes, les IDs introuvables ou supprimes,
+# la projection des champs (fields) et les requetes refusees (400)
+
+import controllers.user_controller as user_controller
+from testing_app import BACKENDS, app_client, register_user
+
+
+def test_batch_lookup():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            ids = [register_user(client, n)[1] for n in range(3)]
+            assert client.delete(f"/users/{ids[2]}").status_code == 200
+
+            response = client.post("/users/batch", json={"ids": [ids[1], "inconnu", ids[0], ids[1], ids[2]]})
+            assert response.status_code == 200
+            data = response.get_json()["data"]
+            assert [user["user_id"] for user in data["users"]] == [ids[1], ids[0]]
+            assert data["not_found"] == ["inconnu", ids[2]]
+            assert all("password" not in user for user in data["users"])
+            assert data["users"][1]["email"] == "user0@example.com"
+    print("✅ utilisateurs dans l'ordre demande, IDs inconnus ou supprimes dans not_found")
+
+
+def test_batch_fields():
+    for backend in BACKENDS:
+        with app_client(backend) as client:
+            _, user_id = register_user(client, 1)
+            response = client.post("/users/batch", json={"ids": [user_id], "fields": ["first_name", "photo_url"]})
+            assert response.status_code == 200
+            assert response.get_json()["data"]["users"] == [{"user_id": user_id, "first_name": "Prenom1", "photo_url": None}]
+
+            response = client.post("/users/batch", json={"ids": [user_id], "fields": ["password"]})
+            assert response.status_code == 400
+            assert response.get_json()["success"] is False
+    print("✅ projection des champs, champ inconnu (password) refuse")
+
+
+def test_batch_rejected():
+    with app_client() as client:
+        _, user_id = register_user(client, 1)
+        for body in ({}, {"ids": user_id}, {"ids": []}, {"ids": [1, 2]},
+                     {"ids": [user_id], "fields": "first_name"}, {"ids": [user_id], "fields": [1]}):
+            response = client.post("/users/batch", json=body)
+            assert response.status_code == 400, body
+
+        limit = user_controller.USERS_BATCH_MAX_IDS
+        user_controller.USERS_BATCH_MAX_IDS = 2
+        try:
+            assert client.post("/users/batch", json={"ids": [user_id] * 3}).status_code == 400
+        finally:
+            user_controller.USERS_BATCH_MAX_IDS = limit
+    print("✅ ids ou fields invalides, liste vide ou trop longue refuses (400)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA LECTURE GROUPEE DES UTILISATEURS")
+    print("=" * 60)
+    test_batch_lookup()
+    test_batch_fields()
+    test_batch_rejected()
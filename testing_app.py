@@ -0,0 +1,117 @@
+# Application de test : memes blueprints et services que app.py, sur des
+# fichiers temporaires (stockage json ou sqlite), pour les tests via app.test_client()
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from controllers.auth_controller import auth_bp, inject as inject_auth
+from controllers.mission_controller import create_mission_blueprint_alias, mission_bp, inject as inject_mission
+from controllers.user_controller import user_bp, inject as inject_user
+from repositories.mission_repository import MissionRepository
+from repositories.sqlite_database import SqliteDatabase
+from repositories.sqlite_mission_repository import SqliteMissionRepository
+from repositories.sqlite_user_repository import SqliteUserRepository
+from repositories.user_repository import UserRepository
+from services.mission_service import MissionService
+from services.user_service import UserService
+from utils.event_bus import EventBus
+from utils.write_behind import WriteBehindBuffer
+
+BACKENDS = ('json', 'sqlite')
+
+PASSWORD = "Secret123!"
+
+
+def create_test_app(directory: str, backend: str = 'json') -> Flask:
+    """
+    Application Flask sur des donnees vides dans directory.
+    Le tampon des metadonnees (last_login) est garde dans app.extensions pour etre ferme.
+    """
+    if backend == 'sqlite':
+        database = SqliteDatabase(os.path.join(directory, "eqos.db"))
+        user_repo = SqliteUserRepository(database)
+        mission_repo = SqliteMissionRepository(database)
+    else:
+        user_repo = UserRepository(os.path.join(directory, "users.json"))
+        mission_repo = MissionRepository(os.path.join(directory, "missions.json"))
+
+    metadata_buffer = WriteBehindBuffer(user_repo.update_fields_many)
+    user_service = UserService(user_repo, metadata_buffer)
+    inject_user(user_service)
+    inject_auth(user_service)
+    mission_service = MissionService(mission_repo, EventBus(), user_repo)
+    inject_mission(mission_service)
+
+    app = Flask(__name__)
+    app.register_blueprint(user_bp, url_prefix="/users")
+    app.register_blueprint(auth_bp, url_prefix="/auth")
+    app.register_blueprint(mission_bp, url_prefix="/api/missions")
+    app.register_blueprint(create_mission_blueprint_alias(mission_service), url_prefix="/missions")
+    app.extensions["metadata_buffer"] = metadata_buffer
+    return app
+
+
+@contextmanager
+def app_client(backend: str = 'json') -> Iterator[FlaskClient]:
+    """Client de test sur une application aux donnees temporaires, supprimees a la sortie"""
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_test_app(directory, backend)
+        try:
+            yield app.test_client()
+        finally:
+            # Ecrit les metadonnees en attente tant que les fichiers existent encore
+            app.extensions["metadata_buffer"].close()
+
+
+def register_user(client, n: int) -> tuple:
+    """Inscrit et connecte un utilisateur. Retourne (en-tetes d'authentification, user_id)"""
+    body = {
+        "first_name": f"Prenom{n}",
+        "last_name": f"Nom{n}",
+        "birth_date": "1990-01-15",
+        "email": f"user{n}@example.com",
+        "phone_number": f"+2246200{n:05d}",
+        "password": PASSWORD,
+        "user_type": "PARTICULIER",
+        "country": "GN",
+        "address": "Kaloum"
+    }
+    response = client.post("/auth/register", json=body)
+    assert response.status_code == 201, response.get_json()
+    tokens = client.post("/auth/login", json={"email": body["email"], "password": PASSWORD}).get_json()["data"]
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    me = client.get("/auth/me", headers=headers).get_json()["data"]
+    return headers, me.get("user_id") or me.get("id")
+
+
+def user_body(n: int, first_name: str) -> dict:
+    """Corps complet de PUT /users/<id> pour l'utilisateur n de register_user"""
+    return {
+        "first_name": first_name,
+        "last_name": f"Nom{n}",
+        "birth_date": "1990-01-15",
+        "email": f"user{n}@example.com",
+        "phone_number": f"+2246200{n:05d}",
+        "user_type": "PARTICULIER",
+        "country": "GN",
+        "address": "Kaloum"
+    }
+
+
+def mission_body(publisher_id: str, title: str = "Nettoyage de bureaux", publish: bool = False) -> dict:
+    """Corps de creation d'une mission"""
+    return {
+        "title": title,
+        "description": "Nettoyage complet des bureaux",
+        "type_code": "CLEANING",
+        "location": {"country": "GN", "city": "Conakry", "neighborhood": "Kaloum"},
+        "budget": 150,
+        "publisher_id": publisher_id,
+        "publish": publish,
+        "work_days": [{"day": "2030-01-01", "start_time": "08:00:00", "end_time": "12:00:00"}]
+    }
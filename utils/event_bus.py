@@ -0,0 +1,120 @@
+"""
+Bus d'evenements en memoire (publication / abonnement) pour les flux temps reel
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional
+from config.settings import EVENT_QUEUE_SIZE
+
+
+# Marque de fin de parcours d'un abonnement
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    Abonnement au bus : file bornee des evenements acceptes par le filtre.
+    Un abonne trop lent (file pleine) est desabonne plutot que de bloquer
+    ou de ralentir les ecritures qui publient.
+    """
+
+    def __init__(self, bus: 'EventBus', accept: Optional[Callable[[Any], bool]], queue_size: int):
+        self._bus = bus
+        self._accept = accept
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.closed = False
+        self.overflowed = False
+
+    def offer(self, event: Any) -> bool:
+        """Ajoute l'evenement s'il passe le filtre. Retourne True s'il a ete mis en file."""
+        if self.closed:
+            return False
+        if self._accept is not None:
+            try:
+                if not self._accept(event):
+                    return False
+            except Exception:
+                # Un filtre en erreur ne doit pas faire echouer la publication
+                return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+            self.close()
+            return False
+        return True
+
+    def events(self, heartbeat: float) -> Iterator[Optional[Any]]:
+        """
+        Parcourt les evenements au fil de l'eau. Produit None lorsqu'aucun evenement
+        n'est arrive pendant heartbeat secondes (pour entretenir la connexion).
+        S'arrete a la fermeture de l'abonnement.
+        """
+        while True:
+            try:
+                event = self._queue.get(timeout=heartbeat)
+            except queue.Empty:
+                if self.closed:
+                    return
+                yield None
+                continue
+            if event is _CLOSED:
+                return
+            yield event
+
+    def close(self):
+        """Se desabonne du bus et termine le parcours des evenements"""
+        if self.closed:
+            return
+        self.closed = True
+        self._bus.unsubscribe(self)
+        try:
+            self._queue.put_nowait(_CLOSED)
+        except queue.Full:
+            # Le parcours s'arretera apres avoir vide la file
+            pass
+
+
+class EventBus:
+    """
+    Diffuse des evenements aux abonnes du processus courant.
+    publish() ne bloque jamais : chaque abonne a sa propre file et son filtre,
+    evalue au moment de la publication.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or EVENT_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        self._stats = {"published": 0, "delivered": 0, "overflows": 0}
+
+    def subscribe(self, accept: Optional[Callable[[Any], bool]] = None) -> Subscription:
+        """Cree un abonnement (accept filtre les evenements recus)"""
+        subscription = Subscription(self, accept, self.queue_size)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Retire un abonnement"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                if subscription.overflowed:
+                    self._stats["overflows"] += 1
+
+    def publish(self, event: Any) -> int:
+        """Diffuse un evenement. Retourne le nombre d'abonnes qui l'ont recu."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        delivered = sum(1 for subscription in subscriptions if subscription.offer(event))
+        with self._lock:
+            self._stats["published"] += 1
+            self._stats["delivered"] += delivered
+        return delivered
+
+    def get_stats(self) -> dict:
+        """Compteurs du bus (evenements publies, livraisons, abonnes desabonnes car trop lents)"""
+        with self._lock:
+            return dict(self._stats, subscribers=len(self._subscriptions))
@@ -0,0 +1,128 @@
+"""
+Ecritures atomiques et verrou inter-processus pour les fichiers de donnees JSON
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Optional
+from config.settings import FSYNC_POLICY, FSYNC_BATCH_INTERVAL_SECONDS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+
+# always : fsync a chaque ecriture (fichier temporaire puis dossier apres le renommage)
+# batched : au plus un fsync par FSYNC_BATCH_INTERVAL_SECONDS
+# never : le systeme decide quand ecrire sur le disque
+# Un arret du processus ne perd rien quelle que soit la politique. En cas de coupure
+# de courant, seule "always" garantit l'ancien ou le nouveau contenu : avec "batched"
+# ou "never", le renommage peut atteindre le disque avant les donnees et laisser un
+# fichier vide ou tronque (et la fin d'un journal append-only peut etre perdue).
+FSYNC_POLICIES = ('always', 'batched', 'never')
+
+
+class JsonFileStore:
+    """
+    Fichier de donnees JSON partage entre processus (workers gunicorn).
+
+    - write() ecrit dans un fichier temporaire puis le renomme (os.replace) :
+      un arret du processus laisse l'ancien ou le nouveau contenu, jamais un
+      fichier tronque ; apres une coupure de courant, seulement avec la
+      politique "always" (voir FSYNC_POLICIES).
+    - lock() prend un verrou exclusif (fcntl) sur un fichier voisin '.lock'
+      pour proteger les cycles lecture-modification-ecriture.
+    """
+
+    def __init__(self, path: str, fsync_policy: Optional[str] = None,
+                 batch_interval: float = FSYNC_BATCH_INTERVAL_SECONDS):
+        fsync_policy = fsync_policy or FSYNC_POLICY
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Politique fsync invalide : {fsync_policy} (attendu : {', '.join(FSYNC_POLICIES)})")
+        self.path = path
+        self.lock_file = path + '.lock'
+        self.fsync_policy = fsync_policy
+        self.batch_interval = batch_interval
+        self._last_sync = 0.0
+        self._sync_lock = threading.Lock()
+
+    @contextmanager
+    def lock(self):
+        """Verrou exclusif inter-processus (sans effet si la plateforme n'en fournit pas)"""
+        with open(self.lock_file, 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _should_sync(self) -> bool:
+        """Indique si l'ecriture courante doit etre synchronisee selon la politique"""
+        if self.fsync_policy == 'always':
+            return True
+        if self.fsync_policy == 'never':
+            return False
+        with self._sync_lock:
+            now = time.monotonic()
+            if now - self._last_sync < self.batch_interval:
+                return False
+            self._last_sync = now
+            return True
+
+    def sync(self, f: IO) -> bool:
+        """Vide le tampon du fichier ouvert et le synchronise selon la politique"""
+        f.flush()
+        if not self._should_sync():
+            return False
+        os.fsync(f.fileno())
+        return True
+
+    def write(self, data: Any):
+        """Ecrit data en JSON de maniere atomique (fichier temporaire + os.replace)"""
+        tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                synced = self.sync(f)
+            os.replace(tmp_file, self.path)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        if synced:
+            self._sync_directory()
+
+    def replace(self, tmp_file: str):
+        """Remplace le fichier par tmp_file (deja ecrit) en synchronisant le dossier si besoin"""
+        os.replace(tmp_file, self.path)
+        if self.fsync_policy == 'always':
+            self._sync_directory()
+
+    def _sync_directory(self):
+        """Rend le renommage durable (sans effet sur les plateformes sans fsync de dossier)"""
+        try:
+            fd = os.open(os.path.dirname(self.path) or '.', os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
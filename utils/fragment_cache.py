@@ -0,0 +1,61 @@
+"""
+Cache des fragments JSON encodes, par enregistrement
+"""
+
+import json
+import threading
+from typing import Callable, Dict, Iterable, Tuple
+
+
+def encode_fragment(data: dict) -> str:
+    """Encode un element comme jsonify (cles triees, ASCII, separateurs compacts)"""
+    return json.dumps(data, ensure_ascii=True, sort_keys=True, separators=(',', ':'))
+
+
+class FragmentCache:
+    """
+    Fragment JSON deja encode de chaque enregistrement, par ID.
+
+    Chaque entree garde l'enregistrement source : le fragment n'est reutilise
+    que si l'enregistrement lu est le meme objet ou un dictionnaire egal.
+    Une modification faite par un autre processus n'est donc jamais servie
+    perimee ; invalidate() libere les entrees des enregistrements modifies.
+    """
+
+    def __init__(self, render: Callable[[dict], dict]):
+        self._render = render
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[dict, str]] = {}
+        # Compteurs indicatifs : hits et misses sont incrementes sans verrou
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, record: dict) -> str:
+        """Retourne le fragment de l'enregistrement (encode et mis en cache si besoin)"""
+        record_id = record.get('id')
+        entry = self._entries.get(record_id)
+        if entry is not None and (entry[0] is record or entry[0] == record):
+            self._stats["hits"] += 1
+            return entry[1]
+
+        fragment = encode_fragment(self._render(record))
+        self._stats["misses"] += 1
+        if record_id:
+            with self._lock:
+                self._entries[record_id] = (record, fragment)
+        return fragment
+
+    def invalidate(self, record_ids: Iterable[str]):
+        """Supprime les fragments des enregistrements modifies"""
+        with self._lock:
+            for record_id in record_ids:
+                if self._entries.pop(record_id, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Compteurs du cache (hits, misses, invalidations, taille)"""
+        return dict(self._stats, size=len(self._entries))
@@ -0,0 +1,115 @@
+"""
+Regroupement des ecritures (group commit) pour les repositories JSON
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+from config.settings import WRITE_BATCH_WINDOW_MS, WRITE_BATCH_MAX_OPS
+
+
+# Une operation s'applique en memoire et retourne (resultat, enregistrements modifies)
+Operation = Callable[[], Tuple[Any, List[dict]]]
+# Issue d'une operation : (succes, resultat ou exception)
+Outcome = Tuple[bool, Any]
+
+
+def apply_operations(operations: List[Operation]) -> Tuple[List[Outcome], List[dict]]:
+    """
+    Applique les operations une par une. L'echec d'une operation (ValueError...)
+    n'interrompt pas le lot : l'exception est renvoyee a son seul appelant.
+    Retourne les issues et l'ensemble des enregistrements modifies.
+    """
+    outcomes, changed = [], []
+    for operation in operations:
+        try:
+            result, records = operation()
+        except Exception as error:
+            outcomes.append((False, error))
+            continue
+        outcomes.append((True, result))
+        changed.extend(records)
+    return outcomes, changed
+
+
+class _Pending:
+    """Operation en attente et son issue"""
+
+    __slots__ = ('operation', 'outcome')
+
+    def __init__(self, operation: Operation):
+        self.operation = operation
+        self.outcome = None
+
+
+class GroupCommitter:
+    """
+    Regroupe les mutations soumises par des threads concurrents en une seule
+    ecriture persistante.
+
+    Le premier thread d'un lot devient leader. S'il est seul en file, il ecrit
+    immediatement : un ecrivain isole n'attend pas la fenetre. Si d'autres
+    operations sont deja en attente, il attend au plus window secondes (ou
+    max_batch operations), puis appelle commit() avec toutes les operations
+    en attente. commit() applique le lot et l'ecrit une seule fois ;
+    chaque appelant n'est libere qu'une fois l'ecriture terminee, avec son
+    propre resultat ou sa propre exception.
+    Les operations arrivees pendant une ecriture forment le lot suivant.
+    """
+
+    def __init__(self, commit: Callable[[List[Operation]], List[Outcome]],
+                 window: Optional[float] = None, max_batch: Optional[int] = None):
+        self.commit = commit
+        self.window = WRITE_BATCH_WINDOW_MS / 1000 if window is None else window
+        self.max_batch = max(1, max_batch or WRITE_BATCH_MAX_OPS)
+        self._cond = threading.Condition()
+        self._queue: List[_Pending] = []
+        self._leader = False
+        self._stats = {"batches": 0, "operations": 0}
+
+    def submit(self, operation: Operation) -> Any:
+        """Soumet une operation et attend que son lot soit persiste"""
+        pending = _Pending(operation)
+        with self._cond:
+            self._queue.append(pending)
+            self._cond.notify_all()
+
+        while pending.outcome is None:
+            with self._cond:
+                while self._leader and pending.outcome is None:
+                    self._cond.wait()
+                if pending.outcome is not None:
+                    break
+                self._leader = True
+                deadline = time.monotonic() + self.window
+                while 1 < len(self._queue) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            self._run(batch)
+
+        success, value = pending.outcome
+        if not success:
+            raise value
+        return value
+
+    def _run(self, batch: List[_Pending]):
+        """Ecrit un lot (thread leader) puis libere ses appelants"""
+        try:
+            outcomes = self.commit([item.operation for item in batch])
+        except BaseException as error:
+            outcomes = [(False, error)] * len(batch)
+        with self._cond:
+            for item, outcome in zip(batch, outcomes):
+                item.outcome = outcome
+            self._stats["batches"] += 1
+            self._stats["operations"] += len(batch)
+            self._leader = False
+            self._cond.notify_all()
+
+    def get_stats(self) -> dict:
+        """Nombre de lots ecrits et d'operations regroupees"""
+        with self._cond:
+            return dict(self._stats)
@@ -0,0 +1,90 @@
+"""
+Requetes conditionnelles : ETag / If-None-Match pour les endpoints GET,
+If-Match (version attendue) pour les mises a jour
+"""
+
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Optional
+from flask import make_response, request
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag (sans guillemets) calcule a partir de la version des donnees et de la requete"""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def conditional(version: Callable[[], Any]):
+    """
+    Decorateur : ETag faible calcule a partir de version() (version des donnees
+    lue avant la vue), du chemin, des parametres et de l'utilisateur du token.
+    Si le client envoie un If-None-Match correspondant, la reponse est un
+    304 sans corps et la vue n'est pas appelee (ni lecture ni serialisation).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            current_user = getattr(request, 'current_user', None) or {}
+            etag = make_etag(version(), request.path, sorted(request.args.items(multi=True)), current_user.get('user_id'))
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+                response.set_etag(etag, weak=True)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def record_conditional(version: Callable[..., Optional[int]], variant: Optional[Callable[[], Any]] = None):
+    """
+    Decorateur pour la lecture d'un enregistrement : ETag fort egal a sa
+    version (version(**parametres de la route), None s'il n'existe pas).
+    Cet ETag peut etre renvoye tel quel dans If-Match pour le modifier.
+
+    Si variant() n'est pas None (reponse enrichie d'autres donnees, ex.
+    ?expand), l'ETag est faible et calcule a partir de la version et de
+    variant() : il sert au cache (If-None-Match), pas a If-Match.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            current = version(**kwargs)
+            if current is None:
+                return f(*args, **kwargs)
+            extra = variant() if variant is not None else None
+            weak = extra is not None
+            etag = make_etag(current, extra) if weak else str(current)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+                response.set_etag(etag, weak=weak)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=weak)
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def if_match_version() -> Optional[int]:
+    """
+    Version attendue par le client, lue dans If-Match ("3", ou W/"3").
+    Retourne None si l'en-tete est absent ou vaut *.
+    Leve ValueError si l'en-tete n'est pas une version unique.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    tags = if_match.as_set(include_weak=True)
+    if len(tags) != 1 or not next(iter(tags)).isdigit():
+        raise ValueError("L'en-tete If-Match doit contenir une seule version (ex. \"3\")")
+    return int(next(iter(tags)))
@@ -0,0 +1,65 @@
+"""
+Pagination par curseur (cle de tri : created_at puis id)
+"""
+
+import base64
+import json
+from typing import Mapping, Optional, Tuple
+from config.settings import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+def page_key(record: dict, id_field: str = 'id') -> Tuple[str, str]:
+    """Cle de pagination d'un enregistrement : (created_at, id)"""
+    return (str(record.get('created_at') or ''), str(record.get(id_field) or ''))
+
+
+def encode_cursor(key: Optional[Tuple[str, str]]) -> Optional[str]:
+    """Encode la cle du dernier element d'une page en curseur opaque"""
+    if key is None:
+        return None
+    raw = json.dumps(list(key), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Decode un curseur. Leve ValueError si le curseur est invalide."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, record_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Curseur de pagination invalide")
+    if not isinstance(created_at, str) or not isinstance(record_id, str):
+        raise ValueError("Curseur de pagination invalide")
+    return created_at, record_id
+
+
+def parse_page_args(args: Mapping[str, str]) -> Optional[Tuple[int, Optional[str]]]:
+    """
+    Lit ?limit=&cursor= dans les parametres de la requete.
+    Retourne None si aucun n'est fourni (liste complete), sinon (limit, cursor).
+    Leve ValueError si limit est invalide.
+    """
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if limit is None and cursor is None:
+        return None
+    if limit is None:
+        return DEFAULT_PAGE_SIZE, cursor
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("Le parametre limit doit etre un entier")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Le parametre limit doit etre compris entre 1 et {MAX_PAGE_SIZE}")
+    return limit, cursor
+
+
+def page_info(limit: int, next_cursor: Optional[str]) -> dict:
+    """Bloc 'pagination' des reponses paginees"""
+    return {
+        'limit': limit,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    }
@@ -0,0 +1,137 @@
+"""
+Reponses JSON / NDJSON streamees pour les listes volumineuses
+"""
+
+from typing import Any, Iterable, Iterator, Mapping, Optional
+from flask import Response, current_app
+
+
+# Formats acceptes par ?stream=
+STREAM_FORMATS = ('json', 'ndjson')
+
+# Taille approximative (caracteres) des blocs envoyes au client
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# Commentaire SSE envoye pour entretenir la connexion
+SSE_KEEPALIVE = ': keepalive\n\n'
+
+
+def parse_stream_arg(args: Mapping[str, str]) -> Optional[str]:
+    """
+    Lit ?stream=json|ndjson dans les parametres de la requete.
+    Retourne None si la reponse ne doit pas etre streamee.
+    Leve ValueError si le format est inconnu.
+    """
+    stream = args.get('stream')
+    if stream is None:
+        return None
+    if stream not in STREAM_FORMATS:
+        raise ValueError(f"Le parametre stream doit valoir {' ou '.join(STREAM_FORMATS)}")
+    return stream
+
+
+def _buffered(chunks: Iterable[str]) -> Iterator[str]:
+    """Regroupe les petits morceaux en blocs d'environ STREAM_BUFFER_SIZE caracteres"""
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_BUFFER_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _encoded(items: Iterable, encoded: bool) -> Iterable[str]:
+    """Encode les elements en JSON compact, sauf s'ils sont deja des fragments encodes"""
+    if encoded:
+        return items
+    dumps = current_app.json.dumps
+    return (dumps(item, separators=(',', ':')) for item in items)
+
+
+def ndjson_response(items: Iterable, encoded: bool = False) -> Response:
+    """Une ligne JSON par element (application/x-ndjson)"""
+    # Encodeur lu tout de suite : le flux est parcouru apres la fin du contexte de la requete
+    fragments = _encoded(items, encoded)
+
+    def generate():
+        for fragment in fragments:
+            yield fragment + '\n'
+
+    return Response(_buffered(generate()), mimetype='application/x-ndjson')
+
+
+def _envelope_chunks(fragments: Iterable[str], envelope: dict, items_key: Optional[str] = None,
+                     fields: Optional[dict] = None) -> Iterator[str]:
+    """
+    Morceaux de l'enveloppe ApiResponse {"data": [...], "message": ..., "success": ...},
+    les fragments etant inseres tels quels dans data.
+    Avec items_key, data vaut {items_key: [...], "total": n, **fields} (n compte a la fin).
+    L'enveloppe est encodee tout de suite (contexte de l'application requis).
+    """
+    dumps = current_app.json.dumps
+    head = '{"data":{' + dumps(items_key) + ':[' if items_key else '{"data":['
+    extra = ''.join(f',{dumps(key)}:{dumps(value)}' for key, value in sorted((fields or {}).items()))
+    rest = dumps(envelope, separators=(',', ':'))
+    tail = ',' + rest[1:] if rest != '{}' else '}'
+
+    def generate():
+        yield head
+        count = 0
+        for fragment in fragments:
+            yield (',' if count else '') + fragment
+            count += 1
+        yield f'],"total":{count}{extra}}}' if items_key else ']'
+        yield tail
+
+    return generate()
+
+
+def json_stream_response(items: Iterable, envelope: dict, items_key: Optional[str] = None,
+                         encoded: bool = False) -> Response:
+    """
+    Enveloppe ApiResponse streamee (voir _envelope_chunks).
+    Une erreur en cours de flux interrompt la reponse (JSON incomplet).
+    """
+    chunks = _envelope_chunks(_encoded(items, encoded), envelope, items_key)
+    return Response(_buffered(chunks), mimetype='application/json')
+
+
+def fragments_response(fragments: Iterable[str], envelope: dict, status: int = 200,
+                       items_key: Optional[str] = None, fields: Optional[dict] = None) -> Response:
+    """
+    Reponse JSON complete (non streamee) assemblee a partir de fragments deja
+    encodes : sans items_key, memes octets que jsonify(envelope avec data=[...]).
+    """
+    body = ''.join(_envelope_chunks(fragments, envelope, items_key, fields)) + '\n'
+    return Response(body, status=status, mimetype='application/json')
+
+
+def stream_response(stream: str, items: Iterable, envelope: dict, items_key: Optional[str] = None,
+                    encoded: bool = False) -> Response:
+    """Reponse streamee au format demande (json ou ndjson)"""
+    if stream == 'ndjson':
+        return ndjson_response(items, encoded)
+    return json_stream_response(items, envelope, items_key, encoded)
+
+
+def sse_message(data: str, event: Optional[str] = None, event_id: Optional[Any] = None) -> str:
+    """Formate un message Server-Sent Events (data sur une seule ligne : JSON compact)"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {data}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def sse_response(messages: Iterable[str]) -> Response:
+    """Flux text/event-stream, sans mise en tampon (chaque message est envoye aussitot)"""
+    return Response(
+        messages,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
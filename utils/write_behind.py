@@ -0,0 +1,89 @@
+"""
+Ecriture differee (write-behind) des metadonnees non critiques
+"""
+
+import atexit
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class WriteBehindBuffer:
+    """
+    Tampon en memoire pour des champs non critiques (ex. last_login).
+
+    record() est immediat : les valeurs sont regroupees par cle (la plus
+    recente l'emporte) et persistees en bloc par flush(), appele
+    periodiquement par un thread en arriere-plan et a l'arret du processus.
+    Les valeurs en attente restent lisibles avec pending() jusqu'a leur ecriture.
+    En cas d'echec d'ecriture, elles sont remises dans le tampon.
+    """
+
+    def __init__(self, flush: Callable[[Dict[str, dict]], Any], interval: Optional[float] = None):
+        self._write = flush
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, dict] = {}
+        self._flushing: Dict[str, dict] = {}
+        self._stats = {"recorded": 0, "flushes": 0, "flushed": 0, "errors": 0}
+        self._stop = threading.Event()
+        if interval:
+            thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+            thread.start()
+        atexit.register(self.close)
+
+    def record(self, key: str, **fields):
+        """Enregistre des valeurs a persister plus tard"""
+        with self._lock:
+            self._pending.setdefault(key, {}).update(fields)
+            self._stats["recorded"] += 1
+
+    def pending(self, key: str) -> dict:
+        """Valeurs pas encore persistees pour une cle (en cours d'ecriture comprises)"""
+        with self._lock:
+            return {**self._flushing.get(key, {}), **self._pending.get(key, {})}
+
+    def flush(self) -> int:
+        """Persiste les valeurs en attente en un seul appel. Retourne le nombre de cles ecrites."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+            if not batch:
+                return 0
+
+            try:
+                self._write(batch)
+            except BaseException:
+                with self._lock:
+                    # Les valeurs enregistrees entre-temps sont plus recentes
+                    for key, fields in batch.items():
+                        self._pending[key] = {**fields, **self._pending.get(key, {})}
+                    self._stats["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["flushed"] += len(batch)
+            return len(batch)
+
+    def _run(self, interval: float):
+        """Vide periodiquement le tampon"""
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                # Les valeurs sont conservees pour le prochain essai
+                pass
+
+    def get_stats(self) -> dict:
+        """Compteurs du tampon"""
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
+
+    def close(self):
+        """Arrete le thread et persiste les dernieres valeurs"""
+        self._stop.set()
+        self.flush()